@@ -369,10 +369,17 @@ rank['County Hurling League'] = 0;
   return rank;
 })();
 
+// sort_key is precomputed by the scrapers (scripts/match_time.py): UTC epoch
+// of the Dublin kick-off, or of local midnight when the time is unknown.
+// Rows without one (knockout overlay, overridden times) fall back to strings.
+const hasSortKey = m => typeof m.sort_key === 'number';
+const byKickoff = (a, b) =>
+  (hasSortKey(a) && hasSortKey(b))
+    ? a.sort_key - b.sort_key
+    : (a.date || '').localeCompare(b.date || '') || (a.time || '').localeCompare(b.time || '');
+
 // date + time only (strict chronological)
-const sortDateOnly = (a, b) =>
-  (a.date || '').localeCompare(b.date || '') ||
-  (a.time || '').localeCompare(b.time || '');
+const sortDateOnly = byKickoff;
 
 
   const el=id=>document.getElementById(id), $$=(s,r=document)=>Array.from(r.querySelectorAll(s));
@@ -1062,20 +1069,110 @@ function renderHomepageEarly() {
   renderGroupTable();
 }
 
+// Content-hashed data files (scripts/publish_data.py). The manifest is tiny and
+// always revalidated; the hashed files it points to never change, so they are
+// fetched without cache-busting. Files not in the manifest keep the old behaviour.
+const DATA_MANIFEST_URL = 'data/data-manifest.json';
+let dataManifestPromise = null;
+
+function loadDataManifest(){
+  if (!dataManifestPromise) {
+    dataManifestPromise = fetch(DATA_MANIFEST_URL, { cache:'no-cache' })
+      .then(r => r.ok ? r.json() : null)
+      .catch(() => null);
+  }
+  return dataManifestPromise;
+}
+
+async function fetchData(url){
+  const live = state.season === '2026';
+  const manifest = live ? await loadDataManifest() : null;
+  const hashed = manifest?.files?.[url];
+  if (hashed) {
+    const res = await fetch(hashed);
+    if (res.ok) return res;
+    warn('[LGH] hashed data fetch not OK, falling back:', hashed, res.status);
+  }
+  return live
+    ? fetch(`${url}?t=${Date.now()}`, { cache:'no-store' })
+    : fetch(url, { cache:'force-cache' });
+}
+
+// Delta feed (scripts/data_delta.py). The last snapshot of each live data file is
+// kept in localStorage with its "version"; on the next load the dataset's
+// data/deltas/<name>/index.json says whether it is still current or which patch
+// brings it up to date. Only when neither applies is the full file fetched.
+const DELTA_DIR = 'data/deltas';
+const SNAPSHOT_KEY_PREFIX = 'lgh:snapshot:';
+
+function deltaRecordKey(record, key){
+  return key.map(field => String(record?.[field] || '')).join('|');
+}
+
+function applyDelta(snapshot, patch){
+  const byKey = new Map();
+  for (const r of snapshot[patch.records] || []) byKey.set(deltaRecordKey(r, patch.key), r);
+  for (const k of patch.removed || []) byKey.delete(k);
+  for (const r of [...(patch.changed || []), ...(patch.added || [])]) byKey.set(deltaRecordKey(r, patch.key), r);
+  return { ...(patch.meta || {}), [patch.records]: [...byKey.values()], version: patch.to };
+}
+
+function readSnapshot(url){
+  try { return JSON.parse(localStorage.getItem(SNAPSHOT_KEY_PREFIX + url) || 'null'); }
+  catch (e) { return null; }
+}
+
+function storeSnapshot(url, data){
+  if (!Number.isInteger(data?.version)) return;
+  try { localStorage.setItem(SNAPSHOT_KEY_PREFIX + url, JSON.stringify(data)); }
+  catch (e) { warn('[LGH] snapshot not stored (next load fetches the full file):', url, e); }
+}
+
+async function loadByDelta(url){
+  const held = readSnapshot(url);
+  if (!Number.isInteger(held?.version)) return null;
+  const chain = `${DELTA_DIR}/${url.split('/').pop().replace(/\.json$/, '')}`;
+  const index = await fetch(`${chain}/index.json`, { cache:'no-cache' }).then(r => r.ok ? r.json() : null);
+  if (!Number.isInteger(index?.latest)) return null;
+  if (index.latest === held.version) return held;
+  const name = index.patches?.[String(held.version)];
+  if (!name) return null;
+  // A patch file is never rewritten (<from>-<to>.json), so the HTTP cache may keep it.
+  const patch = await fetch(`${chain}/${name}`).then(r => r.ok ? r.json() : null);
+  if (patch?.from !== held.version || patch?.to !== index.latest) return null;
+  const data = applyDelta(held, patch);
+  storeSnapshot(url, data);
+  return data;
+}
+
+// The parsed data file: from the held snapshot and the delta feed when it can,
+// else in full through fetchData(). Throws when the full fetch fails.
+async function fetchDataJson(url){
+  const live = state.season === '2026';
+  if (live) {
+    try {
+      const data = await loadByDelta(url);
+      if (data) return data;
+    } catch (e) {
+      warn('[LGH] delta update failed, fetching the full file:', url, e);
+    }
+  }
+  const res = await fetchData(url);
+  if (!res.ok) throw new Error(`HTTP ${res.status}`);
+  const data = await res.json();
+  if (live) storeSnapshot(url, data);
+  return data;
+}
+
 async function load(){
   try {
     let j = null;
     let stale = false;
-      const bust = (state.season === '2026') ? `?t=${Date.now()}` : '';
-      const opts = (state.season === '2026') ? { cache:'no-store' } : { cache:'force-cache' };
-      
-      const res = await fetch(`${DATA_URL}${bust}`, opts);
-      
-      if (res.ok) {
-        j = await res.json();
-      } else {
+      try {
+        j = await fetchDataJson(DATA_URL);
+      } catch (e) {
         stale = true;
-        warn('[LGH] Data fetch not OK:', res.status, res.statusText);
+        warn('[LGH] Data fetch not OK:', e);
       }
 
         if (stale) {
@@ -1091,6 +1188,7 @@ async function load(){
         round:           r.round || '',
         date:            r.date || '',
         time:            r.time || '',
+        sort_key:        r.sort_key ?? null,
         home:            r.home || '',
         away:            r.away || '',
         venue:           mapVenue(r.venue),
@@ -1212,9 +1310,7 @@ if (KO_URL) {
     // Load league fixtures (if enabled for the season)
 if (LEAGUE_URL) {
   try {
-    const bustL = (state.season === '2026') ? `?t=${Date.now()}` : '';
-    const optsL = (state.season === '2026') ? { cache:'no-store' } : { cache:'force-cache' };
-    const leagueRaw = await fetch(`${LEAGUE_URL}${bustL}`, optsL).then(r=>r.json());
+    const leagueRaw = await fetchDataJson(LEAGUE_URL);
     const fixtures = leagueRaw?.fixtures || [];
     const norm = fixtures.map((f, i) => ({
       id: f.id || `league_${i}`,
@@ -1225,6 +1321,7 @@ if (LEAGUE_URL) {
       round: f.round || '',
       date: f.date || '',
       time: f.time || f.time_local || (f.datetime_iso ? String(f.datetime_iso).slice(11,16) : ''),
+      sort_key: f.sort_key ?? null,
       venue: mapVenue(f.venue),
       home: f.home || '',
       away: f.away || '',
@@ -1239,7 +1336,7 @@ if (LEAGUE_URL) {
 
     if (LEAGUE_OVERRIDES_URL) {
   try {
-    const overridesRaw = await fetch(`${LEAGUE_OVERRIDES_URL}${bustL}`, optsL).then(r => {
+    const overridesRaw = await fetchData(LEAGUE_OVERRIDES_URL).then(r => {
       if (!r.ok) throw new Error(`HTTP ${r.status}`);
       return r.json();
     });
@@ -1251,6 +1348,8 @@ if (LEAGUE_URL) {
   return {
     id,
     ...(time_local ? { time: time_local } : {}),
+    // A moved fixture invalidates the precomputed key.
+    ...((time_local || rest.date) ? { sort_key: null } : {}),
     ...(rest.venue !== undefined ? { venue: mapVenue(rest.venue) } : {}),
     ...rest
   };
@@ -1272,13 +1371,7 @@ if (LEAGUE_URL) {
     // Load divisional championship fixtures/results
 if (DIVISIONAL_URL) {
   try {
-    const bustD = (state.season === '2026') ? `?t=${Date.now()}` : '';
-    const optsD = (state.season === '2026') ? { cache:'no-store' } : { cache:'force-cache' };
-
-    const divRaw = await fetch(`${DIVISIONAL_URL}${bustD}`, optsD).then(r => {
-      if (!r.ok) throw new Error(`HTTP ${r.status}`);
-      return r.json();
-    });
+    const divRaw = await fetchDataJson(DIVISIONAL_URL);
 
     const fixtures = divRaw?.fixtures || [];
 
@@ -1295,6 +1388,7 @@ if (DIVISIONAL_URL) {
       round:           f.round || '',
       date:            f.date || '',
       time:            f.time || f.time_local || (f.datetime_iso ? String(f.datetime_iso).slice(11,16) : ''),
+      sort_key:        f.sort_key ?? null,
       venue:           mapVenue(f.venue),
       home:            f.home || '',
       away:            f.away || '',
@@ -1342,14 +1436,14 @@ const j = window.__LGH_BOOTSTRAP__ || {};
   }
 }
 
-  const sortRoundDate=(a,b)=> (a._rnum-b._rnum) || (a.date||'').localeCompare(b.date||'') || (a.time||'').localeCompare(b.time||'');
+  const sortRoundDate=(a,b)=> (a._rnum-b._rnum) || byKickoff(a,b);
   const sortDateComp = (a, b) => {
   const da = a.date || '', db = b.date || '';
   if (da !== db) return da.localeCompare(db);         // date asc
   const ra = COMP_RANK[a.competition] ?? 99;
   const rb = COMP_RANK[b.competition] ?? 99;
   if (ra !== rb) return ra - rb;                       // Senior → … → Junior C
-  return (a.time || '').localeCompare(b.time || '');   // time asc
+  return byKickoff(a, b);                              // time asc
 };
 
 
@@ -0,0 +1,512 @@
+#!/usr/bin/env python3
+"""
+Benchmark the scraper parse paths over the page corpus (page_corpus.py).
+
+Each stage runs one parse function over every corpus page it applies to:
+
+  championship.normalize_lines / championship.parse_page          (2026 pages)
+  league.normalize_lines / league.parse_league / league.parse_league_results
+                                                                  (2026 senior pages)
+  divisional.normalize_lines / divisional.parse_one_block / divisional.parse_page
+                                                                  (2026 pages)
+  limerickgaa.flatten_to_lines / limerickgaa.parse_blocks_from_page
+                                                                  (2025 pages)
+
+Inputs are prepared outside the timed region (parse stages get pre-normalised
+lines). The median pass gives lines/s (input lines) and blocks/s (records or
+heading blocks produced). A separate tracemalloc pass records the peak memory
+above the starting point and the net number of allocated blocks still live
+afterwards (the stage's output).
+
+Stage passes alternate with a fixed calibration workload and the baseline
+compares the median ratio ("cost"), which holds across machines and load.
+The run fails when a stage costs, or peaks, more than --threshold above the
+baseline on each of --confirm attempts.
+
+--scaling runs the 2026 stages over synthetic seasons (synthetic_season.py)
+of 1, 2, 4 and 8 times the base size and fits how cost grows with the input;
+a stage fails when it grows faster than lines**--max-exponent, which catches
+rescans that are invisible at the real pages' size.
+
+Usage:
+  python scripts/bench_parsers.py                    # compare with the baseline
+  python scripts/bench_parsers.py --update-baseline  # record a new baseline
+  python scripts/bench_parsers.py --stage league --no-memory
+  python scripts/bench_parsers.py --scaling --scale-by grades
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import dataclasses
+import gc
+import io
+import json
+import math
+import os
+import platform
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import page_corpus
+import scrape_championship_fixtures as championship
+import scrape_divisional_hurling_championship as divisional
+import scrape_league_fixtures as league
+import scrape_limerickgaa as limerickgaa
+import synthetic_season
+
+DEFAULT_BASELINE = os.path.join(page_corpus.DEFAULT_DIR, "bench_baseline.json")
+
+# Memory growth below this is treated as noise.
+PEAK_FLOOR_KIB = 64.0
+
+# Paired stage/calibration samples per stage: as many as fit in the budget,
+# within these bounds.
+MIN_SAMPLES = 7
+SAMPLE_BUDGET_S = 1.5
+
+# --scaling: multiples of the base synthetic season, and the growth exponent
+# (cost against input lines on a log-log fit) above which a stage fails.
+SCALING_FACTORS = (1, 2, 4, 8)
+MAX_EXPONENT = 1.25
+
+# 2025 pages: which competitions scrape_to() parses from each page.
+LEGACY_COMPETITIONS = {
+    "senior": ("SHC",),
+    "intermediate": ("PIHC", "IHC"),
+    "junior": ("PJAHC", "JAHC", "JCHC"),
+}
+
+
+@dataclass
+class Job:
+    """One timed call: ``run(arg)`` over ``lines`` input lines."""
+    arg: Any
+    lines: int
+
+
+@dataclass
+class Stage:
+    name: str
+    prepare: Callable[[Sequence[page_corpus.Page]], List[Job]]
+    run: Callable[[Any], int]  # returns blocks produced
+
+
+def _pages(pages: Sequence[page_corpus.Page], season: int, slug_prefix: str = "", mode: Optional[str] = None) -> List[page_corpus.Page]:
+    return [
+        page for page in pages
+        if page.season == season
+        and page.slug.startswith(slug_prefix)
+        and (mode is None or page.mode == mode)
+    ]
+
+
+def _html_jobs(pages: Sequence[page_corpus.Page], normalize: Callable[[str], List[str]]) -> List[Job]:
+    # The line count of the normalised output is the unit for normalise stages.
+    return [Job(page.html, len(normalize(page.html))) for page in pages]
+
+
+def _count(result: Any) -> int:
+    return len(result)
+
+
+def _normalise_stage(
+    name: str,
+    normalize: Callable[[str], List[str]],
+    select: Callable[[Sequence[page_corpus.Page]], List[page_corpus.Page]],
+) -> Stage:
+    def run(html: str) -> int:
+        normalize(html)
+        return 0
+
+    return Stage(name, lambda pages: _html_jobs(select(pages), normalize), run)
+
+
+def _divisional_blocks(arg: Tuple[List[str], str, bool]) -> int:
+    lines, url, is_result = arg
+    blocks = 0
+    for index, line in enumerate(lines):
+        if divisional.parse_competition_heading(line):
+            divisional.parse_one_block(lines, index, url, is_result)
+            blocks += 1
+    return blocks
+
+
+def build_stages() -> List[Stage]:
+    def legacy_jobs(pages: Sequence[page_corpus.Page]) -> List[Job]:
+        jobs: List[Job] = []
+        for page in _pages(pages, 2025):
+            lines = limerickgaa.flatten_to_lines(page.html)
+            for comp_key in LEGACY_COMPETITIONS[page.slug.split("-")[0]]:
+                jobs.append(Job((page.url, comp_key, page.mode, lines), len(lines)))
+        return jobs
+
+    return [
+        _normalise_stage("championship.normalize_lines", championship.normalize_lines, lambda pages: _pages(pages, 2026)),
+        Stage(
+            "championship.parse_page",
+            lambda pages: [
+                Job((lines, page.mode, page.name), len(lines))
+                for page in _pages(pages, 2026)
+                for lines in [championship.normalize_lines(page.html)]
+            ],
+            lambda arg: _count(championship.parse_page(*arg)),
+        ),
+        _normalise_stage("league.normalize_lines", league.normalize_lines, lambda pages: _pages(pages, 2026, "senior")),
+        Stage(
+            "league.parse_league",
+            lambda pages: [
+                Job(lines, len(lines))
+                for page in _pages(pages, 2026, "senior", "fixtures")
+                for lines in [league.normalize_lines(page.html)]
+            ],
+            lambda lines: _count(league.parse_league(lines)),
+        ),
+        Stage(
+            "league.parse_league_results",
+            lambda pages: [
+                Job(lines, len(lines))
+                for page in _pages(pages, 2026, "senior", "results")
+                for lines in [league.normalize_lines(page.html)]
+            ],
+            lambda lines: _count(league.parse_league_results(lines)),
+        ),
+        _normalise_stage("divisional.normalize_lines", divisional.normalize_lines, lambda pages: _pages(pages, 2026)),
+        Stage(
+            "divisional.parse_one_block",
+            lambda pages: [
+                Job((lines, page.url, page.mode == "results"), len(lines))
+                for page in _pages(pages, 2026)
+                for lines in [divisional.normalize_lines(page.html)]
+            ],
+            _divisional_blocks,
+        ),
+        Stage(
+            "divisional.parse_page",
+            lambda pages: [
+                Job((lines, page.url, page.mode == "results"), len(lines))
+                for page in _pages(pages, 2026)
+                for lines in [divisional.normalize_lines(page.html)]
+            ],
+            lambda arg: _count(divisional.parse_page(*arg)),
+        ),
+        _normalise_stage("limerickgaa.flatten_to_lines", limerickgaa.flatten_to_lines, lambda pages: _pages(pages, 2025)),
+        Stage(
+            "limerickgaa.parse_blocks_from_page",
+            legacy_jobs,
+            lambda arg: _count(limerickgaa.parse_blocks_from_page(arg[0], arg[1], arg[2], lines=arg[3])),
+        ),
+    ]
+
+
+_CALIBRATION_RE = re.compile(r"^(?P<team>.+?)\s+(?P<g>\d+)\s*-\s*(?P<p>\d+)$")
+_CALIBRATION_LINES = [f"Team {i % 97} {i % 5}-{i % 23}" for i in range(4000)]
+
+
+def calibration_pass() -> int:
+    """A fixed regex/string workload of a few milliseconds; stage times are expressed in these units."""
+    hits = 0
+    for line in _CALIBRATION_LINES:
+        match = _CALIBRATION_RE.match(line)
+        if match and match.group("team").strip().lower():
+            hits += 1
+    return hits
+
+
+def time_stage(stage: Stage, jobs: Sequence[Job], samples: int) -> Tuple[float, float, int]:
+    """
+    (median seconds, median cost, blocks) for one pass over ``jobs``.
+
+    Stage passes alternate with calibration passes and cost is the median of
+    the paired ratios. Load on a shared runner comes and goes over seconds, so
+    adjacent pairs see the same machine and the ratio stays put even when the
+    raw times do not.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        blocks = sum(stage.run(job.arg) for job in jobs)
+        first = time.perf_counter() - started
+        count = max(MIN_SAMPLES, min(samples, int(SAMPLE_BUDGET_S / max(first, 1e-6))))
+
+        seconds: List[float] = []
+        ratios: List[float] = []
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for _ in range(count):
+                started = time.perf_counter()
+                calibration_pass()
+                calibration = time.perf_counter() - started
+                started = time.perf_counter()
+                for job in jobs:
+                    stage.run(job.arg)
+                elapsed = time.perf_counter() - started
+                seconds.append(elapsed)
+                ratios.append(elapsed / calibration)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+    return statistics.median(seconds), statistics.median(ratios), blocks
+
+
+def memory_stage(stage: Stage, jobs: Sequence[Job]) -> Tuple[float, int]:
+    """(peak KiB above the start, net allocated blocks still live) for one pass."""
+    results = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        # Collect first: leftover parse-tree cycles would otherwise inflate the peak.
+        gc.collect()
+        blocks_before = sys.getallocatedblocks()
+        tracemalloc.start()
+        try:
+            start, _ = tracemalloc.get_traced_memory()
+            for job in jobs:
+                results.append(stage.run(job.arg))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        gc.collect()
+        net_blocks = sys.getallocatedblocks() - blocks_before
+    return (peak - start) / 1024.0, net_blocks
+
+
+def measure_stage(stage: Stage, jobs: Sequence[Job], samples: int, memory: bool) -> Dict[str, float]:
+    seconds, cost, blocks = time_stage(stage, jobs, samples)
+    lines = sum(job.lines for job in jobs)
+    row: Dict[str, float] = {
+        "lines": lines,
+        "blocks": blocks,
+        "seconds": seconds,
+        "lines_per_s": lines / seconds if seconds else 0.0,
+        "blocks_per_s": blocks / seconds if seconds else 0.0,
+        "cost": cost,
+    }
+    if memory:
+        row["peak_kib"], row["net_blocks"] = memory_stage(stage, jobs)
+    return row
+
+
+def prepare_stages(pages: Sequence[page_corpus.Page], stage_filter: Optional[str] = None) -> List[Tuple[Stage, List[Job]]]:
+    prepared = []
+    for stage in build_stages():
+        if stage_filter and stage_filter not in stage.name:
+            continue
+        with contextlib.redirect_stdout(io.StringIO()):
+            jobs = stage.prepare(pages)
+        if jobs:
+            prepared.append((stage, jobs))
+    return prepared
+
+
+def best_of(
+    prepared: Sequence[Tuple[Stage, List[Job]]],
+    metrics: Dict[str, Dict[str, float]],
+    samples: int,
+    memory: bool,
+) -> None:
+    """Re-measure ``prepared`` stages, keeping each one's cheapest run. Load only ever adds time."""
+    for stage, jobs in prepared:
+        row = measure_stage(stage, jobs, samples, memory)
+        if stage.name not in metrics or row["cost"] < metrics[stage.name]["cost"]:
+            metrics[stage.name] = row
+
+
+def compare(
+    metrics: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Any],
+    threshold: float,
+    quiet: bool = False,
+) -> List[str]:
+    """Regression messages, comparing calibrated cost and peak memory per stage."""
+    failures: List[str] = []
+    for name, row in metrics.items():
+        base = baseline.get("stages", {}).get(name)
+        if not base:
+            continue
+        if not quiet and (row["blocks"] != base["blocks"] or row["lines"] != base["lines"]):
+            print(
+                f"[bench] {name}: output changed ({base['lines']} lines/{base['blocks']} blocks -> "
+                f"{row['lines']}/{row['blocks']}); timings are not like for like",
+                flush=True,
+            )
+        if row["cost"] > base["cost"] * (1.0 + threshold):
+            failures.append(
+                f"{name}: {row['cost'] / base['cost'] - 1:+.0%} slower than the baseline (calibrated)"
+            )
+        if "peak_kib" in row and "peak_kib" in base:
+            allowed = max(base["peak_kib"] * (1.0 + threshold), base["peak_kib"] + PEAK_FLOOR_KIB)
+            if row["peak_kib"] > allowed:
+                failures.append(
+                    f"{name}: peak {row['peak_kib']:,.0f} KiB vs baseline {base['peak_kib']:,.0f} KiB"
+                )
+    return failures
+
+
+def report(metrics: Dict[str, Dict[str, float]], baseline: Optional[Dict[str, Any]]) -> None:
+    header = ("stage", "lines", "blocks", "ms", "lines/s", "blocks/s", "peak KiB", "net blocks", "vs base")
+    rows = [header]
+    for name, row in metrics.items():
+        base = (baseline or {}).get("stages", {}).get(name)
+        # Positive means faster than the baseline.
+        delta = f"{base['cost'] / row['cost'] - 1:+.0%}" if base else "-"
+        rows.append((
+            name,
+            f"{row['lines']:,}",
+            f"{row['blocks']:,}",
+            f"{row['seconds'] * 1000:,.1f}",
+            f"{row['lines_per_s']:,.0f}",
+            f"{row['blocks_per_s']:,.0f}" if row["blocks"] else "-",
+            f"{row['peak_kib']:,.0f}" if "peak_kib" in row else "-",
+            f"{row['net_blocks']:,}" if "net_blocks" in row else "-",
+            delta,
+        ))
+    widths = [max(len(str(r[col])) for r in rows) for col in range(len(header))]
+    for r in rows:
+        print("  ".join(str(cell).ljust(widths[col]) if col == 0 else str(cell).rjust(widths[col])
+                        for col, cell in enumerate(r)))
+
+
+def growth_exponent(points: Sequence[Tuple[float, float]]) -> float:
+    """Least-squares slope of log(cost) on log(lines): 1.0 is linear, 2.0 quadratic."""
+    xs = [math.log(lines) for lines, _ in points]
+    ys = [math.log(cost) for _, cost in points]
+    mean_x = statistics.fmean(xs)
+    mean_y = statistics.fmean(ys)
+    spread = sum((x - mean_x) ** 2 for x in xs)
+    if not spread:
+        return 1.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / spread
+
+
+def scaling(
+    base: synthetic_season.SeasonSpec,
+    scale_by: str,
+    factors: Sequence[int],
+    stage_filter: Optional[str],
+    samples: int,
+) -> Dict[str, List[Tuple[float, float]]]:
+    """(input lines, calibrated cost) per stage for each multiple of ``scale_by`` in the base season."""
+    curves: Dict[str, List[Tuple[float, float]]] = {}
+    for factor in factors:
+        spec = dataclasses.replace(base, **{scale_by: getattr(base, scale_by) * factor})
+        pages, expected, _ = synthetic_season.generate(spec)
+        print(f"[bench] {scale_by} x{factor}: {len(expected):,} matches, "
+              f"{sum(len(page.html) for page in pages):,} chars", flush=True)
+        for stage, jobs in prepare_stages(pages, stage_filter):
+            _, cost, _ = time_stage(stage, jobs, samples)
+            curves.setdefault(stage.name, []).append((float(sum(job.lines for job in jobs)), cost))
+    return curves
+
+
+def report_scaling(curves: Dict[str, List[Tuple[float, float]]], factors: Sequence[int]) -> Dict[str, float]:
+    """Print cost per 1,000 input lines at each size and the fitted exponent; returns the exponents."""
+    header = ["stage"] + [f"x{factor}" for factor in factors] + ["exponent"]
+    rows = [header]
+    exponents: Dict[str, float] = {}
+    for name, points in curves.items():
+        exponents[name] = growth_exponent(points)
+        rows.append([name] + [f"{cost / lines * 1000:,.2f}" for lines, cost in points] + [f"{exponents[name]:.2f}"])
+    widths = [max(len(row[col]) for row in rows) for col in range(len(header))]
+    for row in rows:
+        print("  ".join(cell.ljust(widths[col]) if col == 0 else cell.rjust(widths[col])
+                        for col, cell in enumerate(row)))
+    print("[bench] columns are calibrated cost per 1,000 input lines; flat rows scale linearly", flush=True)
+    return exponents
+
+
+def load_baseline(path: str) -> Optional[Dict[str, Any]]:
+    if not os.path.isfile(path):
+        return None
+    with open(path, "r", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus", default=page_corpus.DEFAULT_DIR)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--samples", type=int, default=41,
+                        help="Most paired stage/calibration passes per stage (default: 41, capped by time)")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed slowdown / peak growth as a fraction (default: 0.25)")
+    parser.add_argument("--stage", help="Only run stages whose name contains this text")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass")
+    parser.add_argument("--confirm", type=int, default=3,
+                        help="Attempts per stage before a regression counts, and for a new baseline (default: 3)")
+    parser.add_argument("--update-baseline", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("--scaling", action="store_true",
+                        help="Measure growth over synthetic seasons instead of comparing with the baseline")
+    parser.add_argument("--scale-by", default="rounds", choices=("grades", "groups", "rounds", "teams"),
+                        help="Season dimension multiplied by --scaling (default: rounds)")
+    parser.add_argument("--max-exponent", type=float, default=MAX_EXPONENT,
+                        help=f"Fail --scaling when cost grows faster than lines**N (default: {MAX_EXPONENT})")
+    args = parser.parse_args()
+
+    if args.scaling:
+        curves = scaling(synthetic_season.SeasonSpec(), args.scale_by, SCALING_FACTORS, args.stage,
+                         max(MIN_SAMPLES, args.samples))
+        exponents = report_scaling(curves, SCALING_FACTORS)
+        failures = [name for name, exponent in exponents.items() if exponent > args.max_exponent]
+        for name in failures:
+            print(f"[bench] SUPER-LINEAR {name}: cost grows as lines**{exponents[name]:.2f}", flush=True)
+        if failures:
+            raise SystemExit(1)
+        print(f"[bench] {len(exponents)} stages scale within lines**{args.max_exponent}", flush=True)
+        return
+
+    pages = page_corpus.load_pages(args.corpus)
+    prepared = prepare_stages(pages, args.stage)
+    samples = max(MIN_SAMPLES, args.samples)
+    memory = not args.no_memory
+    baseline = load_baseline(args.baseline)
+
+    metrics: Dict[str, Dict[str, float]] = {}
+    best_of(prepared, metrics, samples, memory)
+    if args.update_baseline:
+        for _ in range(args.confirm - 1):
+            best_of(prepared, metrics, samples, memory)
+    elif baseline is not None:
+        for _ in range(args.confirm - 1):
+            flagged = {failure.split(":", 1)[0] for failure in compare(metrics, baseline, args.threshold, quiet=True)}
+            if not flagged:
+                break
+            print(f"[bench] re-measuring {len(flagged)} flagged stage(s)", flush=True)
+            best_of([item for item in prepared if item[0].name in flagged], metrics, samples, memory)
+
+    report(metrics, None if args.update_baseline else baseline)
+    print(f"[bench] python {platform.python_version()}; vs base is calibrated speed-up (+ is faster)", flush=True)
+
+    if args.update_baseline:
+        stages = dict((baseline or {}).get("stages", {})) if args.stage else {}
+        stages.update({
+            name: {key: (round(value, 6) if isinstance(value, float) else value) for key, value in row.items()}
+            for name, row in metrics.items()
+        })
+        with open(args.baseline, "w", encoding="utf-8") as handle:
+            json.dump({
+                "python": platform.python_version(),
+                "stages": stages,
+            }, handle, indent=2, sort_keys=True)
+            handle.write("\n")
+        print(f"[bench] baseline written -> {args.baseline}", flush=True)
+        return
+
+    if baseline is None:
+        print(f"[bench] no baseline at {args.baseline}; run with --update-baseline", flush=True)
+        return
+
+    failures = compare(metrics, baseline, args.threshold)
+    if failures:
+        for failure in failures:
+            print(f"[bench] REGRESSION {failure}", flush=True)
+        raise SystemExit(1)
+    print(f"[bench] {len(metrics)} stages within {args.threshold:.0%} of the baseline", flush=True)
+
+
+if __name__ == "__main__":
+    main()
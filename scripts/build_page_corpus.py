@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Build the synthesized pages of the page corpus (scripts/corpus) from the
+published data files.
+
+They supplement the pages capture_pages.py records from limerickgaa.ie (the
+manifest's "source" tells them apart; a rebuild leaves the captured entries
+alone): every record in the data files is rendered back into a fixture block
+with synthetic_season.py's renderer, with the variations the parsers have to
+handle (split ordinals or plain dates, 24h or am/pm times, inline and
+next-line Venue:/Referee:, inline and split scores, "-" and " - " score
+separators, W/O, BYE, TBC). A seeded random.Random picks the variations, so
+the same data files always give the same pages.
+
+  2026  hurling_2026.json and league.json, plus made-up divisional blocks
+        (clubs from the data, each TARGET_COMPETITIONS entry of the divisional
+        scraper) and a BYE row; fixtures pages as REST replies, results
+        pages as full HTML
+  2025  the per-grade files (senior.json, ...), one heading per group as on
+        the old pages; fixtures as HTML, results as REST replies
+
+The goldens in corpus/golden (parser_diff.py) and the bench baseline
+(bench_parsers.py) are outputs of the corpus: after rebuilding it, refresh
+them with parser_diff.py --update-golden and bench_parsers.py --update-baseline.
+
+Usage:
+  python scripts/build_page_corpus.py
+  python scripts/build_page_corpus.py --data-dir data --out /tmp/corpus
+"""
+
+from __future__ import annotations
+
+import argparse
+import html
+import json
+import os
+import random
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+import page_corpus
+import scrape_championship_fixtures as championship
+import scrape_divisional_hurling_championship as divisional
+import scrape_limerickgaa as limerickgaa
+import synthetic_season
+
+SEED = 2026
+GRADES = ("senior", "intermediate", "junior")
+MODES = ("fixtures", "results")
+LEAGUE_FIXTURE_ROWS = 90
+DIVISIONAL_DATES = ["2026-04-11", "2026-04-18", "2026-04-25", "2026-05-02", "2026-05-09", "2026-05-16"]
+DIVISIONAL_TIMES = ["19:00", "19:30", "14:00", None]
+DIVISIONAL_VENUES = ["Mick Neville Park", "Kilmallock", "TUS Gaelic Grounds", "Caherline", "TBC"]
+
+# 2025 per-grade file -> competition key in scrape_limerickgaa, and the page it is on.
+GRADE_FILES_2025 = {
+    "senior.json": "SHC",
+    "premier_intermediate.json": "PIHC",
+    "intermediate.json": "IHC",
+    "premier_junior_a.json": "PJAHC",
+    "junior_a.json": "JAHC",
+    "junior_c.json": "JCHC",
+}
+PAGE_2025 = {"SHC": "senior", "PIHC": "intermediate", "IHC": "intermediate",
+             "PJAHC": "junior", "JAHC": "junior", "JCHC": "junior"}
+
+Blocks = Dict[Tuple[str, str], List[Tuple[str, str, str]]]
+
+
+class CorpusRenderer(synthetic_season.Renderer):
+    """synthetic_season's markup, plus the TBC forms the published data needs."""
+
+    def meta(self, label: str, value: Optional[str]) -> str:
+        if not value or value == "TBC":
+            return self.p(f"{label}: TBC") if self.rng.random() < 0.5 else self.p(f"{label}:") + self.p("TBC")
+        return super().meta(label, value)
+
+    def block(self, heading: str, round_name: str, iso: str, home: str, away: str, time_text: Optional[str],
+              venue: Optional[str], referee: Optional[str], results: bool = False,
+              score: Tuple[Any, Any, Any, Any] = (None, None, None, None), walkover: Optional[str] = None,
+              allow_plain: bool = True) -> str:
+        home_goals, home_points, away_goals, away_points = score
+        scores = (
+            (home_goals, home_points) if results and home_goals is not None and home_points is not None else None,
+            (away_goals, away_points) if results and away_goals is not None and away_points is not None else None,
+        )
+        return synthetic_season.render_block(
+            self, heading, round_name, date.fromisoformat(iso), home, away, time_text, venue, referee, scores,
+            walkover, allow_plain,
+        )
+
+
+def _load(data_dir: str, name: str) -> Any:
+    with open(os.path.join(data_dir, name), "r", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def _write(out_dir: str, name: str, text: str) -> None:
+    with open(os.path.join(out_dir, name), "w", encoding="utf-8") as handle:
+        handle.write(text)
+
+
+def _score(record: Dict[str, Any]) -> Tuple[Any, Any, Any, Any]:
+    return (record.get("home_goals"), record.get("home_points"), record.get("away_goals"), record.get("away_points"))
+
+
+def _grade_page(competition: str) -> str:
+    if competition == "Senior Hurling Championship":
+        return "senior"
+    return "intermediate" if "Intermediate" in competition else "junior"
+
+
+def blocks_2026(renderer: CorpusRenderer, data_dir: str) -> Blocks:
+    matches = _load(data_dir, "hurling_2026.json")["matches"]
+    league = _load(data_dir, "league.json")["fixtures"]
+    headings: Dict[Tuple[str, str], str] = {}
+    for raw, key in championship._RAW_HEADING_ALIASES.items():
+        headings.setdefault(key, raw)
+    pages: Blocks = {(grade, mode): [] for grade in GRADES for mode in MODES}
+
+    for record in matches:
+        mode = "fixtures" if record["status"] == "Fixture" else "results"
+        walkover = renderer.rng.choice(["home", "away"]) if record["status"] == "Walkover" else None
+        pages[(_grade_page(record["competition"]), mode)].append((record["competition"], record["date"], renderer.block(
+            headings[(record["competition"], record["group"])], record["round"], record["date"],
+            record["home"], record["away"], record["time"], record["venue"], "TBC",
+            results=(mode == "results"), score=_score(record), walkover=walkover)))
+
+    for record in league:
+        round_name = "Final" if record["round"] == "F" else "Round " + record["round"][1:]
+        walkover = record["walkover_winner"] if record["status"] == "Walkover" else None
+        pages[("senior", "results")].append(("League", record["date"], renderer.block(
+            f"County Hurling League Division {record['group'].split()[-1]}", round_name, record["date"],
+            record["home"], record["away"], record["time_local"], record["venue"], record["referee"],
+            results=True, score=_score(record), walkover=walkover, allow_plain=False)))
+    for record in league[:LEAGUE_FIXTURE_ROWS]:
+        pages[("senior", "fixtures")].append(("League", record["date"], renderer.block(
+            f"County Hurling League Division {record['group'].split()[-1]}", "Round " + record["round"][1:],
+            record["date"], record["home"], record["away"], record["time_local"], record["venue"],
+            record["referee"], allow_plain=False)))
+
+    # The divisional competitions are not in the published data in season form; make up four
+    # matches each (two semi-final fixtures, two round 1 results) between clubs from the data.
+    rng = renderer.rng
+    clubs = sorted({record["home"] for record in matches} | {record["away"] for record in matches})
+    for config in divisional.TARGET_COMPETITIONS:
+        grade = {"Senior": "senior", "Intermediate": "intermediate"}.get(config["grade"], "junior")
+        teams = rng.sample(clubs, 4)
+        slots = [("fixtures", "Semi Final"), ("fixtures", "Semi Final"), ("results", "Round 1"), ("results", "Round 1")]
+        for index, (mode, round_name) in enumerate(slots):
+            if index >= 2:
+                home, away = teams[index - 2], teams[3 - (index - 2)]
+            else:
+                home, away = teams[index % 2 * 2], teams[index % 2 * 2 + 1]
+            day = rng.choice(DIVISIONAL_DATES)
+            results = mode == "results"
+            walkover = "home" if (results and rng.random() < 0.15) else None
+            if results and not walkover:
+                score = (rng.randint(0, 4), rng.randint(8, 24), rng.randint(0, 4), rng.randint(8, 24))
+            else:
+                score = (None, None, None, None)
+            pages[(grade, mode)].append((config["name"], day, renderer.block(
+                config["name"], round_name, day, home, away, rng.choice(DIVISIONAL_TIMES),
+                rng.choice(DIVISIONAL_VENUES), "TBC", results=results, score=score, walkover=walkover,
+                allow_plain=False)))
+
+    pages[("junior", "fixtures")].append(("Junior C Hurling Championship", "2026-08-01", renderer.block(
+        headings[("Junior C Hurling Championship", "Group 2")], "Round 5", "2026-08-01", "Knockainey", "BYE",
+        None, None, None)))
+    for blocks in pages.values():
+        blocks.sort(key=lambda entry: (entry[0], entry[1]))
+    return pages
+
+
+def sections_2025(renderer: CorpusRenderer, data_dir: str) -> Dict[Tuple[str, str], List[str]]:
+    pages: Dict[Tuple[str, str], List[str]] = {(grade, mode): [] for grade in GRADES for mode in MODES}
+    for file_name, comp_key in GRADE_FILES_2025.items():
+        payload = _load(data_dir, file_name)
+        for mode in MODES:
+            groups: Dict[str, List[Dict[str, Any]]] = {}
+            for record in payload[mode]:
+                groups.setdefault(record["group"], []).append(record)
+            for group, rows in sorted(groups.items()):
+                headings = limerickgaa.GROUPS_STRICT[comp_key]
+                heading = headings[0] if len(headings) == 1 else next(h for h in headings if h.endswith(group))
+                parts = [f"<h3>{html.escape(heading)}</h3>\n"]
+                for record in rows:
+                    walkover = renderer.rng.choice(["home", "away"]) if record["status"] == "Walkover" else None
+                    rendered = renderer.block(
+                        heading, "Round " + record["round"].replace("R", "").strip(), record["date"],
+                        record["home"], record["away"], record["time_local"], record["venue"], record["referee"],
+                        results=(mode == "results"), score=_score(record), walkover=walkover)
+                    # One heading per group on the 2025 pages: drop the per-match one.
+                    parts.append(rendered.replace(f"<h4>{html.escape(heading)}</h4>", ""))
+                pages[(PAGE_2025[comp_key], mode)].append("".join(parts))
+    return pages
+
+
+def build(data_dir: str, out_dir: str, seed: int = SEED) -> List[Dict[str, Any]]:
+    """Write the corpus pages and manifest to ``out_dir``; returns the manifest entries."""
+    renderer = CorpusRenderer(random.Random(seed))
+    for season in ("2025", "2026"):
+        os.makedirs(os.path.join(out_dir, season), exist_ok=True)
+    manifest: List[Dict[str, Any]] = []
+
+    def add(season: int, grade: str, mode: str, body: str, fmt: str) -> None:
+        slug = f"{grade}-hurling-{mode}"
+        name = f"{season}/{slug}.rest.json" if fmt == "rest" else f"{season}/{slug}.html"
+        title = f"{grade.title()} Hurling {mode.title()}"
+        _write(out_dir, name, synthetic_season.rest_document(body) if fmt == "rest" else synthetic_season.page_document(title, body))
+        manifest.append({"file": name, "format": fmt, "season": season, "mode": mode,
+                         "url": f"https://limerickgaa.ie/{slug}/"})
+
+    for (grade, mode), blocks in blocks_2026(renderer, data_dir).items():
+        sections = []
+        current = None
+        for competition, _, rendered in blocks:
+            if competition != current:
+                title = "County Hurling League" if competition == "League" else competition
+                sections.append(f"<h2>{html.escape(title)} {mode.title()}</h2>\n")
+                current = competition
+            sections.append(rendered)
+        body = "".join(sections) + "<h2>Football</h2>\n<p>See football fixtures page</p>\n"
+        add(2026, grade, mode, body, "rest" if mode == "fixtures" else "html")
+
+    for (grade, mode), sections in sections_2025(renderer, data_dir).items():
+        body = "".join(sections) + "<h2>County Hurling League</h2>\n<h2>Football</h2>\n"
+        add(2025, grade, mode, body, "rest" if mode == "results" else "html")
+
+    # Captured pages (capture_pages.py) stay in the manifest next to the rebuilt ones.
+    page_corpus.replace_entries(out_dir, page_corpus.SYNTHESIZED, manifest)
+    return manifest
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--data-dir", default="data", help="Published data files to render (default: data)")
+    parser.add_argument("--out", default=page_corpus.DEFAULT_DIR, help="Corpus directory (default: scripts/corpus)")
+    parser.add_argument("--seed", type=int, default=SEED, help=f"Seed for the markup variations (default: {SEED})")
+    args = parser.parse_args()
+
+    manifest = build(args.data_dir, args.out, args.seed)
+    print(f"[corpus] wrote {len(manifest)} pages -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Record the live limerickgaa.ie pages into the page corpus (scripts/corpus).
+
+For every page the 2026 scrapers read (scrape_championship_fixtures.PAGES)
+this saves both forms the scrapers fetch, byte for byte:
+
+  captured/<season>/rest/<slug>.rest.json   the WordPress pages API reply
+  captured/<season>/html/<slug>.html        the public page
+
+and lists them in the manifest with source "captured" and the capture date.
+A capture replaces the earlier captures of the same season; other seasons'
+captures and the synthesized pages (build_page_corpus.py) are kept. Nothing
+is written unless every fetch succeeds.
+
+The goldens (parser_diff.py) and the bench baseline (bench_parsers.py) cover
+the captured pages too: after a capture, check the parsers' output with
+parser_diff.py, then refresh them with parser_diff.py --update-golden and
+bench_parsers.py --update-baseline.
+
+Usage:
+  python scripts/capture_pages.py
+  python scripts/capture_pages.py --out /tmp/corpus
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from datetime import date
+from typing import Any, Dict, List, Tuple
+
+import page_corpus
+import scrape_championship_fixtures as championship
+
+REST_URL = f"{championship.BASE}/wp-json/wp/v2/pages"
+
+
+def fetch_rest(slug: str) -> str:
+    response = championship.SESSION.get(
+        REST_URL,
+        params={"slug": slug, "_fields": "content.rendered"},
+        timeout=(15, 75),
+    )
+    response.raise_for_status()
+    return response.text
+
+
+def capture(season: int) -> List[Tuple[Dict[str, Any], str]]:
+    """(manifest entry, raw text) for both forms of every page."""
+    captured_on = date.today().isoformat()
+    captures: List[Tuple[Dict[str, Any], str]] = []
+    for _, url, slug in championship.PAGES:
+        mode = "fixtures" if slug.endswith("fixtures") else "results"
+        print(f"[capture] {slug}", flush=True)
+        for fmt, name, raw in (
+            ("rest", f"{slug}.rest.json", fetch_rest(slug)),
+            ("html", f"{slug}.html", championship.http_get(url).text),
+        ):
+            if fmt == "rest" and not page_corpus.rendered_html(raw, fmt):
+                print(f"[capture] {slug}: REST reply has no content; keeping the HTML page only", flush=True)
+                continue
+            entry = {"file": f"captured/{season}/{fmt}/{name}", "format": fmt, "season": season, "mode": mode,
+                     "url": url, "captured": captured_on}
+            captures.append((entry, raw))
+    return captures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--out", default=page_corpus.DEFAULT_DIR, help="Corpus directory (default: scripts/corpus)")
+    args = parser.parse_args()
+
+    season = championship.SEASON
+    try:
+        captures = capture(season)
+    except Exception as exc:
+        print(f"[capture] failed, corpus left unchanged: {exc}", flush=True)
+        sys.exit(1)
+
+    for entry, raw in captures:
+        path = os.path.join(args.out, entry["file"])
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.write(raw)
+    page_corpus.replace_entries(args.out, page_corpus.CAPTURED, [entry for entry, _ in captures], season=season)
+    print(f"[capture] wrote {len(captures)} pages -> {os.path.join(args.out, 'captured', str(season))}")
+
+
+if __name__ == "__main__":
+    main()
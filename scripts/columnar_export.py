@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Columnar, dictionary-encoded export of the league and championship payloads.
+
+Row-oriented files repeat every key name and long strings (competition names,
+source URLs, "Europe/Dublin") on each record. The columnar form stores one
+array per field and replaces repeated strings with indexes into shared
+dictionary tables:
+
+  {
+    "format": "lgh-columnar/1",
+    "records": "fixtures",            # key of the record list in the row payload
+    "meta": {...},                    # every other top-level field, unchanged
+    "layout": ["competition", ...],   # top-level key order of the row payload
+    "count": 1016,
+    "columns": ["id", "competition", ...],
+    "encoding": {"home": "teams", "round": "round", "id": null, ...},
+    "dicts": {"teams": [...], "venues": [...], "referees": [...], "competitions": [...], ...},
+    "data": {"id": [...], "home": [3, 17, ...], ...},
+    "missing": {"home_goals": [12, 40]}   # rows where the key was absent, not null
+  }
+
+A column is dictionary-encoded when it maps to a named table (teams, venues,
+referees, competitions) or when its strings repeat enough to pay for a table.
+Nulls stay null. decode() restores the original payload exactly.
+
+Usage:
+  python scripts/columnar_export.py data/league.json data/hurling_2026.json
+  python scripts/columnar_export.py data/league.json --out data/league.columnar.json --verify
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+FORMAT = "lgh-columnar/1"
+RECORD_KEYS = ("fixtures", "matches")
+
+# Columns that share a named dictionary table.
+SHARED_TABLES = {
+    "home": "teams",
+    "away": "teams",
+    "venue": "venues",
+    "referee": "referees",
+    "competition": "competitions",
+}
+
+# Other string columns get their own table when at most this share of values is distinct.
+DICT_DISTINCT_RATIO = 0.5
+
+
+def records_key_of(payload: Dict[str, Any]) -> str:
+    for key in RECORD_KEYS:
+        if isinstance(payload.get(key), list):
+            return key
+    raise ValueError(f"payload has none of {', '.join(RECORD_KEYS)}")
+
+
+def _columns(records: List[Dict[str, Any]]) -> List[str]:
+    seen: Dict[str, None] = {}
+    for record in records:
+        for key in record:
+            seen.setdefault(key, None)
+    return list(seen)
+
+
+def _dictionary_for(column: str, values: List[Any]) -> Optional[str]:
+    if column in SHARED_TABLES:
+        return SHARED_TABLES[column]
+    strings = [value for value in values if value is not None]
+    if not strings or not all(isinstance(value, str) for value in strings):
+        return None
+    if len(set(strings)) <= len(strings) * DICT_DISTINCT_RATIO:
+        return column
+    return None
+
+
+def encode(payload: Dict[str, Any]) -> Dict[str, Any]:
+    records_key = records_key_of(payload)
+    records: List[Dict[str, Any]] = payload[records_key]
+    columns = _columns(records)
+
+    dicts: Dict[str, List[str]] = {}
+    lookups: Dict[str, Dict[str, int]] = {}
+    encoding: Dict[str, Optional[str]] = {}
+    data: Dict[str, List[Any]] = {}
+    missing: Dict[str, List[int]] = {}
+
+    for column in columns:
+        values: List[Any] = []
+        for row, record in enumerate(records):
+            if column not in record:
+                missing.setdefault(column, []).append(row)
+            values.append(record.get(column))
+
+        table = _dictionary_for(column, values)
+        encoding[column] = table
+        if table is None:
+            data[column] = values
+            continue
+
+        entries = dicts.setdefault(table, [])
+        lookup = lookups.setdefault(table, {})
+        encoded: List[Optional[int]] = []
+        for value in values:
+            if value is None:
+                encoded.append(None)
+                continue
+            index = lookup.get(value)
+            if index is None:
+                index = lookup[value] = len(entries)
+                entries.append(value)
+            encoded.append(index)
+        data[column] = encoded
+
+    doc: Dict[str, Any] = {
+        "format": FORMAT,
+        "records": records_key,
+        "meta": {key: value for key, value in payload.items() if key != records_key},
+        "layout": list(payload),
+        "count": len(records),
+        "columns": columns,
+        "encoding": encoding,
+        "dicts": dicts,
+        "data": data,
+    }
+    if missing:
+        doc["missing"] = missing
+    return doc
+
+
+def decode(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Reference decoder: rebuild the row-oriented payload from a columnar doc."""
+    if doc.get("format") != FORMAT:
+        raise ValueError(f"unsupported columnar format: {doc.get('format')!r}")
+
+    count = doc["count"]
+    columns = doc["columns"]
+    dicts = doc["dicts"]
+    absent = {column: set(rows) for column, rows in doc.get("missing", {}).items()}
+
+    decoded: Dict[str, List[Any]] = {}
+    for column in columns:
+        values = doc["data"][column]
+        table = doc["encoding"].get(column)
+        if table is not None:
+            entries = dicts[table]
+            values = [None if index is None else entries[index] for index in values]
+        decoded[column] = values
+
+    records: List[Dict[str, Any]] = []
+    for row in range(count):
+        record: Dict[str, Any] = {}
+        for column in columns:
+            if row in absent.get(column, ()):
+                continue
+            record[column] = decoded[column][row]
+        records.append(record)
+
+    meta = doc["meta"]
+    return {
+        key: records if key == doc["records"] else meta[key]
+        for key in doc.get("layout", list(meta) + [doc["records"]])
+    }
+
+
+def dumps_compact(obj: Any) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def parse_seconds(text: str, repeat: int = 20) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        json.loads(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def default_out_path(path: str) -> str:
+    return f"{path[: -len('.json')]}.columnar.json" if path.endswith(".json") else f"{path}.columnar"
+
+
+def export(path: str, out_path: Optional[str], verify: bool) -> Tuple[int, int, float, float]:
+    with open(path, "r", encoding="utf-8") as handle:
+        row_text = handle.read()
+    payload = json.loads(row_text)
+
+    doc = encode(payload)
+    if verify:
+        restored = decode(doc)
+        if restored != payload or list(restored) != list(payload):
+            raise SystemExit(f"[columnar] round-trip mismatch for {path}")
+        records_key = doc["records"]
+        for original, back in zip(payload[records_key], restored[records_key]):
+            if list(original) != list(back):
+                raise SystemExit(f"[columnar] key order changed for {path}: {original!r}")
+
+    col_text = dumps_compact(doc)
+    target = out_path or default_out_path(path)
+    temp_path = f"{target}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as handle:
+        handle.write(col_text)
+        handle.write("\n")
+    os.replace(temp_path, target)
+
+    row_compact = dumps_compact(payload)
+    return (
+        len(row_compact.encode("utf-8")),
+        len(col_text.encode("utf-8")),
+        parse_seconds(row_compact),
+        parse_seconds(col_text),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("files", nargs="+", help="Row-oriented JSON files, e.g. data/league.json")
+    parser.add_argument("--out", default=None, help="Output path (only with a single input file)")
+    parser.add_argument("--verify", action="store_true", help="Fail unless decode(encode(x)) == x")
+    args = parser.parse_args()
+
+    if args.out and len(args.files) != 1:
+        parser.error("--out needs exactly one input file")
+
+    for path in args.files:
+        row_size, col_size, row_parse, col_parse = export(path, args.out, args.verify)
+        print(
+            f"[columnar] {os.path.basename(path)}: {row_size:,} -> {col_size:,} bytes "
+            f"({col_size / row_size:.0%}), parse {row_parse * 1000:.2f} -> {col_parse * 1000:.2f} ms"
+            + (" [round-trip ok]" if args.verify else ""),
+            flush=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+Delta patch feed between successive data snapshots.
+
+Each dataset (league.json, hurling_2026.json, ...) keeps a version chain under
+<delta_dir>/<dataset>/:
+
+  index.json            {"dataset", "snapshot", "latest", "key", "patches": {"<from>": "<file>"}}
+  <from>-<latest>.json  one patch from each retained version straight to latest
+
+A patch carries the records added, changed and removed between two versions,
+keyed by a stable record id, plus the non-record fields of the newer snapshot
+("meta", which replaces the older snapshot's):
+
+  {"dataset", "from", "to", "key", "records", "meta",
+   "added": [...], "changed": [...], "removed": ["<key>", ...]}
+
+A new version is cut when the records or the meta change; the fields in
+VOLATILE_META (the run timestamps, and stale_pages, which ages on every run
+while a page is served from the breaker's cache) do not count, so a client
+holding the latest version may show an older "updated" time. The full snapshot stores its
+own "version" so a client knows which patch to ask for. A client whose version
+is not listed in the index (too old, or the chain was restarted) falls back to
+the full snapshot. js/app_v14.js is that client: it keeps the last snapshot of
+each live file in localStorage and brings it up to date from the index.
+
+The scrapers' --deltas and --publish both go through publish_streamed(): the
+new records are diffed one at a time as data_writer streams them to the
+output, so only the previous snapshot and the changed records are held, and
+the version is written after the records (data_writer's trailer).
+
+Workflows that retry a scrape publish once, after the last attempt, with
+--publish: the scraped file is chained onto the snapshot clients hold
+(--previous) and stamped with its version. Publishing from every attempt
+would move the chain past that snapshot and restart it on the next one.
+
+Usage:
+  python scripts/data_delta.py data/deltas/league     # inspect a chain
+  python scripts/data_delta.py --publish data/deltas --previous data/league.json tmp_league/league.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import data_reader
+import data_writer
+
+# Older versions beyond this are dropped; those clients reload the snapshot.
+HISTORY = 30
+
+INDEX_NAME = "index.json"
+
+# Top-level fields rewritten by every run; a change in them alone is not a new version.
+VOLATILE_META = ("updated", "updated_at", "stale_pages")
+
+
+def record_key(record: Dict[str, Any], key_fields: Sequence[str]) -> str:
+    """Stable id of a record: the "id" field, or the listed fields joined by "|"."""
+    return "|".join(str(record.get(field) or "") for field in key_fields)
+
+
+def keyed(records: Sequence[Dict[str, Any]], key_fields: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+    return {record_key(record, key_fields): record for record in records}
+
+
+class RecordDiff:
+    """diff_records() for new records that stream past once, through feed()."""
+
+    def __init__(self, old: Sequence[Dict[str, Any]], key_fields: Sequence[str]) -> None:
+        self.old_by_key = keyed(old, key_fields)
+        self.key_fields = key_fields
+        self.added: Dict[str, Dict[str, Any]] = {}
+        # Old keys seen so far -> their new record when it differs, else None.
+        self.seen: Dict[str, Optional[Dict[str, Any]]] = {}
+
+    def feed(self, records: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        for record in records:
+            key = record_key(record, self.key_fields)
+            if key not in self.old_by_key:
+                self.added[key] = record
+            else:
+                self.seen[key] = None if self.old_by_key[key] == record else record
+            yield record
+
+    def result(self) -> Dict[str, Any]:
+        return {
+            "added": list(self.added.values()),
+            "changed": [record for record in self.seen.values() if record is not None],
+            "removed": sorted(key for key in self.old_by_key if key not in self.seen),
+        }
+
+
+def diff_records(
+    old: Sequence[Dict[str, Any]],
+    new: Sequence[Dict[str, Any]],
+    key_fields: Sequence[str],
+) -> Dict[str, Any]:
+    diff = RecordDiff(old, key_fields)
+    for _ in diff.feed(new):
+        pass
+    return diff.result()
+
+
+def is_empty(patch: Dict[str, Any]) -> bool:
+    return not (patch["added"] or patch["changed"] or patch["removed"])
+
+
+def meta_fields(payload: Dict[str, Any], records_key: str) -> Dict[str, Any]:
+    """The snapshot's non-record fields, as carried in a patch's "meta"."""
+    return {key: value for key, value in payload.items() if key not in (records_key, "version")}
+
+
+def same_meta(old: Dict[str, Any], new: Dict[str, Any]) -> bool:
+    """Whether two metas differ only in VOLATILE_META."""
+    def stable(meta: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: value for key, value in meta.items() if key not in VOLATILE_META}
+    return stable(old) == stable(new)
+
+
+def compose(first: Dict[str, Any], second: Dict[str, Any], key_fields: Sequence[str]) -> Dict[str, Any]:
+    """Combine patch A->B with patch B->C into a single patch A->C."""
+    added = keyed(first["added"], key_fields)
+    changed = keyed(first["changed"], key_fields)
+    removed = set(first["removed"])
+
+    for key in second["removed"]:
+        if key in added:
+            # Appeared and disappeared again between A and C.
+            del added[key]
+            continue
+        changed.pop(key, None)
+        removed.add(key)
+
+    for record in second["added"]:
+        key = record_key(record, key_fields)
+        if key in removed:
+            removed.discard(key)
+            changed[key] = record
+        else:
+            added[key] = record
+
+    for record in second["changed"]:
+        key = record_key(record, key_fields)
+        if key in added:
+            added[key] = record
+        else:
+            changed[key] = record
+
+    return {
+        "added": list(added.values()),
+        "changed": list(changed.values()),
+        "removed": sorted(removed),
+    }
+
+
+def apply_patch(snapshot: Dict[str, Any], patch: Dict[str, Any]) -> Dict[str, Any]:
+    """Reference client: apply a patch to a full snapshot payload."""
+    records_key = patch["records"]
+    key_fields = patch["key"]
+    by_key = keyed(snapshot.get(records_key, []), key_fields)
+
+    for key in patch["removed"]:
+        by_key.pop(key, None)
+    for record in list(patch["changed"]) + list(patch["added"]):
+        by_key[record_key(record, key_fields)] = record
+
+    out = dict(patch["meta"])
+    out[records_key] = list(by_key.values())
+    out["version"] = patch["to"]
+    return out
+
+
+def _read_json(path: str) -> Optional[Any]:
+    if not os.path.isfile(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            return json.load(handle)
+    except (OSError, ValueError) as exc:
+        print(f"[delta] ignored unreadable {path}: {exc}", flush=True)
+        return None
+
+
+def _write_json(path: str, payload: Any) -> None:
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as handle:
+        json.dump(payload, handle, ensure_ascii=False, separators=(",", ":"))
+        handle.write("\n")
+    os.replace(temp_path, path)
+
+
+def _patch_name(from_version: int, to_version: int) -> str:
+    return f"{from_version}-{to_version}.json"
+
+
+def _read_previous(previous_path: Optional[str]) -> Optional[Dict[str, Any]]:
+    previous = _read_json(previous_path) if previous_path else None
+    return previous if isinstance(previous, dict) else None
+
+
+def publish(
+    delta_dir: str,
+    dataset: str,
+    previous_path: Optional[str],
+    payload: Dict[str, Any],
+    records_key: str,
+    key_fields: Sequence[str],
+) -> int:
+    """
+    Extend the dataset's version chain with ``payload`` and return its version.
+
+    ``previous_path`` is the snapshot clients currently hold. When its version
+    does not match the chain (first run, hand edit, lost index) the chain is
+    restarted and every client reloads the full snapshot once.
+    """
+    previous = _read_previous(previous_path)
+    step = diff_records(previous.get(records_key, []) if previous else [], payload.get(records_key, []), key_fields)
+    return _extend(delta_dir, dataset, previous_path, previous, meta_fields(payload, records_key), step,
+                   records_key, key_fields)
+
+
+def publish_streamed(
+    delta_dir: str,
+    dataset: str,
+    previous_path: Optional[str],
+    payload: Dict[str, Any],
+    records_key: str,
+    key_fields: Sequence[str],
+) -> Tuple[Dict[str, Any], Callable[[], Dict[str, Any]]]:
+    """
+    publish() for data_writer.write_payload(): returns the payload to write,
+    its records diffed as the writer streams them, and the writer's trailer,
+    which extends the chain once the last record is written and returns
+    {"version": N}.
+    """
+    previous = _read_previous(previous_path)
+    diff = RecordDiff(previous.get(records_key, []) if previous else [], key_fields)
+    meta = meta_fields(payload, records_key)
+    streamed = dict(payload)
+    streamed[records_key] = diff.feed(payload.get(records_key) or [])
+
+    def trailer() -> Dict[str, Any]:
+        return {"version": _extend(delta_dir, dataset, previous_path, previous, meta, diff.result(),
+                                   records_key, key_fields)}
+
+    return streamed, trailer
+
+
+def _extend(
+    delta_dir: str,
+    dataset: str,
+    previous_path: Optional[str],
+    previous: Optional[Dict[str, Any]],
+    meta: Dict[str, Any],
+    step: Dict[str, Any],
+    records_key: str,
+    key_fields: Sequence[str],
+) -> int:
+    """Cut the version after ``previous`` from its record diff ``step`` and the new ``meta``."""
+    chain_dir = os.path.join(delta_dir, dataset)
+    os.makedirs(chain_dir, exist_ok=True)
+    index_path = os.path.join(chain_dir, INDEX_NAME)
+
+    index = _read_json(index_path) or {}
+    latest = index.get("latest")
+    key_fields = list(key_fields)
+
+    chained = (
+        previous is not None
+        and isinstance(latest, int)
+        and previous.get("version") == latest
+        and index.get("key") == key_fields
+    )
+
+    if not chained:
+        version = (latest or 0) + 1
+        for name in os.listdir(chain_dir):
+            if name != INDEX_NAME and name.endswith(".json"):
+                os.remove(os.path.join(chain_dir, name))
+        _write_json(index_path, {
+            "dataset": dataset,
+            "snapshot": os.path.basename(previous_path or f"{dataset}.json"),
+            "latest": version,
+            "key": key_fields,
+            "patches": {},
+        })
+        print(f"[delta] {dataset}: chain restarted at version {version}", flush=True)
+        return version
+
+    if is_empty(step) and same_meta(meta_fields(previous, records_key), meta):
+        print(f"[delta] {dataset}: no record or meta changes, staying at version {latest}", flush=True)
+        return latest
+
+    version = latest + 1
+
+    patches: Dict[int, Dict[str, Any]] = {latest: step}
+    for from_text, name in (index.get("patches") or {}).items():
+        from_version = int(from_text)
+        if from_version <= version - HISTORY:
+            continue
+        older = _read_json(os.path.join(chain_dir, name))
+        if older is None:
+            continue
+        patches[from_version] = compose(older, step, key_fields)
+
+    written: Dict[str, str] = {}
+    for from_version in sorted(patches):
+        name = _patch_name(from_version, version)
+        body = patches[from_version]
+        _write_json(os.path.join(chain_dir, name), {
+            "dataset": dataset,
+            "from": from_version,
+            "to": version,
+            "key": key_fields,
+            "records": records_key,
+            "meta": meta,
+            "added": body["added"],
+            "changed": body["changed"],
+            "removed": body["removed"],
+        })
+        written[str(from_version)] = name
+
+    for name in os.listdir(chain_dir):
+        if name != INDEX_NAME and name.endswith(".json") and name not in written.values():
+            os.remove(os.path.join(chain_dir, name))
+
+    index.update({"latest": version, "key": key_fields, "patches": written})
+    _write_json(index_path, index)
+
+    print(
+        f"[delta] {dataset}: version {latest} -> {version} "
+        f"(+{len(step['added'])} ~{len(step['changed'])} -{len(step['removed'])})",
+        flush=True,
+    )
+    return version
+
+
+def publish_file(delta_dir: str, path: str, previous_path: str) -> int:
+    """Chain the data file ``path`` onto ``previous_path`` and write its version into it."""
+    import match_store  # here, not at the top: match_store imports this module
+
+    spec = match_store.KNOWN_FILES.get(os.path.basename(previous_path))
+    if spec is None:
+        raise SystemExit(f"{os.path.basename(previous_path)} is not a known dataset")
+    records_key = spec["records"]
+    # Header fields first, the records left in place; they are streamed from the file
+    # (the writer assembles the new one beside it) while the diff runs.
+    payload: Dict[str, Any] = {}
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            for kind, key, value in data_reader.iter_payload(handle):
+                if kind == data_reader.FIELD:
+                    payload[key] = value
+                elif kind == data_reader.RECORDS:
+                    payload[key] = None
+    except (OSError, ValueError) as exc:
+        raise SystemExit(f"Cannot read {path}: {exc}")
+    payload.pop("version", None)
+    payload[records_key] = data_reader.iter_records(path, records_key)
+    payload, trailer = publish_streamed(delta_dir, spec["dataset"], previous_path, payload, records_key, spec["key"])
+    version = 0
+
+    def stamped() -> Dict[str, Any]:
+        nonlocal version
+        fields = trailer()
+        version = fields["version"]
+        return fields
+
+    data_writer.write_payload(path, payload, previous_path=previous_path, trailer=stamped)
+    return version
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Summarise a delta chain directory, or publish a data file to it")
+    parser.add_argument("path", help="Chain directory (e.g. data/deltas/league), or the data file with --publish")
+    parser.add_argument("--publish", metavar="DELTA_DIR", default=None,
+                        help="Publish the data file's changes to the chains under DELTA_DIR (e.g. data/deltas)")
+    parser.add_argument("--previous", default=None,
+                        help="With --publish: the snapshot clients hold, e.g. data/league.json")
+    args = parser.parse_args()
+
+    if args.publish:
+        if not args.previous:
+            parser.error("--publish needs --previous")
+        publish_file(args.publish, args.path, args.previous)
+        return
+
+    index = _read_json(os.path.join(args.path, INDEX_NAME))
+    if not index:
+        raise SystemExit(f"No {INDEX_NAME} in {args.path}")
+
+    print(f"{index['dataset']}: latest version {index['latest']} (snapshot {index['snapshot']})")
+    patches: List[str] = []
+    for from_text, name in sorted(index.get("patches", {}).items(), key=lambda item: int(item[0])):
+        size = os.path.getsize(os.path.join(args.path, name))
+        patches.append(f"  {from_text} -> {index['latest']}: {name} ({size} bytes)")
+    print("\n".join(patches) if patches else "  no patches yet")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Lazy streaming reader over the published data files.
+
+Every data file is a JSON object holding a few header fields and one or more
+record lists ("matches", "fixtures", "results"). iter_payload() walks such a
+file with an incremental parser: it reads fixed-size chunks, decodes one
+header value or one record at a time with json.JSONDecoder.raw_decode and
+drops consumed text, so memory stays flat however large the file or archive.
+
+scan() runs over hurling_*.json, league.json, divisional_championship.json
+and archive/*.json with predicate push-down:
+
+- files whose season (file name, or the "season" header read before any
+  record) falls outside the date range are skipped without reading records;
+- competition, club and date filters run on each record as it is decoded;
+- ``fields`` projects each record down to the requested keys.
+
+Usage:
+  python scripts/data_reader.py --competition "Senior Hurling Championship" --from 2025-07-01
+  python scripts/data_reader.py --club Patrickswell --fields date,competition,home,away,status
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import os
+import re
+from typing import Any, Dict, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+RECORD_KEYS = ("matches", "fixtures", "results")
+
+DEFAULT_PATTERNS = (
+    "hurling_*.json",
+    "league.json",
+    "divisional_championship.json",
+    os.path.join("archive", "*.json"),
+)
+
+CHUNK_SIZE = 1 << 16
+WHITESPACE = " \t\n\r"
+SEASON_IN_NAME_RE = re.compile(r"_(\d{4})\.json$")
+
+# Events produced by iter_payload().
+FIELD = "field"
+RECORDS = "records"
+RECORD = "record"
+Event = Tuple[str, str, Any]
+
+
+class _Stream:
+    """Chunked character buffer with just enough tokenising for the top-level object."""
+
+    def __init__(self, handle: TextIO, chunk_size: int = CHUNK_SIZE) -> None:
+        self._handle = handle
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self._handle.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        # Drop consumed text so the buffer never grows beyond one value plus a chunk.
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"expected {char!r}, found {found!r}")
+        self._pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number cut at the chunk boundary decodes "successfully"; read on.
+            if end == len(self._buf) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+
+def iter_payload(handle: TextIO) -> Iterator[Event]:
+    """
+    Yield ("field", key, value) for header fields, ("records", key, None) at
+    the start of each record list and ("record", key, record) per record, in
+    file order.
+    """
+    stream = _Stream(handle)
+    stream.expect("{")
+    if stream.peek() == "}":
+        return
+    while True:
+        key = stream.value()
+        stream.expect(":")
+        if key in RECORD_KEYS and stream.peek() == "[":
+            stream.expect("[")
+            yield RECORDS, key, None
+            if stream.peek() == "]":
+                stream.expect("]")
+            else:
+                while True:
+                    yield RECORD, key, stream.value()
+                    if stream.peek() == ",":
+                        stream.expect(",")
+                        continue
+                    stream.expect("]")
+                    break
+        else:
+            yield FIELD, key, stream.value()
+
+        if stream.peek() == ",":
+            stream.expect(",")
+            continue
+        stream.expect("}")
+        return
+
+
+def iter_records(path: str, records_key: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Yield the records of one file lazily (from every record list unless ``records_key`` is given)."""
+    with open(path, "r", encoding="utf-8") as handle:
+        for kind, key, value in iter_payload(handle):
+            if kind == RECORD and (records_key is None or key == records_key):
+                yield value
+
+
+def club_slug(name: Optional[str]) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", (name or "").strip().lower()).strip("-")
+
+
+def default_paths(data_dir: str = "data") -> List[str]:
+    paths: List[str] = []
+    for pattern in DEFAULT_PATTERNS:
+        paths.extend(sorted(glob.glob(os.path.join(data_dir, pattern))))
+    return paths
+
+
+def _season_outside(season: Any, date_from: Optional[str], date_to: Optional[str]) -> bool:
+    try:
+        year = int(season)
+    except (TypeError, ValueError):
+        return False
+    if date_from and year < int(date_from[:4]):
+        return True
+    if date_to and year > int(date_to[:4]):
+        return True
+    return False
+
+
+def scan(
+    paths: Optional[Sequence[str]] = None,
+    fields: Optional[Sequence[str]] = None,
+    competition: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    club: Optional[str] = None,
+    data_dir: str = "data",
+) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily yield matching records across data files. Dates are YYYY-MM-DD and
+    inclusive. Each record gains "_source" (file path) when it is requested
+    in ``fields``.
+    """
+    wanted_competition = (competition or "").strip().casefold() or None
+    wanted_club = club_slug(club) or None
+
+    for path in paths if paths is not None else default_paths(data_dir):
+        name_season = SEASON_IN_NAME_RE.search(os.path.basename(path))
+        if name_season and _season_outside(name_season.group(1), date_from, date_to):
+            continue
+
+        with open(path, "r", encoding="utf-8") as handle:
+            file_competition: Optional[str] = None
+            for kind, key, value in iter_payload(handle):
+                if kind == FIELD:
+                    if key == "season" and _season_outside(value, date_from, date_to):
+                        break
+                    if key == "competition" and isinstance(value, str):
+                        file_competition = value
+                    continue
+                if kind != RECORD or not isinstance(value, dict):
+                    continue
+
+                record = value
+                record_date = record.get("date") or ""
+                if date_from and (not record_date or record_date < date_from):
+                    continue
+                if date_to and (not record_date or record_date > date_to):
+                    continue
+                if wanted_competition:
+                    record_competition = record.get("competition") or file_competition or ""
+                    if record_competition.strip().casefold() != wanted_competition:
+                        continue
+                if wanted_club and wanted_club not in (
+                    club_slug(record.get("home")), club_slug(record.get("away"))
+                ):
+                    continue
+
+                if fields:
+                    yield {
+                        field: (path if field == "_source" else record.get(field))
+                        for field in fields
+                    }
+                else:
+                    yield record
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("files", nargs="*", help="Data files (default: the standard set under --data-dir)")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--competition")
+    parser.add_argument("--club")
+    parser.add_argument("--from", dest="date_from", help="YYYY-MM-DD, inclusive")
+    parser.add_argument("--to", dest="date_to", help="YYYY-MM-DD, inclusive")
+    parser.add_argument("--fields", help="Comma-separated projection, e.g. date,home,away,_source")
+    parser.add_argument("--count", action="store_true", help="Print only the number of matching records")
+    args = parser.parse_args()
+
+    fields = [f.strip() for f in args.fields.split(",") if f.strip()] if args.fields else None
+    records = scan(
+        paths=args.files or None,
+        fields=fields,
+        competition=args.competition,
+        date_from=args.date_from,
+        date_to=args.date_to,
+        club=args.club,
+        data_dir=args.data_dir,
+    )
+
+    if args.count:
+        print(sum(1 for _ in records))
+        return
+    for record in records:
+        print(json.dumps(record, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Shared streaming JSON writer for the scrapers.
+
+write_payload() takes a payload whose record list may be a generator. Records
+are encoded one at a time into a temporary body file, so peak memory holds a
+single record's encoding rather than the dataclasses, their dicts and the
+whole encoder buffer at once. The output is byte-identical to
+json.dump(payload, indent=2) plus a trailing newline.
+
+While streaming, a digest of the payload is computed with the volatile
+"updated"/"updated_at" fields left out. When it matches the previous
+snapshot the previous bytes are kept (copied when writing to a tmp dir), so the
+timestamp only advances when the data does. Otherwise the file is assembled
+in a temp file, fsynced and atomically renamed over the output.
+
+Fields that depend on the records (the delta feed's "version",
+data_delta.publish_streamed()) come from a ``trailer``: called once the last
+record has been streamed, its fields are digested and written after the
+payload's own.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+from typing import Any, Callable, Dict, Iterable, Optional, TextIO
+
+import data_reader
+
+# Top-level fields that change on every run without the data changing.
+VOLATILE_KEYS = ("updated", "updated_at")
+
+# Payload keys that hold the record list.
+RECORD_KEYS = ("matches", "fixtures", "results")
+
+COPY_CHUNK = 1 << 16
+
+
+def _compact(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _indented(value: Any, prefix: str) -> str:
+    """json.dumps(value, indent=2) as it appears nested under ``prefix`` indentation."""
+    text = json.dumps(value, ensure_ascii=False, indent=2)
+    return text.replace("\n", "\n" + prefix)
+
+
+class _Digest:
+    """Order-sensitive digest of a payload, ignoring VOLATILE_KEYS."""
+
+    def __init__(self) -> None:
+        self._hash = hashlib.sha256()
+
+    def field(self, key: str, value: Any) -> None:
+        if key not in VOLATILE_KEYS:
+            self._hash.update(b"F" + _compact([key, value]) + b"\n")
+
+    def records(self, key: str) -> None:
+        self._hash.update(b"R" + _compact(key) + b"\n")
+
+    def record(self, record: Any) -> None:
+        self._hash.update(b"r" + _compact(record) + b"\n")
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
+def payload_digest(payload: Dict[str, Any]) -> str:
+    digest = _Digest()
+    for key, value in payload.items():
+        if key in RECORD_KEYS and isinstance(value, list):
+            digest.records(key)
+            for record in value:
+                digest.record(record)
+        else:
+            digest.field(key, value)
+    return digest.hexdigest()
+
+
+def previous_digest(path: Optional[str]) -> Optional[str]:
+    if not path or not os.path.isfile(path):
+        return None
+    # Streamed so the previous snapshot is never held in memory as a whole.
+    digest = _Digest()
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            for kind, key, value in data_reader.iter_payload(handle):
+                if kind == data_reader.FIELD:
+                    digest.field(key, value)
+                elif kind == data_reader.RECORDS:
+                    digest.records(key)
+                else:
+                    digest.record(value)
+    except (OSError, ValueError) as exc:
+        print(f"[writer] previous snapshot ignored ({path}): {exc}", flush=True)
+        return None
+    return digest.hexdigest()
+
+
+def _stream_records(records: Iterable[Any], body: TextIO, digest: _Digest) -> int:
+    count = 0
+    for record in records:
+        if count:
+            body.write(",\n")
+        body.write("    ")
+        body.write(_indented(record, "    "))
+        digest.record(record)
+        count += 1
+    return count
+
+
+def _copy(src: TextIO, dst: TextIO) -> None:
+    while True:
+        chunk = src.read(COPY_CHUNK)
+        if not chunk:
+            return
+        dst.write(chunk)
+
+
+def write_payload(
+    out_path: str,
+    payload: Dict[str, Any],
+    previous_path: Optional[str] = None,
+    trailer: Optional[Callable[[], Dict[str, Any]]] = None,
+) -> bool:
+    """
+    Stream ``payload`` to ``out_path`` unless it only differs from the previous
+    snapshot in VOLATILE_KEYS. Values under RECORD_KEYS may be any iterable.
+    ``trailer()``, called after the records are consumed, supplies fields
+    written last. ``previous_path`` defaults to ``out_path``. Returns True when
+    new content was written.
+    """
+    previous_path = previous_path or out_path
+    parent = os.path.dirname(out_path)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+
+    digest = _Digest()
+    body_paths: Dict[str, str] = {}
+    counts: Dict[str, int] = {}
+    try:
+        for key, value in payload.items():
+            if key in RECORD_KEYS and not isinstance(value, (dict, str)) and value is not None:
+                digest.records(key)
+                body_path = f"{out_path}.{key}.tmp"
+                with open(body_path, "w", encoding="utf-8") as body:
+                    counts[key] = _stream_records(value, body, digest)
+                body_paths[key] = body_path
+            else:
+                digest.field(key, value)
+        fields = list(payload.items())
+        if trailer is not None:
+            for key, value in trailer().items():
+                digest.field(key, value)
+                fields.append((key, value))
+
+        if previous_digest(previous_path) == digest.hexdigest():
+            if os.path.abspath(previous_path) != os.path.abspath(out_path):
+                shutil.copyfile(previous_path, out_path)
+            print(f"[writer] unchanged, kept previous snapshot -> {out_path}", flush=True)
+            return False
+
+        temp_path = f"{out_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as handle:
+            handle.write("{")
+            for position, (key, value) in enumerate(fields):
+                handle.write(",\n  " if position else "\n  ")
+                handle.write(json.dumps(key, ensure_ascii=False))
+                handle.write(": ")
+                if key in body_paths:
+                    if not counts[key]:
+                        handle.write("[]")
+                        continue
+                    handle.write("[\n")
+                    with open(body_paths[key], "r", encoding="utf-8") as body:
+                        _copy(body, handle)
+                    handle.write("\n  ]")
+                else:
+                    handle.write(_indented(value, "  "))
+            handle.write("\n}\n" if fields else "}\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, out_path)
+        return True
+    finally:
+        for body_path in body_paths.values():
+            if os.path.exists(body_path):
+                os.remove(body_path)
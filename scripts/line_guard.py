@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Line-length guard for scraped page text.
+
+Every scraper regex runs on one text line at a time, so the work a line can
+cost is bounded by its length. clip_lines() drops lines longer than
+MAX_LINE_CHARS before any pattern sees them: the longest real lines (group
+headings) are under 100 characters, and nothing the parsers extract comes
+from a paragraph of prose. regex_audit.py checks that at this length every
+scraper pattern stays within LINE_BUDGET_MS, even on adversarial input.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, List
+
+MAX_LINE_CHARS = 400
+
+# Worst-case time one pattern may take on a MAX_LINE_CHARS line (checked by regex_audit.py).
+LINE_BUDGET_MS = 5.0
+
+
+def clip_lines(lines: Iterable[str], source: str, limit: int = MAX_LINE_CHARS) -> List[str]:
+    """``lines`` without those longer than ``limit``, logging what was dropped."""
+    kept: List[str] = []
+    dropped = 0
+    longest = 0
+    for line in lines:
+        if len(line) > limit:
+            dropped += 1
+            longest = max(longest, len(line))
+            continue
+        kept.append(line)
+    if dropped:
+        print(f"[guard] {source}: dropped {dropped} line(s) over {limit} chars (longest {longest:,})", flush=True)
+    return kept
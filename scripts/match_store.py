@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+"""
+SQLite-backed match store (experimental side store).
+
+One database holds every dataset the site publishes, the league overrides and
+the senior match details, plus a log of scrape runs:
+
+  datasets       name, records key, key fields and the top-level header of each JSON file
+  matches        one row per record, keyed by (dataset, id); indexed by competition,
+                 date and club so exports, joins and history queries avoid full scans
+  match_history  previous versions of a record, one row per run that changed it
+  overrides      league_overrides.json entries, keyed by league match id
+  match_details  senior_match_details_2026.json entries, keyed by (date, home, away)
+  scrape_runs    one row per scraper run with insert/update/remove counters
+
+Nothing in the workflows uses it yet: the published JSON files stay the
+source of truth and the database is a local copy for history and ad hoc
+queries. Scrapers given --store PATH upsert their merged records here and
+write the JSON export generated from the store, so the two cannot drift
+apart. The export is the scraped data only; league overrides are applied by
+the site (js/app_v14.js reads league_overrides.json) and are joined in by
+query alone. Two records with the same key in one payload raise
+DuplicateKeyError rather than one silently replacing the other.
+
+Usage:
+  python scripts/match_store.py --db data/matches.sqlite3 import data/*.json
+  python scripts/match_store.py --db data/matches.sqlite3 export league data/league.json
+  python scripts/match_store.py --db data/matches.sqlite3 query --club Patrickswell --from 2026-04-01
+  python scripts/match_store.py --db data/matches.sqlite3 history league <id>
+  python scripts/match_store.py --db data/matches.sqlite3 runs
+"""
+
+from __future__ import annotations
+
+import argparse
+import collections
+import json
+import os
+import re
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import data_delta
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS datasets (
+    name        TEXT PRIMARY KEY,
+    records_key TEXT NOT NULL,
+    key_fields  TEXT NOT NULL,
+    header      TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS matches (
+    dataset     TEXT NOT NULL,
+    id          TEXT NOT NULL,
+    position    INTEGER NOT NULL,
+    competition TEXT,
+    grp         TEXT,
+    round       TEXT,
+    date        TEXT,
+    time        TEXT,
+    home        TEXT,
+    away        TEXT,
+    home_club   TEXT,
+    away_club   TEXT,
+    status      TEXT,
+    record      TEXT NOT NULL,
+    first_run   INTEGER,
+    changed_run INTEGER,
+    PRIMARY KEY (dataset, id)
+);
+CREATE INDEX IF NOT EXISTS matches_dataset_position ON matches (dataset, position);
+CREATE INDEX IF NOT EXISTS matches_competition_date ON matches (competition, date);
+CREATE INDEX IF NOT EXISTS matches_date ON matches (date);
+CREATE INDEX IF NOT EXISTS matches_home_club ON matches (home_club, date);
+CREATE INDEX IF NOT EXISTS matches_away_club ON matches (away_club, date);
+
+CREATE TABLE IF NOT EXISTS match_history (
+    dataset TEXT NOT NULL,
+    id      TEXT NOT NULL,
+    run_id  INTEGER NOT NULL,
+    record  TEXT NOT NULL,
+    PRIMARY KEY (dataset, id, run_id)
+);
+
+CREATE TABLE IF NOT EXISTS overrides (
+    id    TEXT PRIMARY KEY,
+    patch TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS match_details (
+    date      TEXT NOT NULL,
+    home_club TEXT NOT NULL,
+    away_club TEXT NOT NULL,
+    position  INTEGER NOT NULL,
+    record    TEXT NOT NULL,
+    PRIMARY KEY (date, home_club, away_club)
+);
+
+CREATE TABLE IF NOT EXISTS scrape_runs (
+    run_id      INTEGER PRIMARY KEY AUTOINCREMENT,
+    dataset     TEXT NOT NULL,
+    started_at  TEXT NOT NULL,
+    finished_at TEXT,
+    records     INTEGER,
+    inserted    INTEGER,
+    updated     INTEGER,
+    unchanged   INTEGER,
+    removed     INTEGER
+);
+CREATE INDEX IF NOT EXISTS scrape_runs_dataset ON scrape_runs (dataset, run_id);
+"""
+
+# How each published file maps into the store: records key and stable record id.
+KNOWN_FILES: Dict[str, Dict[str, Any]] = {
+    "hurling_2026.json": {"dataset": "hurling_2026", "records": "matches",
+                          "key": ("competition", "group", "date", "home", "away")},
+    "hurling_2025.json": {"dataset": "hurling_2025", "records": "matches",
+                          "key": ("competition", "group", "date", "home", "away")},
+    "league.json": {"dataset": "league", "records": "fixtures", "key": ("id",)},
+    "divisional_championship.json": {"dataset": "divisional_championship", "records": "fixtures", "key": ("id",)},
+}
+OVERRIDES_FILE = "league_overrides.json"
+DETAILS_FILE = "senior_match_details_2026.json"
+
+
+class DuplicateKeyError(ValueError):
+    """A payload holds more than one record under the same store key."""
+
+
+def club_slug(name: Optional[str]) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", (name or "").strip().lower()).strip("-")
+
+
+def now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
+
+
+def dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+@contextmanager
+def open_store(path: str) -> Iterator[sqlite3.Connection]:
+    parent = os.path.dirname(path)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def upsert_dataset(
+    conn: sqlite3.Connection,
+    dataset: str,
+    payload: Dict[str, Any],
+    records_key: str,
+    key_fields: Sequence[str],
+) -> Dict[str, int]:
+    """
+    Make the store's copy of ``dataset`` match ``payload``. Changed records keep
+    their previous version in match_history; records no longer present are
+    removed. Returns the run counters. Raises DuplicateKeyError, before
+    touching the store, when two records share a key.
+    """
+    records = payload.get(records_key, [])
+    ids = [data_delta.record_key(record, key_fields) for record in records]
+    duplicates = sorted(record_id for record_id, count in collections.Counter(ids).items() if count > 1)
+    if duplicates:
+        raise DuplicateKeyError(
+            f"{dataset}: {len(duplicates)} key(s) shared by more than one record "
+            f"(key fields {', '.join(key_fields)}): {'; '.join(duplicates[:5])}"
+        )
+
+    started = now_iso()
+    run_id = conn.execute(
+        "INSERT INTO scrape_runs (dataset, started_at) VALUES (?, ?)", (dataset, started)
+    ).lastrowid
+
+    conn.execute(
+        "INSERT INTO datasets (name, records_key, key_fields, header) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT(name) DO UPDATE SET records_key = excluded.records_key, "
+        "key_fields = excluded.key_fields, header = excluded.header",
+        (
+            dataset,
+            records_key,
+            dumps(list(key_fields)),
+            dumps({key: value for key, value in payload.items() if key != records_key}),
+        ),
+    )
+
+    existing = {
+        row["id"]: row["record"]
+        for row in conn.execute("SELECT id, record FROM matches WHERE dataset = ?", (dataset,))
+    }
+
+    counts = {"records": 0, "inserted": 0, "updated": 0, "unchanged": 0, "removed": 0}
+    seen = set(ids)
+    rows = []
+    history = []
+    for position, (record_id, record) in enumerate(zip(ids, records)):
+        text = dumps(record)
+        previous = existing.get(record_id)
+        if previous is None:
+            counts["inserted"] += 1
+        elif previous != text:
+            counts["updated"] += 1
+            history.append((dataset, record_id, run_id, previous))
+        else:
+            counts["unchanged"] += 1
+        rows.append((
+            dataset, record_id, position,
+            record.get("competition"), record.get("group"), record.get("round"),
+            record.get("date"), record.get("time") or record.get("time_local"),
+            record.get("home"), record.get("away"),
+            club_slug(record.get("home")), club_slug(record.get("away")),
+            record.get("status"), text, run_id, run_id,
+        ))
+
+    conn.executemany(
+        "INSERT OR IGNORE INTO match_history (dataset, id, run_id, record) VALUES (?, ?, ?, ?)", history
+    )
+    conn.executemany(
+        """
+        INSERT INTO matches (dataset, id, position, competition, grp, round, date, time,
+                             home, away, home_club, away_club, status, record, first_run, changed_run)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(dataset, id) DO UPDATE SET
+            position = excluded.position,
+            competition = excluded.competition, grp = excluded.grp, round = excluded.round,
+            date = excluded.date, time = excluded.time,
+            home = excluded.home, away = excluded.away,
+            home_club = excluded.home_club, away_club = excluded.away_club,
+            status = excluded.status,
+            changed_run = CASE WHEN matches.record = excluded.record
+                               THEN matches.changed_run ELSE excluded.changed_run END,
+            record = excluded.record
+        """,
+        rows,
+    )
+
+    gone = [record_id for record_id in existing if record_id not in seen]
+    conn.executemany(
+        "INSERT OR IGNORE INTO match_history (dataset, id, run_id, record) VALUES (?, ?, ?, ?)",
+        [(dataset, record_id, run_id, existing[record_id]) for record_id in gone],
+    )
+    conn.executemany("DELETE FROM matches WHERE dataset = ? AND id = ?", [(dataset, rid) for rid in gone])
+
+    counts["records"] = len(rows)
+    counts["removed"] = len(gone)
+    conn.execute(
+        "UPDATE scrape_runs SET finished_at = ?, records = ?, inserted = ?, updated = ?, "
+        "unchanged = ?, removed = ? WHERE run_id = ?",
+        (now_iso(), counts["records"], counts["inserted"], counts["updated"],
+         counts["unchanged"], counts["removed"], run_id),
+    )
+    return counts
+
+
+def export_dataset(conn: sqlite3.Connection, dataset: str) -> Dict[str, Any]:
+    """Rebuild the published JSON payload of ``dataset`` from the store."""
+    meta = conn.execute(
+        "SELECT records_key, header FROM datasets WHERE name = ?", (dataset,)
+    ).fetchone()
+    if meta is None:
+        raise KeyError(f"unknown dataset: {dataset}")
+
+    records = [
+        json.loads(row["record"])
+        for row in conn.execute(
+            "SELECT record FROM matches WHERE dataset = ? ORDER BY position", (dataset,)
+        )
+    ]
+    payload = json.loads(meta["header"])
+    payload[meta["records_key"]] = records
+    return payload
+
+
+def sync(
+    path: str,
+    dataset: str,
+    payload: Dict[str, Any],
+    records_key: str,
+    key_fields: Sequence[str],
+) -> Dict[str, Any]:
+    """Upsert a scraper's payload and return the export generated from the store."""
+    with open_store(path) as conn:
+        counts = upsert_dataset(conn, dataset, payload, records_key, key_fields)
+        exported = export_dataset(conn, dataset)
+    print(
+        f"[store] {dataset}: {counts['records']} records "
+        f"(+{counts['inserted']} ~{counts['updated']} -{counts['removed']}) -> {path}",
+        flush=True,
+    )
+    return exported
+
+
+def import_overrides(conn: sqlite3.Connection, payload: Dict[str, Any]) -> int:
+    overrides = payload.get("overrides") or {}
+    conn.execute("DELETE FROM overrides")
+    conn.executemany(
+        "INSERT INTO overrides (id, patch) VALUES (?, ?)",
+        [(match_id, dumps(patch)) for match_id, patch in overrides.items()],
+    )
+    conn.execute(
+        "INSERT OR REPLACE INTO datasets (name, records_key, key_fields, header) VALUES (?, ?, ?, ?)",
+        ("league_overrides", "overrides", dumps(["id"]),
+         dumps({key: value for key, value in payload.items() if key != "overrides"})),
+    )
+    return len(overrides)
+
+
+def import_match_details(conn: sqlite3.Connection, payload: Any) -> int:
+    records = payload if isinstance(payload, list) else payload.get("matches", [])
+    conn.execute("DELETE FROM match_details")
+    conn.executemany(
+        "INSERT OR REPLACE INTO match_details (date, home_club, away_club, position, record) "
+        "VALUES (?, ?, ?, ?, ?)",
+        [
+            (record.get("date") or "", club_slug(record.get("home")), club_slug(record.get("away")),
+             position, dumps(record))
+            for position, record in enumerate(records)
+        ],
+    )
+    return len(records)
+
+
+def query_matches(
+    conn: sqlite3.Connection,
+    dataset: Optional[str] = None,
+    competition: Optional[str] = None,
+    club: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    with_overrides: bool = True,
+) -> List[Dict[str, Any]]:
+    """Indexed lookup across datasets, with league overrides and match details joined in."""
+    clauses: List[str] = []
+    params: List[Any] = []
+    if dataset:
+        clauses.append("m.dataset = ?")
+        params.append(dataset)
+    if competition:
+        clauses.append("m.competition = ?")
+        params.append(competition)
+    if club:
+        clauses.append("(m.home_club = ? OR m.away_club = ?)")
+        params.extend([club_slug(club), club_slug(club)])
+    if date_from:
+        clauses.append("m.date >= ?")
+        params.append(date_from)
+    if date_to:
+        clauses.append("m.date <= ?")
+        params.append(date_to)
+
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    sql = f"""
+        SELECT m.dataset, m.id, m.record, o.patch, d.record AS details
+        FROM matches m
+        LEFT JOIN overrides o ON o.id = m.id
+        LEFT JOIN match_details d
+               ON d.date = m.date AND d.home_club = m.home_club AND d.away_club = m.away_club
+        {where}
+        ORDER BY m.date, m.time, m.dataset, m.position
+    """
+    out: List[Dict[str, Any]] = []
+    for row in conn.execute(sql, params):
+        record = json.loads(row["record"])
+        if with_overrides and row["patch"]:
+            record.update(json.loads(row["patch"]))
+        if row["details"]:
+            record["details"] = json.loads(row["details"])
+        record["_dataset"] = row["dataset"]
+        out.append(record)
+    return out
+
+
+def cmd_import(conn: sqlite3.Connection, paths: Sequence[str]) -> None:
+    for path in paths:
+        name = os.path.basename(path)
+        with open(path, "r", encoding="utf-8") as handle:
+            payload = json.load(handle)
+        if name == OVERRIDES_FILE:
+            print(f"[store] {name}: {import_overrides(conn, payload)} overrides")
+        elif name == DETAILS_FILE:
+            print(f"[store] {name}: {import_match_details(conn, payload)} match details")
+        elif name in KNOWN_FILES:
+            spec = KNOWN_FILES[name]
+            counts = upsert_dataset(conn, spec["dataset"], payload, spec["records"], spec["key"])
+            print(f"[store] {name}: {counts}")
+        else:
+            print(f"[store] {name}: not a known dataset, skipped")
+
+
+def write_export(payload: Any, out_path: str) -> None:
+    temp_path = f"{out_path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as handle:
+        json.dump(payload, handle, ensure_ascii=False, indent=2)
+        handle.write("\n")
+    os.replace(temp_path, out_path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db", default=os.path.join("data", "matches.sqlite3"), help="SQLite database path")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_import = sub.add_parser("import", help="Load published JSON files into the store")
+    p_import.add_argument("files", nargs="+")
+
+    p_export = sub.add_parser("export", help="Write a dataset's JSON from the store")
+    p_export.add_argument("dataset")
+    p_export.add_argument("out")
+
+    p_query = sub.add_parser("query", help="Indexed match lookup with overrides/details joined")
+    p_query.add_argument("--dataset")
+    p_query.add_argument("--competition")
+    p_query.add_argument("--club")
+    p_query.add_argument("--from", dest="date_from")
+    p_query.add_argument("--to", dest="date_to")
+
+    p_history = sub.add_parser("history", help="Previous versions of one record")
+    p_history.add_argument("dataset")
+    p_history.add_argument("id")
+
+    sub.add_parser("runs", help="Recent scrape runs")
+    args = parser.parse_args()
+
+    with open_store(args.db) as conn:
+        if args.command == "import":
+            cmd_import(conn, args.files)
+        elif args.command == "export":
+            write_export(export_dataset(conn, args.dataset), args.out)
+            print(f"[store] exported {args.dataset} -> {args.out}")
+        elif args.command == "query":
+            rows = query_matches(conn, args.dataset, args.competition, args.club, args.date_from, args.date_to)
+            print(json.dumps(rows, ensure_ascii=False, indent=2))
+        elif args.command == "history":
+            rows = conn.execute(
+                "SELECT h.run_id, r.started_at, h.record FROM match_history h "
+                "JOIN scrape_runs r ON r.run_id = h.run_id "
+                "WHERE h.dataset = ? AND h.id = ? ORDER BY h.run_id",
+                (args.dataset, args.id),
+            ).fetchall()
+            for row in rows:
+                print(f"run {row['run_id']} ({row['started_at']}): {row['record']}")
+        elif args.command == "runs":
+            for row in conn.execute("SELECT * FROM scrape_runs ORDER BY run_id DESC LIMIT 20"):
+                print(dict(row))
+
+
+if __name__ == "__main__":
+    main()
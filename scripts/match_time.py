@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Kick-off timestamps for match records.
+
+Records carry a local date plus an "HH:MM" time in Europe/Dublin. The app
+used to parse and sort those strings client-side; kickoff_fields() adds
+precomputed values instead:
+
+  kickoff_iso    offset-aware ISO timestamp, e.g. "2026-07-30T19:30:00+01:00"
+  kickoff_epoch  UTC epoch seconds of the throw-in
+  sort_key       kickoff_epoch, or the epoch of local midnight when the time
+                 is unknown (so time-less matches sort first on their day,
+                 as the app already orders them)
+
+Offsets come from a per-year table of Europe/Dublin transitions derived from
+zoneinfo once and cached, so converting a season of records costs a short
+table scan per record. Local times falling in the autumn overlap resolve to
+the first (summer) occurrence and those in the spring gap use the offset in
+force before the change, as zoneinfo does with fold=0.
+
+Usage:
+  python scripts/match_time.py 2026-03-29 15:00
+  python scripts/match_time.py --transitions 2026
+"""
+
+from __future__ import annotations
+
+import argparse
+import calendar
+import re
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+TZ_NAME = "Europe/Dublin"
+ZONE = ZoneInfo(TZ_NAME)
+
+TIME_RE = re.compile(r"^\s*(\d{1,2}):(\d{2})")
+DATE_RE = re.compile(r"^(\d{4})-(\d{2})-(\d{2})$")
+
+DAY = 86400
+
+# (utc_epoch_start, utc_offset_seconds) intervals covering one calendar year.
+Transitions = Tuple[Tuple[int, int], ...]
+
+
+def _offset_at(epoch: int) -> int:
+    offset = datetime.fromtimestamp(epoch, tz=timezone.utc).astimezone(ZONE).utcoffset()
+    return int(offset.total_seconds()) if offset is not None else 0
+
+
+@lru_cache(maxsize=None)
+def transitions(year: int) -> Transitions:
+    """Offset intervals for ``year``: daily probes, then bisection to the exact second of each change."""
+    start = calendar.timegm((year - 1, 12, 31, 0, 0, 0))
+    end = calendar.timegm((year + 1, 1, 2, 0, 0, 0))
+    table = [(start, _offset_at(start))]
+    probe = start
+    while probe < end:
+        following = probe + DAY
+        if _offset_at(following) != table[-1][1]:
+            low, high = probe, following
+            while high - low > 1:
+                middle = (low + high) // 2
+                if _offset_at(middle) == table[-1][1]:
+                    low = middle
+                else:
+                    high = middle
+            table.append((high, _offset_at(high)))
+        probe = following
+    return tuple(table)
+
+
+def utc_offset(year: int, local_seconds: int) -> int:
+    """Offset in force at a local wall-clock time, given as seconds since the epoch read as UTC."""
+    table = transitions(year)
+    previous = table[0][1]
+    for index, (start, offset) in enumerate(table):
+        utc = local_seconds - offset
+        if utc < start:
+            # Spring-forward gap: keep the offset from before the change.
+            return previous
+        if index + 1 == len(table) or utc < table[index + 1][0]:
+            return offset
+        previous = offset
+    return previous
+
+
+def parse_hhmm(value: Optional[str]) -> Optional[Tuple[int, int]]:
+    match = TIME_RE.match(value or "")
+    if not match:
+        return None
+    hour, minute = int(match.group(1)), int(match.group(2))
+    if hour > 23 or minute > 59:
+        return None
+    return hour, minute
+
+
+def kickoff_fields(date_iso: Optional[str], time_local: Optional[str]) -> Dict[str, Any]:
+    """kickoff_iso / kickoff_epoch / sort_key for a local date and "HH:MM" time (None when unknown)."""
+    fields: Dict[str, Any] = {"kickoff_iso": None, "kickoff_epoch": None, "sort_key": None}
+    match = DATE_RE.match(date_iso or "")
+    if not match:
+        return fields
+    year, month, day = (int(part) for part in match.groups())
+    try:
+        midnight = calendar.timegm((year, month, day, 0, 0, 0))
+    except ValueError:
+        return fields
+
+    hhmm = parse_hhmm(time_local)
+    if hhmm is None:
+        fields["sort_key"] = midnight - utc_offset(year, midnight)
+        return fields
+
+    local_seconds = midnight + hhmm[0] * 3600 + hhmm[1] * 60
+    offset = utc_offset(year, local_seconds)
+    epoch = local_seconds - offset
+    local = datetime(year, month, day, hhmm[0], hhmm[1], tzinfo=timezone(timedelta(seconds=offset)))
+    fields["kickoff_iso"] = local.isoformat()
+    fields["kickoff_epoch"] = epoch
+    fields["sort_key"] = epoch
+    return fields
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("date", nargs="?", help="YYYY-MM-DD")
+    parser.add_argument("time", nargs="?", help="HH:MM (local)")
+    parser.add_argument("--transitions", type=int, metavar="YEAR", help="Print the offset table for YEAR")
+    args = parser.parse_args()
+
+    if args.transitions:
+        for start, offset in transitions(args.transitions):
+            moment = datetime.fromtimestamp(start, tz=timezone.utc).isoformat()
+            print(f"{moment}  UTC{offset // 3600:+d}")
+        return
+    if not args.date:
+        parser.error("a date or --transitions is required")
+    print(kickoff_fields(args.date, args.time))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Page corpus for offline parser work (benchmarks, differential runs).
+
+scripts/corpus/manifest.json lists each page with the URL it stands in for,
+its season and mode (fixtures/results), its source and its format:
+
+  "rest"  a WordPress pages API response ([{"content": {"rendered": ...}}]),
+          what get_page_html() returns first
+  "html"  the public page, what the scrapers fall back to
+
+There are two sources, kept apart in the tree and the manifest:
+
+  captured     limerickgaa.ie pages as fetched by capture_pages.py, under
+               corpus/captured/<season>/{rest,html}/, each with its capture date
+  synthesized  pages build_page_corpus.py renders from the published data files
+               in the site's markup (split ordinals, inline and next-line
+               Venue:/Referee:, inline and split scores, W/O, BYE), under
+               corpus/<season>/; a supplement that covers the variations the
+               parsers handle, but not markup the generator does not know about
+
+Manifest entries without a source are synthesized.
+
+Usage:
+  python scripts/page_corpus.py                     # list pages with their sizes
+  python scripts/page_corpus.py --source captured   # only the captured pages
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus")
+MANIFEST_NAME = "manifest.json"
+CAPTURED = "captured"
+SYNTHESIZED = "synthesized"
+SOURCES = (CAPTURED, SYNTHESIZED)
+
+
+@dataclass(frozen=True)
+class Page:
+    name: str
+    season: int
+    mode: str
+    url: str
+    html: str
+    source: str = SYNTHESIZED
+
+    @property
+    def slug(self) -> str:
+        return self.url.rstrip("/").split("/")[-1]
+
+
+def rendered_html(raw: str, fmt: str) -> str:
+    """Page content as the scrapers see it after fetching."""
+    if fmt == "rest":
+        payload = json.loads(raw)
+        if isinstance(payload, list) and payload:
+            return payload[0].get("content", {}).get("rendered", "") or ""
+        return ""
+    return raw
+
+
+def load_pages(
+    corpus_dir: str = DEFAULT_DIR,
+    season: Optional[int] = None,
+    mode: Optional[str] = None,
+    source: Optional[str] = None,
+) -> List[Page]:
+    pages: List[Page] = []
+    for entry in read_manifest(corpus_dir):
+        if source is not None and entry.get("source", SYNTHESIZED) != source:
+            continue
+        if season is not None and entry["season"] != season:
+            continue
+        if mode is not None and entry["mode"] != mode:
+            continue
+        with open(os.path.join(corpus_dir, entry["file"]), "r", encoding="utf-8") as handle:
+            raw = handle.read()
+        pages.append(Page(
+            name=entry["file"].rsplit(".", 2)[0] if entry["format"] == "rest" else entry["file"].rsplit(".", 1)[0],
+            season=int(entry["season"]),
+            mode=entry["mode"],
+            url=entry["url"],
+            html=rendered_html(raw, entry["format"]),
+            source=entry.get("source", SYNTHESIZED),
+        ))
+    return pages
+
+
+def read_manifest(corpus_dir: str = DEFAULT_DIR) -> List[Dict[str, Any]]:
+    path = os.path.join(corpus_dir, MANIFEST_NAME)
+    if not os.path.isfile(path):
+        return []
+    with open(path, "r", encoding="utf-8") as handle:
+        return json.load(handle).get("pages", [])
+
+
+def replace_entries(
+    corpus_dir: str,
+    source: str,
+    entries: List[Dict[str, Any]],
+    season: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Swap ``source``'s manifest entries (only ``season``'s, if given) for ``entries``; other pages stay."""
+    kept = [
+        entry for entry in read_manifest(corpus_dir)
+        if entry.get("source", SYNTHESIZED) != source or (season is not None and entry["season"] != season)
+    ]
+    manifest = sorted(kept + [dict(entry, source=source) for entry in entries], key=lambda entry: entry["file"])
+    with open(os.path.join(corpus_dir, MANIFEST_NAME), "w", encoding="utf-8") as handle:
+        json.dump({"pages": manifest}, handle, indent=2)
+    return manifest
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus", default=DEFAULT_DIR)
+    parser.add_argument("--source", choices=SOURCES, help="Only list pages from this source")
+    args = parser.parse_args()
+
+    pages = load_pages(args.corpus, source=args.source)
+    for page in pages:
+        print(f"{page.name:45} {page.season} {page.mode:8} {page.source:11} {len(page.html):>8,} chars")
+    print(f"[corpus] {len(pages)} pages, {sum(len(p.html) for p in pages):,} chars")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+Page fetching shared by the scrapers: WordPress REST first, page HTML second.
+
+By default a page is fetched as before: the REST endpoint, and only if that
+fails or returns no content, the public HTML page. A slow REST backend can
+hold a run for minutes that way (75-90 s read timeouts, four retries).
+
+--hedge starts the HTML request alongside REST once REST has been out longer
+than a latency budget, and takes whichever usable body arrives first. The
+budget is the --hedge-percentile of REST latencies seen so far: this
+process's own (a daemon keeps them across runs), seeded from the REST and
+hedged fetch_duration_seconds samples of the previous run's metrics textfile
+(a hedged sample that HTML won understates REST, erring towards hedging). With
+fewer than MIN_SAMPLES latencies, --hedge-budget seconds is used. The
+losing request is abandoned: requests cannot interrupt a read in progress,
+so it runs on in a daemon thread and its response is dropped (a REST reply
+that lands late still counts towards the latencies), but its rate_limit
+in-flight slot is handed back at once, so the next page can hedge. The
+winner is recorded as a fetch.hedged stage and the fetch_hedge{page, winner}
+counter. --check-hedge runs two hedged pages against a local server whose
+REST endpoint is slow and fails unless the second one hedges as quickly as
+the first.
+
+--deadline SECONDS bounds a run's fetching: a fetch in flight when it passes
+is abandoned and DeadlineExceeded is raised, as is any fetch started after,
+so the run fails instead of writing a partial scrape.
+
+Every page goes through source_breaker.guarded(): a circuit breaker around
+the site that serves the last good copy of a page, marked stale, while the
+site is failing. Behind the breaker, single_flight.do() makes concurrent
+requests for a page, in this process or another, share one fetch. The
+requests themselves are paced per host by rate_limit.Adapter.
+"""
+
+from __future__ import annotations
+
+import argparse
+import collections
+import math
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+import run_profile
+import rate_limit
+import scrape_metrics
+import single_flight
+import source_breaker
+
+DEFAULT_PERCENTILE = 90.0
+DEFAULT_BUDGET_S = 8.0
+MIN_BUDGET_S = 1.0
+MIN_SAMPLES = 3
+HISTORY = 200
+
+REST_SAMPLE_RE = re.compile(
+    r'^' + scrape_metrics.PREFIX + r'_fetch_duration_seconds\{[^}]*method="(?:rest|hedged)"[^}]*\}\s+([0-9.eE+-]+)\s*$',
+    re.MULTILINE,
+)
+
+
+class DeadlineExceeded(RuntimeError):
+    """The run's --deadline passed before a fetch completed."""
+
+
+@dataclass
+class Body:
+    """What one fetch brought back; ``text`` is None when there was no usable content."""
+
+    text: Optional[str]
+    bytes: int = 0
+    retries: int = 0
+
+
+@dataclass
+class _Policy:
+    hedge: bool = False
+    percentile: float = DEFAULT_PERCENTILE
+    budget_s: float = DEFAULT_BUDGET_S
+    deadline: Optional[float] = None  # time.monotonic() value
+
+
+_policy = _Policy()
+_rest_latencies: Deque[float] = collections.deque(maxlen=HISTORY)
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--hedge", action="store_true",
+                        help="Start the HTML fetch alongside a slow REST fetch and use the first usable body")
+    parser.add_argument("--hedge-percentile", type=float, default=DEFAULT_PERCENTILE,
+                        help=f"REST latency percentile after which to hedge (default: {DEFAULT_PERCENTILE:g})")
+    parser.add_argument("--hedge-budget", type=float, default=DEFAULT_BUDGET_S,
+                        help=f"Seconds to wait for REST before hedging while there is no latency history "
+                             f"(default: {DEFAULT_BUDGET_S:g})")
+    parser.add_argument("--deadline", type=float, default=None,
+                        help="Seconds a run may spend fetching before it fails (default: no deadline)")
+    source_breaker.add_arguments(parser)
+    single_flight.add_arguments(parser)
+    rate_limit.add_arguments(parser)
+
+
+def _seed_latencies(script: str, metrics_dir: Optional[str]) -> None:
+    path = scrape_metrics.textfile_path(script, metrics_dir)
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            text = handle.read()
+    except OSError:
+        return
+    for value in REST_SAMPLE_RE.findall(text):
+        if float(value) > 0:
+            _rest_latencies.append(float(value))
+
+
+def configure(script: str, args: argparse.Namespace) -> None:
+    """Set this run's fetch policy from its arguments; call at the start of each run."""
+    global _policy
+    deadline_s = getattr(args, "deadline", None)
+    _policy = _Policy(
+        hedge=bool(getattr(args, "hedge", False)),
+        percentile=getattr(args, "hedge_percentile", DEFAULT_PERCENTILE),
+        budget_s=getattr(args, "hedge_budget", DEFAULT_BUDGET_S),
+        deadline=time.monotonic() + deadline_s if deadline_s else None,
+    )
+    if _policy.hedge and not _rest_latencies:
+        _seed_latencies(script, getattr(args, "metrics_dir", None))
+    source_breaker.configure(args)
+    single_flight.configure(args)
+    rate_limit.configure(args)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def hedge_budget() -> float:
+    """Seconds to give REST before hedging."""
+    if len(_rest_latencies) < MIN_SAMPLES:
+        return _policy.budget_s
+    return max(MIN_BUDGET_S, percentile(list(_rest_latencies), _policy.percentile))
+
+
+def remaining() -> Optional[float]:
+    """Seconds left before the deadline (None without one); raises once it has passed."""
+    if _policy.deadline is None:
+        return None
+    left = _policy.deadline - time.monotonic()
+    if left <= 0:
+        raise DeadlineExceeded("run deadline passed")
+    return left
+
+
+def rest_body(response: Any) -> Body:
+    """content.rendered of a WordPress pages?slug= reply."""
+    response.raise_for_status()
+    payload = response.json()
+    rendered = None
+    if isinstance(payload, list) and payload:
+        rendered = payload[0].get("content", {}).get("rendered")
+    text = rendered if isinstance(rendered, str) and rendered.strip() else None
+    return Body(text, len(response.content), run_profile.response_retries(response))
+
+
+def html_body(response: Any) -> Body:
+    response.raise_for_status()
+    return Body(response.text, len(response.content), run_profile.response_retries(response))
+
+
+def _start(fetch: Callable[[], Body], lease: Optional[rate_limit.Lease] = None) -> "Future[Body]":
+    """Run ``fetch`` on a daemon thread, so an abandoned request never holds the process open.
+
+    With a ``lease``, its requests' rate_limit slots are given back when the lease is abandoned.
+    """
+    future: "Future[Body]" = Future()
+
+    def target() -> None:
+        try:
+            if lease is None:
+                future.set_result(fetch())
+            else:
+                with rate_limit.leased(lease):
+                    future.set_result(fetch())
+        except BaseException as exc:  # handed to the caller through the future
+            future.set_exception(exc)
+
+    threading.Thread(target=target, name="fetch", daemon=True).start()
+    return future
+
+
+def _call(fetch: Callable[[], Body]) -> Body:
+    """``fetch()`` bounded by the deadline."""
+    left = remaining()
+    if left is None:
+        return fetch()
+    done, _ = wait([_start(fetch)], timeout=left)
+    if not done:
+        raise DeadlineExceeded("run deadline passed during a fetch")
+    return done.pop().result()
+
+
+def _rest_timer(started: float) -> Callable[["Future[Body]"], None]:
+    def record(future: "Future[Body]") -> None:
+        if not future.cancelled() and future.exception() is None:
+            _rest_latencies.append(time.perf_counter() - started)
+    return record
+
+
+def get_page(
+    tag: str,
+    page_url: str,
+    rest: Optional[Callable[[], Body]],
+    html: Callable[[], Body],
+) -> str:
+    """The page's content from REST, else its HTML; hedged when --hedge is on, stale when the site is down."""
+    kind = "html" if rest is None else "rest"
+
+    def fetch() -> str:
+        return single_flight.do(tag, page_url, kind, lambda: _fetch_page(tag, page_url, rest, html),
+                                timeout=remaining())
+
+    return source_breaker.guarded(tag, page_url, fetch, passthrough=(DeadlineExceeded,))
+
+
+def _fetch_page(
+    tag: str,
+    page_url: str,
+    rest: Optional[Callable[[], Body]],
+    html: Callable[[], Body],
+) -> str:
+    if _policy.hedge and rest is not None:
+        return _get_hedged(tag, page_url, rest, html)
+
+    if rest is not None:
+        try:
+            started = time.perf_counter()
+            with run_profile.stage("fetch.rest", page_url) as timing:
+                body = _call(rest)
+                timing.note(bytes=body.bytes, retries=body.retries)
+            _rest_latencies.append(time.perf_counter() - started)
+            if body.text:
+                return body.text
+            print(f"[{tag}] REST returned no usable content: {page_url}", flush=True)
+        except DeadlineExceeded:
+            raise
+        except Exception as exc:
+            print(f"[{tag}] REST failed for {page_url}: {exc}", flush=True)
+        print(f"[{tag}] falling back to page HTML: {page_url}", flush=True)
+
+    with run_profile.stage("fetch.html", page_url) as timing:
+        body = _call(html)
+        timing.note(bytes=body.bytes, retries=body.retries)
+    return body.text or ""
+
+
+def _get_hedged(tag: str, page_url: str, rest: Callable[[], Body], html: Callable[[], Body]) -> str:
+    budget = hedge_budget()
+    started = time.perf_counter()
+    leases: Dict["Future[Body]", rate_limit.Lease] = {}
+
+    def start(fetch: Callable[[], Body]) -> "Future[Body]":
+        lease = rate_limit.Lease()
+        future = _start(fetch, lease)
+        leases[future] = lease
+        return future
+
+    with run_profile.stage("fetch.hedged", page_url) as timing:
+        rest_future = start(rest)
+        rest_future.add_done_callback(_rest_timer(started))
+        pending: Dict["Future[Body]", str] = {rest_future: "rest"}
+        hedged = False
+        winner: Optional[str] = None
+        body = Body(None)
+        try:
+            while winner is None:
+                left = remaining()
+                timeout = left if hedged else (budget if left is None else min(budget, left))
+                done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+                if not done:
+                    remaining()  # raises when the deadline is what ran out
+                    print(f"[{tag}] REST slower than {budget:.1f}s; hedging with page HTML: {page_url}", flush=True)
+                    pending[start(html)] = "html"
+                    hedged = True
+                    continue
+                for future in done:
+                    path = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as exc:
+                        print(f"[{tag}] {path.upper()} failed for {page_url}: {exc}", flush=True)
+                        continue
+                    if result.text and winner is None:
+                        winner, body = path, result
+                    elif not result.text:
+                        print(f"[{tag}] {path.upper()} returned no usable content: {page_url}", flush=True)
+                if winner is None and not pending:
+                    if hedged:
+                        raise RuntimeError(f"REST and page HTML both failed for {page_url}")
+                    print(f"[{tag}] falling back to page HTML: {page_url}", flush=True)
+                    pending[start(html)] = "html"
+                    hedged = True
+        finally:
+            # The losers read on in their threads; their in-flight slots are free for the next page.
+            for future in pending:
+                leases[future].abandon()
+        timing.note(bytes=body.bytes, retries=body.retries)
+    if pending:
+        print(f"[{tag}] {winner} won after {time.perf_counter() - started:.2f}s; "
+              f"abandoned {', '.join(pending.values())}: {page_url}", flush=True)
+    run_profile.count("fetch_hedge", 1, page=page_url, winner=winner)
+    return body.text or ""
+
+
+def check_hedge(slow_s: float = 4.0, budget_s: float = 0.2) -> bool:
+    """Fetch two pages hedged against a local server whose REST replies take ``slow_s``.
+
+    Both must be won by the HTML request well before REST answers: with the first page's
+    abandoned REST request still holding its in-flight slot, the second page's hedge would
+    wait for it (DEFAULT_POLICY allows two requests to a host at once).
+    """
+    import os
+    import tempfile
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    import requests
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.startswith("/wp-json/"):
+                time.sleep(slow_s)
+                payload = b'[{"content": {"rendered": "<p>rest</p>"}}]'
+            else:
+                payload = b"<p>html</p>"
+            try:
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+            except OSError:
+                pass
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+    global _policy
+    os.environ[rate_limit.STATE_ENV_VAR] = tempfile.mkdtemp(prefix="ratelimit-check-")
+    rate_limit.configure(argparse.Namespace())
+    _policy = _Policy(hedge=True, budget_s=budget_s)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, name="check-hedge", daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    session = requests.Session()
+    session.mount("http://", rate_limit.Adapter())
+    ok = True
+    try:
+        for slug in ("senior-hurling-fixtures", "senior-hurling-results"):
+            started = time.perf_counter()
+            text = _get_hedged(
+                "check", f"{base}/{slug}/",
+                lambda: rest_body(session.get(f"{base}/wp-json/wp/v2/pages", params={"slug": slug}, timeout=30)),
+                lambda: html_body(session.get(f"{base}/{slug}/", timeout=30)),
+            )
+            elapsed = time.perf_counter() - started
+            good = text == "<p>html</p>" and elapsed < slow_s / 2
+            ok = ok and good
+            print(f"[fetch] {slug}: {'HTML' if text == '<p>html</p>' else 'REST'} won after {elapsed:.2f}s "
+                  f"(REST takes {slow_s:g}s): {'ok' if good else 'FAIL'}", flush=True)
+    finally:
+        server.shutdown()
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Show the hedge budget a scraper would start with")
+    parser.add_argument("script", nargs="?", choices=("championship", "league", "divisional", "limerickgaa"))
+    parser.add_argument("--metrics-dir", default=None, help="Metrics textfile directory (default: metrics)")
+    parser.add_argument("--hedge-percentile", type=float, default=DEFAULT_PERCENTILE)
+    parser.add_argument("--hedge-budget", type=float, default=DEFAULT_BUDGET_S)
+    parser.add_argument("--check-hedge", action="store_true",
+                        help="Check that consecutive hedged pages both hedge against a slow local REST; exit 1 if not")
+    args = parser.parse_args()
+    if args.check_hedge:
+        raise SystemExit(0 if check_hedge() else 1)
+    if args.script is None:
+        parser.error("the script to show the budget for is required")
+
+    args.hedge = True
+    configure(args.script, args)
+    print(f"[fetch] {len(_rest_latencies)} REST latencies from "
+          f"{scrape_metrics.textfile_path(args.script, args.metrics_dir)}; "
+          f"p{args.hedge_percentile:g} budget {hedge_budget():.2f}s", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Differential harness for parser changes.
+
+Runs two implementations of a scraper's parse path over every corpus page and
+diffs the records field by field, pairing them with the scraper's own match
+key (championship/league/divisional match_key, the 2025 scraper's _mk_key).
+An implementation is a module exposing the same functions as the scraper it
+replaces, e.g. a faster scrape_league_fixtures clone:
+
+  championship  normalize_lines, parse_page                 (2026 pages)
+  league        normalize_lines, parse_league, parse_league_results
+                                                            (2026 senior pages)
+  divisional    normalize_lines, parse_page                 (2026 pages)
+  limerickgaa   flatten_to_lines, parse_blocks_from_page    (2025 pages)
+
+Functions a candidate does not define come from the baseline. Without
+--candidate the current scrapers are compared with the golden outputs in
+scripts/corpus/golden/, recorded with --update-golden. Throughput is measured
+over normalise + parse per page, alternating the two implementations so load
+affects both alike. The run fails on any record difference; a speed-up is
+only worth merging when the diff is empty.
+
+Usage:
+  python scripts/parser_diff.py                               # scrapers vs golden outputs
+  python scripts/parser_diff.py --family league --candidate league_fast
+  python scripts/parser_diff.py --family championship --candidate champ_tok --synthetic
+  python scripts/parser_diff.py --update-golden
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import dataclasses
+import gc
+import importlib
+import io
+import json
+import os
+import statistics
+import time
+from collections import Counter
+from types import ModuleType, SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import page_corpus
+import synthetic_season
+from bench_parsers import LEGACY_COMPETITIONS
+
+GOLDEN_DIR = os.path.join(page_corpus.DEFAULT_DIR, "golden")
+
+# Alternating baseline/candidate passes per family, within these bounds.
+MIN_SAMPLES = 5
+SAMPLE_BUDGET_S = 2.0
+
+Record = Dict[str, Any]
+Key = Tuple[Any, ...]
+
+
+@dataclasses.dataclass(frozen=True)
+class Family:
+    name: str
+    module: str
+    season: int
+    slug_prefix: str
+    normalize: str
+    # (page, implementation, lines) -> records as dicts
+    parse: Callable[[page_corpus.Page, ModuleType, List[str]], List[Record]]
+    key: Callable[[Record], Key]
+
+
+def _as_dict(record: Any) -> Record:
+    return record.to_dict() if hasattr(record, "to_dict") else dict(record)
+
+
+def _attribute_key(module: str) -> Callable[[Record], Key]:
+    # match_key() reads attributes; a namespace over the record dict serves.
+    def key(record: Record) -> Key:
+        return tuple(importlib.import_module(module).match_key(SimpleNamespace(**record)))
+    return key
+
+
+def _parse_championship(page: page_corpus.Page, impl: ModuleType, lines: List[str]) -> List[Record]:
+    return [_as_dict(match) for match in impl.parse_page(lines, page.mode, page.name)]
+
+
+def _parse_league(page: page_corpus.Page, impl: ModuleType, lines: List[str]) -> List[Record]:
+    parse = impl.parse_league_results if page.mode == "results" else impl.parse_league
+    return [_as_dict(fixture) for fixture in parse(lines)]
+
+
+def _parse_divisional(page: page_corpus.Page, impl: ModuleType, lines: List[str]) -> List[Record]:
+    return [_as_dict(fixture) for fixture in impl.parse_page(lines, page.url, page.mode == "results")]
+
+
+def _parse_limerickgaa(page: page_corpus.Page, impl: ModuleType, lines: List[str]) -> List[Record]:
+    records: List[Record] = []
+    for comp_key in LEGACY_COMPETITIONS[page.slug.split("-")[0]]:
+        for record in impl.parse_blocks_from_page(page.url, comp_key, page.mode, lines=lines):
+            records.append({"comp_key": comp_key, **_as_dict(record)})
+    return records
+
+
+def _limerickgaa_key(record: Record) -> Key:
+    import scrape_limerickgaa
+
+    return (record.get("comp_key") or "",) + tuple(scrape_limerickgaa._mk_key(record))
+
+
+FAMILIES: Dict[str, Family] = {
+    family.name: family
+    for family in (
+        Family("championship", "scrape_championship_fixtures", 2026, "", "normalize_lines",
+               _parse_championship, _attribute_key("scrape_championship_fixtures")),
+        Family("league", "scrape_league_fixtures", 2026, "senior", "normalize_lines",
+               _parse_league, _attribute_key("scrape_league_fixtures")),
+        Family("divisional", "scrape_divisional_hurling_championship", 2026, "", "normalize_lines",
+               _parse_divisional, _attribute_key("scrape_divisional_hurling_championship")),
+        Family("limerickgaa", "scrape_limerickgaa", 2025, "", "flatten_to_lines",
+               _parse_limerickgaa, _limerickgaa_key),
+    )
+}
+
+
+class Implementation:
+    """A candidate module, falling back to the baseline scraper for anything it does not define."""
+
+    def __init__(self, name: str, baseline: Optional[ModuleType] = None) -> None:
+        self.name = name
+        self._module = importlib.import_module(name)
+        self._baseline = baseline
+
+    def __getattr__(self, attribute: str) -> Any:
+        if hasattr(self._module, attribute) or self._baseline is None:
+            return getattr(self._module, attribute)
+        return getattr(self._baseline, attribute)
+
+
+def run_family(family: Family, impl: Any, pages: Sequence[page_corpus.Page]) -> Tuple[Dict[str, List[Record]], int]:
+    """Records per page name, and the total normalised line count."""
+    outputs: Dict[str, List[Record]] = {}
+    total_lines = 0
+    normalize = getattr(impl, family.normalize)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for page in pages:
+            lines = normalize(page.html)
+            total_lines += len(lines)
+            outputs[page.name] = family.parse(page, impl, lines)
+    return outputs, total_lines
+
+
+def family_pages(family: Family, pages: Sequence[page_corpus.Page]) -> List[page_corpus.Page]:
+    return [page for page in pages if page.season == family.season and page.slug.startswith(family.slug_prefix)]
+
+
+def diff_records(
+    family: Family,
+    baseline: Dict[str, List[Record]],
+    candidate: Dict[str, List[Record]],
+    limit: int,
+) -> Counter:
+    """Pair records per page by match key (in order for repeated keys) and count the differences."""
+    counts: Counter = Counter()
+    shown = 0
+
+    def show(message: str) -> None:
+        nonlocal shown
+        if shown < limit:
+            print(f"[diff] {family.name} {message}", flush=True)
+        shown += 1
+
+    for page_name in sorted(set(baseline) | set(candidate)):
+        by_key: Dict[Key, List[Record]] = {}
+        for record in candidate.get(page_name, []):
+            by_key.setdefault(family.key(record), []).append(record)
+
+        for record in baseline.get(page_name, []):
+            key = family.key(record)
+            counts["baseline"] += 1
+            matches = by_key.get(key)
+            if not matches:
+                counts["missing"] += 1
+                show(f"{page_name}: missing {key}")
+                continue
+            other = matches.pop(0)
+            fields = [field for field in dict.fromkeys(list(record) + list(other)) if record.get(field) != other.get(field)]
+            if fields:
+                counts["changed"] += 1
+                show(f"{page_name}: {key} " + "; ".join(
+                    f"{field}: {record.get(field)!r} -> {other.get(field)!r}" for field in fields
+                ))
+            else:
+                counts["identical"] += 1
+
+        for key, leftovers in by_key.items():
+            for _ in leftovers:
+                counts["extra"] += 1
+                show(f"{page_name}: extra {key}")
+    if shown > limit:
+        print(f"[diff] {family.name}: {shown - limit} more difference(s) not shown", flush=True)
+    return counts
+
+
+def time_implementations(
+    family: Family,
+    impls: Sequence[Any],
+    pages: Sequence[page_corpus.Page],
+    samples: int,
+) -> List[float]:
+    """Median seconds per pass over ``pages`` for each implementation, passes alternating between them."""
+    def one_pass(impl: Any) -> float:
+        normalize = getattr(impl, family.normalize)
+        started = time.perf_counter()
+        for page in pages:
+            family.parse(page, impl, normalize(page.html))
+        return time.perf_counter() - started
+
+    timings: List[List[float]] = [[] for _ in impls]
+    with contextlib.redirect_stdout(io.StringIO()):
+        first = sum(one_pass(impl) for impl in impls)
+        count = max(MIN_SAMPLES, min(samples, int(SAMPLE_BUDGET_S / max(first, 1e-6))))
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for _ in range(count):
+                for index, impl in enumerate(impls):
+                    timings[index].append(one_pass(impl))
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+    return [statistics.median(values) for values in timings]
+
+
+def golden_path(golden_dir: str, family: Family) -> str:
+    return os.path.join(golden_dir, f"{family.name}.json")
+
+
+def load_golden(golden_dir: str, family: Family) -> Optional[Dict[str, List[Record]]]:
+    path = golden_path(golden_dir, family)
+    if not os.path.isfile(path):
+        return None
+    with open(path, "r", encoding="utf-8") as handle:
+        return json.load(handle)["pages"]
+
+
+def write_golden(golden_dir: str, family: Family, outputs: Dict[str, List[Record]]) -> str:
+    os.makedirs(golden_dir, exist_ok=True)
+    path = golden_path(golden_dir, family)
+    # One record per line keeps the files small and their git diffs readable.
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write("{\n" f' "module": {json.dumps(family.module)},\n "pages": {{')
+        for position, page_name in enumerate(sorted(outputs)):
+            handle.write(("," if position else "") + f"\n  {json.dumps(page_name, ensure_ascii=False)}: [")
+            records = outputs[page_name]
+            for index, record in enumerate(records):
+                handle.write(("," if index else "") + "\n   " + json.dumps(record, ensure_ascii=False, sort_keys=True))
+            handle.write("\n  ]" if records else "]")
+        handle.write("\n }\n}\n")
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus", default=page_corpus.DEFAULT_DIR)
+    parser.add_argument("--golden-dir", default=GOLDEN_DIR)
+    parser.add_argument("--family", action="append", choices=sorted(FAMILIES),
+                        help="Parser family to compare (repeatable; default: all)")
+    parser.add_argument("--baseline", help="Baseline module (default: the family's scraper)")
+    parser.add_argument("--candidate", help="Candidate module; without it the baseline is diffed against the golden outputs")
+    parser.add_argument("--synthetic", action="store_true",
+                        help="Add a generated 2026 season (synthetic_season.py) to the pages; needs --candidate")
+    parser.add_argument("--samples", type=int, default=15, help="Most timed passes per implementation (default: 15)")
+    parser.add_argument("--max-report", type=int, default=20, help="Differences printed per family (default: 20)")
+    parser.add_argument("--update-golden", action="store_true", help="Record the baseline's output as the golden corpus")
+    args = parser.parse_args()
+
+    if args.synthetic and not args.candidate:
+        parser.error("--synthetic has no golden outputs; use it with --candidate")
+    if args.candidate and args.update_golden:
+        parser.error("--update-golden records the baseline; drop --candidate")
+
+    pages = page_corpus.load_pages(args.corpus)
+    if args.synthetic:
+        # Same seasons and slugs as the corpus pages; keep their outputs apart.
+        pages = pages + [
+            dataclasses.replace(page, name=f"synthetic/{page.name}")
+            for page in synthetic_season.generate(synthetic_season.SeasonSpec())[0]
+        ]
+
+    failed = False
+    for name in args.family or sorted(FAMILIES):
+        family = FAMILIES[name]
+        selected = family_pages(family, pages)
+        baseline = Implementation(args.baseline or family.module)
+        baseline_out, lines = run_family(family, baseline, selected)
+        baseline_records = sum(len(records) for records in baseline_out.values())
+
+        if args.update_golden:
+            path = write_golden(args.golden_dir, family, baseline_out)
+            print(f"[diff] {family.name}: {baseline_records:,} records from {len(selected)} pages -> {path}", flush=True)
+            continue
+
+        if args.candidate:
+            candidate = Implementation(args.candidate, importlib.import_module(family.module))
+            candidate_out, _ = run_family(family, candidate, selected)
+            impls: List[Any] = [baseline, candidate]
+            label = f"{baseline.name} vs {candidate.name}"
+        else:
+            golden = load_golden(args.golden_dir, family)
+            if golden is None:
+                print(f"[diff] {family.name}: no golden outputs in {args.golden_dir}; run with --update-golden", flush=True)
+                failed = True
+                continue
+            # Golden records went through JSON; round-trip the fresh ones the same way.
+            baseline_out, candidate_out = golden, json.loads(json.dumps(baseline_out))
+            impls = [baseline]
+            label = f"golden vs {baseline.name}"
+
+        counts = diff_records(family, baseline_out, candidate_out, args.max_report)
+        seconds = time_implementations(family, impls, selected, args.samples)
+        throughput = ", ".join(
+            f"{impl.name} {lines / elapsed:,.0f} lines/s {baseline_records / elapsed:,.0f} records/s"
+            for impl, elapsed in zip(impls, seconds)
+        )
+        speedup = f" ({seconds[0] / seconds[1]:.2f}x)" if len(seconds) == 2 else ""
+        print(
+            f"[diff] {family.name} ({label}): {len(selected)} pages, {counts['baseline']:,} records: "
+            f"{counts['identical']:,} identical, {counts['changed']} changed, "
+            f"{counts['missing']} missing, {counts['extra']} extra | {throughput}{speedup}",
+            flush=True,
+        )
+        failed = failed or bool(counts["changed"] or counts["missing"] or counts["extra"])
+
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
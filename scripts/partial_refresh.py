@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Targeted partial refresh: re-scrape some pages or grades and patch the output.
+
+On a match evening only a results page or two changes, yet a full run
+refetches and reparses every page. With ``--only`` (a page, named by its
+slug without "hurling": senior-results, junior-fixtures, ...) and/or
+``--competition`` (a grade: "Junior C Hurling Championship", or a league
+division, "Division 4") a scraper fetches just the pages involved, keeps the
+parsed rows of the selected competitions, and merges them into its existing
+output (--out/--outdir if present, else --baseline) with its usual merge:
+
+- a refetched results page is merged over the existing records, as results
+  are merged over fixtures in a full run;
+- a refetched fixtures page replaces the existing fixtures of the grades it
+  lists; their existing results and walkovers are carried over and merged
+  back in as results, so a result the results page no longer shows is kept;
+- every other competition is written back untouched.
+
+The drop guard then compares each refreshed competition with what it had
+(the championship scraper's own guard, limited to those competitions; the
+league and divisional scrapers, which have no guard of their own, use
+check_drops() here), so a page that comes back empty cannot wipe a grade.
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import os
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Type, TypeVar
+
+import data_reader
+
+SETTLED_STATUSES = {"Result", "Walkover"}
+
+# Same thresholds as the championship guard.
+GUARD_MIN_MATCHES = 6
+GUARD_MIN_SHARE = 0.50
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class Selection:
+    pages: Set[str]
+    competitions: Set[str]
+    fixture_competitions: Set[str]
+
+    def wants(self, url: str) -> bool:
+        return page_selector(url) in self.pages
+
+
+def page_selector(url: str) -> str:
+    """The --only name of a page: its slug without "hurling" (senior-hurling-results -> senior-results)."""
+    slug = url.rstrip("/").rsplit("/", 1)[-1]
+    return slug.replace("-hurling-", "-")
+
+
+def add_arguments(parser: argparse.ArgumentParser, pages: Sequence[str], competitions: Sequence[str]) -> None:
+    parser.add_argument("--only", action="append", choices=list(pages), metavar="PAGE",
+                        help=f"Refresh just this page and patch the existing output (repeatable): {', '.join(pages)}")
+    parser.add_argument("--competition", action="append", choices=sorted(competitions), metavar="NAME",
+                        help="Refresh just this competition's pages and rows, patching the existing output (repeatable)")
+
+
+def select(args: argparse.Namespace, page_competitions: Dict[str, Set[str]]) -> Optional[Selection]:
+    """The pages and competitions to refresh, or None for a full run."""
+    only = set(getattr(args, "only", None) or ())
+    wanted = set(getattr(args, "competition", None) or ())
+    if not only and not wanted:
+        return None
+
+    pages: Set[str] = set()
+    competitions: Set[str] = set()
+    fixture_competitions: Set[str] = set()
+    for page, listed in page_competitions.items():
+        covered = listed & wanted if wanted else set(listed)
+        if (only and page not in only) or not covered:
+            continue
+        pages.add(page)
+        competitions |= covered
+        if page.endswith("-fixtures"):
+            fixture_competitions |= covered
+    if not pages:
+        raise SystemExit("--only/--competition select no page: " + ", ".join(sorted(only | wanted)))
+    return Selection(pages, competitions, fixture_competitions)
+
+
+def from_dict(cls: Type[T], record: Dict[str, Any]) -> T:
+    """Rebuild a scraper record from its JSON, ignoring derived fields (kickoff_iso, ...)."""
+    names = {field.name for field in dataclasses.fields(cls)}  # type: ignore[arg-type]
+    return cls(**{key: value for key, value in record.items() if key in names})
+
+
+def existing_path(out_path: str, baseline: Optional[str]) -> str:
+    for path in (out_path, baseline):
+        if path and os.path.isfile(path):
+            return path
+    raise SystemExit(f"a partial refresh patches an existing file; neither {out_path} nor {baseline} exists")
+
+
+def load_existing(out_path: str, baseline: Optional[str], cls: Type[T]) -> List[T]:
+    return [from_dict(cls, record) for record in data_reader.iter_records(existing_path(out_path, baseline))]
+
+
+def split_existing(
+    existing: Iterable[T],
+    selection: Selection,
+    key: Callable[[T], str],
+) -> Tuple[List[T], List[T]]:
+    """(records kept as they are, settled records of refetched fixture grades to merge back as results)."""
+    kept: List[T] = []
+    carried: List[T] = []
+    for record in existing:
+        if key(record) not in selection.fixture_competitions:
+            kept.append(record)
+        elif getattr(record, "status", None) in SETTLED_STATUSES:
+            carried.append(record)
+    return kept, carried
+
+
+def counts(records: Iterable[T], key: Callable[[T], str]) -> Dict[str, int]:
+    out: Dict[str, int] = {}
+    for record in records:
+        out[key(record)] = out.get(key(record), 0) + 1
+    return out
+
+
+def check_drops(
+    existing: Sequence[T],
+    merged: Sequence[T],
+    competitions: Set[str],
+    key: Callable[[T], str],
+) -> None:
+    """Raise RuntimeError when a refreshed competition lost half or more of its matches."""
+    old_counts = counts(existing, key)
+    new_counts = counts(merged, key)
+    for competition in sorted(competitions):
+        old_count = old_counts.get(competition, 0)
+        new_count = new_counts.get(competition, 0)
+        if old_count >= GUARD_MIN_MATCHES and new_count < int(old_count * GUARD_MIN_SHARE):
+            raise RuntimeError(
+                f"Safety check failed for {competition}: fell from {old_count} to {new_count} matches"
+            )
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Match-day-aware polling plan for the scrapers.
+
+Fixed cron times poll midweek for nothing and leave weekend results hours
+late. The plan here is worked out from the fixture times already in the data
+files (hurling_2026.json, league.json, divisional_championship.json): for
+each match, full time is its throw-in plus MATCH_S (play, half-time and
+stoppages), and polls are placed after it:
+
+  no result yet   every FAST_S for WINDOW_S after full time, then gaps
+                  doubling from FAST_S (capped at MAX_GAP_S)
+  result landed   gaps doubling from FAST_S after full time, so a settled
+                  match is only rechecked for corrections, ever more rarely
+  beyond HORIZON_S after full time, a match no longer asks for polls
+
+Matches with a date but no throw-in time are placed at UNTIMED_AT local time
+with the fast window stretched over the rest of the day. On top of the match
+polls there is one idle poll a day at IDLE_AT_S past midnight UTC (07:15,
+the old cron time), so new fixtures and changed dates are still picked up
+when nothing is being played.
+
+Every poll instant is a function of the data file. A frequent cron asks
+whether a poll has fallen since the last run that actually happened (--due
+--last-run FILE, exit status 0 when due): FILE holds that run's start as an
+epoch, so a poll whose cron tick was skipped or delayed, the 07:15 idle poll
+included, is caught up on the next tick instead of being lost. Without the
+file (first run, evicted cache) only the last --tick seconds are checked. A
+daemon sleeps until the next poll instead (scrape_daemon.py --schedule).
+
+Usage:
+  python scripts/poll_schedule.py data/league.json
+  python scripts/poll_schedule.py data/divisional_championship.json --due --last-run .cache/schedule/last-run
+  python scripts/poll_schedule.py data/hurling_2026.json --plan 48 --at 2026-07-25T12:00:00+00:00
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import data_reader
+import match_time
+
+SETTLED_STATUSES = {"Result", "Walkover", "Bye"}
+
+MATCH_S = 90 * 60
+FAST_S = 15 * 60
+WINDOW_S = 4 * 3600
+MAX_GAP_S = 6 * 3600
+HORIZON_S = 3 * 86400
+UNTIMED_AT = "12:00"
+UNTIMED_WINDOW_S = 8 * 3600
+IDLE_PERIOD_S = 86400
+IDLE_AT_S = 7 * 3600 + 15 * 60
+
+IDLE = "idle"
+
+
+@dataclass(frozen=True)
+class MatchWindow:
+    """One match as the scheduler sees it: when it ends and whether its result is in."""
+
+    label: str
+    full_time: int
+    settled: bool
+    timed: bool = True
+
+
+def _label(record: Dict[str, Any]) -> str:
+    return f"{record.get('date') or '?'} {record.get('home') or '?'} v {record.get('away') or '?'}"
+
+
+def match_window(record: Dict[str, Any]) -> Optional[MatchWindow]:
+    """The record's window, or None when it has no usable date."""
+    kickoff = record.get("kickoff_epoch")
+    timed = True
+    if kickoff is None:
+        fields = match_time.kickoff_fields(record.get("date"), record.get("time_local") or record.get("time"))
+        kickoff = fields["kickoff_epoch"]
+    if kickoff is None:
+        kickoff = match_time.kickoff_fields(record.get("date"), UNTIMED_AT)["kickoff_epoch"]
+        timed = False
+    if kickoff is None:
+        return None
+    settled = record.get("status") in SETTLED_STATUSES
+    return MatchWindow(_label(record), int(kickoff) + MATCH_S, settled, timed)
+
+
+def load_windows(paths: Sequence[str]) -> List[MatchWindow]:
+    """Windows for every dated record in ``paths``; missing files are skipped."""
+    windows: List[MatchWindow] = []
+    for path in paths:
+        if not os.path.exists(path):
+            print(f"[schedule] {path} not found; idle polls only", file=sys.stderr, flush=True)
+            continue
+        for record in data_reader.iter_records(path):
+            window = match_window(record)
+            if window is not None:
+                windows.append(window)
+    return windows
+
+
+def poll_times(window: MatchWindow) -> Iterator[int]:
+    """Poll instants for one match, in order, up to its horizon."""
+    end = window.full_time + HORIZON_S
+    moment = window.full_time
+    if not window.settled:
+        fast_end = window.full_time + WINDOW_S + (0 if window.timed else UNTIMED_WINDOW_S)
+        while moment < fast_end:
+            yield moment
+            moment += FAST_S
+    gap = FAST_S
+    while moment <= end:
+        yield moment
+        moment += gap
+        gap = min(gap * 2, MAX_GAP_S)
+
+
+def idle_after(after: int) -> int:
+    """The first daily idle poll strictly after ``after``."""
+    day_start = after - (after - IDLE_AT_S) % IDLE_PERIOD_S
+    return day_start + IDLE_PERIOD_S
+
+
+def next_poll(windows: Iterable[MatchWindow], after: int) -> Tuple[int, str]:
+    """The first poll strictly after ``after``, with the match asking for it (or "idle")."""
+    best, reason = idle_after(after), IDLE
+    for window in windows:
+        if window.full_time + HORIZON_S <= after or window.full_time >= best:
+            continue
+        for moment in poll_times(window):
+            if moment > after:
+                if moment < best:
+                    best, reason = moment, window.label
+                break
+    return best, reason
+
+
+def plan(windows: Sequence[MatchWindow], start: int, end: int) -> List[Tuple[int, str]]:
+    """Every poll in (start, end], each with the match that asked for it."""
+    polls: List[Tuple[int, str]] = []
+    moment = start
+    while True:
+        moment, reason = next_poll(windows, moment)
+        if moment > end:
+            return polls
+        polls.append((moment, reason))
+
+
+def due(windows: Sequence[MatchWindow], since: int, now: int) -> Optional[Tuple[int, str]]:
+    """The first poll in (since, now], if any."""
+    moment, reason = next_poll(windows, since)
+    return (moment, reason) if moment <= now else None
+
+
+def read_last_run(path: str) -> Optional[int]:
+    """The epoch stored in ``path`` by the last run, or None if it is missing or unreadable."""
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            return int(handle.read().strip())
+    except (OSError, ValueError):
+        return None
+
+
+def awaiting_results(windows: Iterable[MatchWindow], now: int) -> List[MatchWindow]:
+    """Matches thrown in by ``now``, still within their horizon, whose result is not in."""
+    return [
+        window for window in windows
+        if not window.settled and window.full_time - MATCH_S <= now < window.full_time + HORIZON_S
+    ]
+
+
+def iso_minutes(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).isoformat(timespec="minutes")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("paths", nargs="+", help="Data files whose fixtures drive the plan")
+    parser.add_argument("--at", default=None, help="Evaluate at this ISO time instead of now")
+    parser.add_argument("--due", action="store_true",
+                        help="Exit 0 if a poll has fallen since the last run (--last-run), else 1")
+    parser.add_argument("--last-run", default=None, metavar="FILE",
+                        help="File holding the epoch the last run started at, for --due")
+    parser.add_argument("--tick", type=int, default=FAST_S,
+                        help=f"Cron period in seconds; --due looks back this far without --last-run (default: {FAST_S})")
+    parser.add_argument("--plan", type=float, default=None, metavar="HOURS", help="List every poll in the next HOURS")
+    args = parser.parse_args()
+
+    now = int(datetime.fromisoformat(args.at).timestamp()) if args.at else int(time.time())
+    windows = load_windows(args.paths)
+    open_count = sum(1 for window in windows if not window.settled and window.full_time + HORIZON_S > now)
+    print(f"[schedule] {len(windows)} matches, {open_count} awaiting results", flush=True)
+
+    if args.due:
+        last_run = read_last_run(args.last_run) if args.last_run else None
+        if last_run is None:
+            since = now - args.tick
+        else:
+            since = min(last_run, now)
+            print(f"[schedule] last run {iso_minutes(since)}", flush=True)
+        hit = due(windows, since, now)
+        if hit is None:
+            moment, reason = next_poll(windows, now)
+            print(f"[schedule] not due; next poll {iso_minutes(moment)} ({reason})", flush=True)
+            raise SystemExit(1)
+        print(f"[schedule] due: {iso_minutes(hit[0])} ({hit[1]})", flush=True)
+        return
+
+    if args.plan is not None:
+        for moment, reason in plan(windows, now, now + int(args.plan * 3600)):
+            print(f"  {iso_minutes(moment)}  {reason}")
+        return
+
+    moment, reason = next_poll(windows, now)
+    print(f"[schedule] next poll {iso_minutes(moment)} in {(moment - now) / 60:.0f} min ({reason})", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Publish step for static hosting: minified JSON plus precompressed variants.
+
+For every data/<name>.json this writes, next to it:
+  <name>.min.json        compact separators, no whitespace
+  <name>.min.json.gz     gzip level 9 (mtime fixed at 0, so output is byte-stable)
+  <name>.min.json.br     brotli quality 11 (skipped when the brotli module is missing)
+  hashed/<name>.<hash>.json
+                         the minified bytes under a content-hashed, immutable name
+
+and prints the size of each variant against the original file.
+
+The same directory also gets:
+  data-manifest.json     {"files": {"data/league.json": "data/hashed/league.<hash>.json", ...}}
+  precache-manifest.json {"revision": "...", "urls": ["/data/hashed/...", ...]} for sw.js
+
+The app resolves data URLs through data-manifest.json (small, always
+revalidated); the hashed files never change, so they are cached indefinitely.
+Hashed files referenced by neither the current nor the previous manifest are
+removed.
+
+Usage:
+  python scripts/publish_data.py                     # every data/*.json
+  python scripts/publish_data.py --indir tmp_league  # another directory
+  python scripts/publish_data.py data/league.json    # selected files
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import gzip
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import brotli  # type: ignore[import-not-found]
+except ImportError:  # optional: pip install brotli
+    brotli = None
+
+MIN_SUFFIX = ".min.json"
+HASHED_DIR = "hashed"
+MANIFEST_NAME = "data-manifest.json"
+PRECACHE_NAME = "precache-manifest.json"
+HASH_LENGTH = 12
+
+
+def minify(payload: object) -> bytes:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def gzip_bytes(data: bytes) -> bytes:
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def brotli_bytes(data: bytes) -> Optional[bytes]:
+    if brotli is None:
+        return None
+    return brotli.compress(data, mode=brotli.MODE_TEXT, quality=11, lgwin=24)
+
+
+def write_bytes(path: str, data: bytes) -> None:
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as handle:
+        handle.write(data)
+    os.replace(temp_path, path)
+
+
+def source_files(indir: str) -> List[str]:
+    paths = sorted(glob.glob(os.path.join(indir, "*.json")))
+    return [
+        path for path in paths
+        if not path.endswith(MIN_SUFFIX)
+        and os.path.basename(path) not in (MANIFEST_NAME, PRECACHE_NAME)
+    ]
+
+
+def site_path(path: str, root: str) -> str:
+    """Path as the app requests it, relative to the site root with forward slashes."""
+    return os.path.relpath(path, root).replace(os.sep, "/")
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def write_hashed(path: str, minified: bytes) -> str:
+    directory, name = os.path.split(path)
+    hashed_dir = os.path.join(directory, HASHED_DIR)
+    os.makedirs(hashed_dir, exist_ok=True)
+    hashed_path = os.path.join(hashed_dir, f"{name[: -len('.json')]}.{content_hash(minified)}.json")
+    if not os.path.isfile(hashed_path):
+        write_bytes(hashed_path, minified)
+    return hashed_path
+
+
+def read_manifest(path: str) -> Dict[str, Any]:
+    if not os.path.isfile(path):
+        return {"files": {}}
+    with open(path, "r", encoding="utf-8") as handle:
+        manifest = json.load(handle)
+    manifest.setdefault("files", {})
+    return manifest
+
+
+def write_if_changed(path: str, payload: Any) -> bool:
+    data = (json.dumps(payload, ensure_ascii=False, indent=2, sort_keys=True) + "\n").encode("utf-8")
+    if os.path.isfile(path):
+        with open(path, "rb") as handle:
+            if handle.read() == data:
+                return False
+    write_bytes(path, data)
+    return True
+
+
+def update_manifests(data_dir: str, root: str, hashed: Dict[str, str]) -> Tuple[Dict[str, Any], bool]:
+    """Merge newly hashed files into data-manifest.json and regenerate the precache list."""
+    manifest_path = os.path.join(data_dir, MANIFEST_NAME)
+    manifest = read_manifest(manifest_path)
+    previous_files = dict(manifest["files"])
+
+    files = dict(previous_files)
+    files.update(hashed)
+    # Drop datasets whose source file has gone.
+    files = {
+        logical: target for logical, target in files.items()
+        if os.path.isfile(os.path.join(root, logical))
+    }
+    manifest = {"files": files}
+    changed = write_if_changed(manifest_path, manifest)
+
+    revision = content_hash(json.dumps(files, sort_keys=True).encode("utf-8"))
+    write_if_changed(os.path.join(data_dir, PRECACHE_NAME), {
+        "revision": revision,
+        "urls": sorted(f"/{target}" for target in files.values()),
+    })
+
+    keep = set(files.values()) | set(previous_files.values())
+    hashed_dir = os.path.join(data_dir, HASHED_DIR)
+    if os.path.isdir(hashed_dir):
+        for name in os.listdir(hashed_dir):
+            candidate = os.path.join(hashed_dir, name)
+            if site_path(candidate, root) not in keep:
+                os.remove(candidate)
+
+    return manifest, changed
+
+
+def publish_file(path: str, hashed: Optional[Dict[str, str]] = None, root: str = ".") -> Dict[str, Optional[int]]:
+    with open(path, "rb") as handle:
+        original = handle.read()
+
+    minified = minify(json.loads(original.decode("utf-8")))
+    stem = path[: -len(".json")]
+    min_path = f"{stem}{MIN_SUFFIX}"
+
+    write_bytes(min_path, minified)
+    gz = gzip_bytes(minified)
+    write_bytes(f"{min_path}.gz", gz)
+
+    br = brotli_bytes(minified)
+    if br is not None:
+        write_bytes(f"{min_path}.br", br)
+
+    if hashed is not None:
+        hashed[site_path(path, root)] = site_path(write_hashed(path, minified), root)
+
+    return {
+        "original": len(original),
+        "min": len(minified),
+        "gz": len(gz),
+        "br": len(br) if br is not None else None,
+    }
+
+
+def format_size(value: Optional[int], original: int) -> str:
+    if value is None:
+        return "-"
+    return f"{value:,} ({value / original:.0%})" if original else f"{value:,}"
+
+
+def report(rows: Sequence[tuple]) -> None:
+    header = ("file", "original", "min", "gz", "br")
+    table = [header] + [
+        (
+            name,
+            f"{sizes['original']:,}",
+            format_size(sizes["min"], sizes["original"]),
+            format_size(sizes["gz"], sizes["original"]),
+            format_size(sizes["br"], sizes["original"]),
+        )
+        for name, sizes in rows
+    ]
+    widths = [max(len(row[col]) for row in table) for col in range(len(header))]
+    for row in table:
+        print("  ".join(cell.ljust(widths[col]) if col == 0 else cell.rjust(widths[col])
+                        for col, cell in enumerate(row)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("files", nargs="*", help="JSON files to publish (default: every *.json in --indir)")
+    parser.add_argument("--indir", default="data", help="Directory scanned when no files are given")
+    parser.add_argument("--root", default=".", help="Site root that manifest paths are relative to (default: .)")
+    parser.add_argument("--no-hash", action="store_true", help="Skip hashed copies and the manifests")
+    args = parser.parse_args()
+
+    paths = args.files or source_files(args.indir)
+    if not paths:
+        raise SystemExit(f"No JSON files found in {args.indir}")
+
+    hashed: Optional[Dict[str, str]] = None if args.no_hash else {}
+    rows = []
+    for path in paths:
+        rows.append((os.path.basename(path), publish_file(path, hashed, args.root)))
+
+    if brotli is None:
+        print("[publish] brotli module not installed; .br variants skipped", flush=True)
+
+    report(rows)
+    total_original = sum(sizes["original"] for _, sizes in rows)
+    total_best = sum(sizes["br"] or sizes["gz"] or 0 for _, sizes in rows)
+    print(f"[publish] {len(rows)} files: {total_original:,} -> {total_best:,} bytes compressed", flush=True)
+
+    if hashed:
+        data_dir = os.path.dirname(paths[0]) or "."
+        manifest, changed = update_manifests(data_dir, args.root, hashed)
+        for logical in sorted(hashed):
+            print(f"[publish] {logical} -> {manifest['files'][logical]}", flush=True)
+        if not changed:
+            print(f"[publish] {MANIFEST_NAME} unchanged", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Per-host rate limiting and fetch ordering for every request the scrapers make.
+
+Hedged fetches, several scrapers on one machine and match-day polling all
+add load on limerickgaa.ie, and a 429 retried by urllib3 only slows the one
+request that got it. The scrapers' sessions mount Adapter, which sends every
+request (REST, HTML, hedged or not) through its host's limiter:
+
+- a token bucket of --rate-limit RATE requests a second with bursts of
+  BURST, kept in .cache/ratelimit/<host>.json under a lock file, so all the
+  scrapers on the machine share it (in-process only without fcntl);
+- at most IN_FLIGHT requests to the host at once from this process;
+- a 429 is handled here rather than by urllib3: its Retry-After (seconds or
+  an HTTP date; DEFAULT_RETRY_AFTER_S when absent, at most
+  MAX_RETRY_AFTER_S) pauses the whole host, then the request is retried,
+  up to MAX_429_RETRIES times. Adapter turns off urllib3's own Retry-After
+  handling (respect_retry_after_header), which would otherwise retry a 429
+  inside the in-flight slot whatever the status_forcelist; other retries
+  stay with urllib3.
+
+A hedged fetch (page_fetch.py) runs each of its requests under a Lease. When
+the hedge abandons the loser, its in-flight slot is handed back at once
+(Lease.abandon()) rather than when its read finally ends, so the next page's
+hedge is not left waiting on a response nobody will use; an abandoned
+request still queued is dropped (Abandoned) and a 429 on it is not retried.
+
+Requests waiting for the host go in priority order. schedule() orders a
+scraper's pages and sets their priorities: while a match is awaiting its
+result (poll_schedule.awaiting_results()), results pages come before
+fixtures pages; otherwise the listed order is kept. The order within each
+kind never changes, so neither does the output.
+
+  --rate-limit limerickgaa.ie=1,3,1   1 request/s, bursts of 3, one at a time
+  python scripts/rate_limit.py        the shared bucket state per host
+  python scripts/rate_limit.py --check-429
+                                      a local always-429 server must see
+                                      exactly MAX_429_RETRIES + 1 requests
+  (page_fetch.py --check-hedge checks the hedge's slots against a slow server)
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar
+from urllib.parse import parse_qs, urlsplit
+
+from requests.adapters import HTTPAdapter
+
+try:
+    import fcntl
+except ImportError:  # not on Windows: each process keeps its own bucket
+    fcntl = None  # type: ignore[assignment]
+
+import poll_schedule
+import run_profile
+
+STATE_ENV_VAR = "LGH_RATE_LIMIT_DIR"
+DEFAULT_STATE_DIR = os.path.join(".cache", "ratelimit")
+DEFAULT_RETRY_AFTER_S = 30.0
+MAX_RETRY_AFTER_S = 300.0
+MAX_429_RETRIES = 3
+
+URGENT = 0
+NORMAL = 1
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class HostPolicy:
+    rate: float  # requests per second
+    burst: int
+    in_flight: int
+
+
+DEFAULT_POLICY = HostPolicy(rate=2.0, burst=6, in_flight=2)
+
+
+class _Host:
+    """One host's limiter: shared token bucket, in-flight cap and priority queue."""
+
+    def __init__(self, host: str, policy: HostPolicy, state_path: Optional[str]) -> None:
+        self.host = host
+        self.policy = policy
+        self.state_path = state_path
+        self.cond = threading.Condition()
+        self.queue: List[Tuple[int, int]] = []
+        self.in_flight = 0
+        self.state: Dict[str, float] = {"tokens": float(policy.burst), "updated": time.time(), "blocked_until": 0.0}
+
+    def _update(self, change: Callable[[Dict[str, float]], float]) -> float:
+        """Apply ``change`` to the bucket state, through the state file when it can be locked."""
+        if fcntl is None or self.state_path is None:
+            return change(self.state)
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        with open(self.state_path, "a+", encoding="utf-8") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                handle.seek(0)
+                try:
+                    state = json.loads(handle.read() or "null")
+                except ValueError:
+                    state = None
+                if not isinstance(state, dict):
+                    state = dict(self.state)
+                result = change(state)
+                handle.seek(0)
+                handle.truncate()
+                json.dump(state, handle)
+                handle.flush()
+                return result
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _take(self, state: Dict[str, float]) -> float:
+        """Take a token: 0 when taken, else the seconds until one is due."""
+        now = time.time()
+        elapsed = max(0.0, now - state["updated"])
+        state["tokens"] = min(float(self.policy.burst), state["tokens"] + elapsed * self.policy.rate)
+        state["updated"] = now
+        if now < state["blocked_until"]:
+            return state["blocked_until"] - now
+        if state["tokens"] >= 1:
+            state["tokens"] -= 1
+            return 0.0
+        return (1 - state["tokens"]) / self.policy.rate
+
+    def acquire(self, priority: int) -> float:
+        """Wait for this request's turn, a free slot and a token; returns the seconds waited."""
+        started = time.monotonic()
+        ticket = (priority, next(_tickets))
+        with self.cond:
+            heapq.heappush(self.queue, ticket)
+            try:
+                while True:
+                    wait: Optional[float] = None
+                    if self.queue[0] == ticket and self.in_flight < self.policy.in_flight:
+                        wait = self._update(self._take)
+                        if wait <= 0:
+                            break
+                    self.cond.wait(wait)
+            finally:
+                self.queue.remove(ticket)
+                heapq.heapify(self.queue)
+                self.cond.notify_all()
+            self.in_flight += 1
+        return time.monotonic() - started
+
+    def release(self) -> None:
+        with self.cond:
+            self.in_flight -= 1
+            self.cond.notify_all()
+
+    def block(self, seconds: float) -> None:
+        """Send nothing to the host for ``seconds``."""
+        def extend(state: Dict[str, float]) -> float:
+            state["blocked_until"] = max(state.get("blocked_until", 0.0), time.time() + seconds)
+            return 0.0
+
+        self._update(extend)
+        with self.cond:
+            self.cond.notify_all()
+
+
+class Abandoned(RuntimeError):
+    """The request's fetch was abandoned before the request was sent."""
+
+
+class Lease:
+    """The in-flight slots held by one fetch's requests; abandon() hands them back early."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._held: List[_Host] = []
+        self.abandoned = False
+
+    def hold(self, limiter: _Host) -> bool:
+        """Record a slot just taken from ``limiter``; False once abandoned (the caller gives it back)."""
+        with self._lock:
+            if self.abandoned:
+                return False
+            self._held.append(limiter)
+            return True
+
+    def release(self, limiter: _Host) -> None:
+        """Give back a slot recorded by hold(), unless abandon() already has."""
+        with self._lock:
+            if limiter not in self._held:
+                return
+            self._held.remove(limiter)
+        limiter.release()
+
+    def abandon(self) -> None:
+        with self._lock:
+            self.abandoned = True
+            held, self._held = self._held, []
+        for limiter in held:
+            limiter.release()
+
+
+_enabled = True
+_policies: Dict[str, HostPolicy] = {}
+_state_dir: Optional[str] = DEFAULT_STATE_DIR
+_hosts: Dict[str, _Host] = {}
+_hosts_lock = threading.Lock()
+_priorities: Dict[str, int] = {}
+_tickets: Iterator[int] = itertools.count()
+_local = threading.local()
+
+
+def parse_policy(value: str) -> Tuple[str, HostPolicy]:
+    """HOST=RATE[,BURST[,IN_FLIGHT]] -> (host, policy)."""
+    host, sep, spec = value.partition("=")
+    parts = spec.split(",")
+    try:
+        if not sep or not host or len(parts) > 3:
+            raise ValueError(value)
+        rate = float(parts[0])
+        burst = int(parts[1]) if len(parts) > 1 else DEFAULT_POLICY.burst
+        in_flight = int(parts[2]) if len(parts) > 2 else DEFAULT_POLICY.in_flight
+        if rate <= 0 or burst < 1 or in_flight < 1:
+            raise ValueError(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected HOST=RATE[,BURST[,IN_FLIGHT]], got {value!r}") from None
+    return host, HostPolicy(rate, burst, in_flight)
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--rate-limit", action="append", type=parse_policy, default=None,
+                        metavar="HOST=RATE[,BURST[,IN_FLIGHT]]",
+                        help=f"Requests/s, burst and concurrent requests for a host (repeatable; default "
+                             f"{DEFAULT_POLICY.rate:g},{DEFAULT_POLICY.burst},{DEFAULT_POLICY.in_flight} for every host)")
+    parser.add_argument("--no-rate-limit", action="store_true", help="Send requests without rate limiting")
+
+
+def configure(args: argparse.Namespace) -> None:
+    global _enabled, _state_dir
+    _enabled = not getattr(args, "no_rate_limit", False)
+    _state_dir = os.environ.get(STATE_ENV_VAR) or DEFAULT_STATE_DIR
+    _policies.clear()
+    _policies.update(dict(getattr(args, "rate_limit", None) or ()))
+    with _hosts_lock:
+        _hosts.clear()
+
+
+def _host(host: str) -> _Host:
+    with _hosts_lock:
+        limiter = _hosts.get(host)
+        if limiter is None:
+            policy = _policies.get(host) or _policies.get(host.split(":")[0]) or DEFAULT_POLICY
+            state_path = os.path.join(_state_dir, f"{host.replace(':', '_')}.json") if _state_dir else None
+            limiter = _hosts[host] = _Host(host, policy, state_path)
+        return limiter
+
+
+@contextmanager
+def leased(lease: Lease) -> Iterator[None]:
+    """Requests this thread sends inside the block hold their slots through ``lease``."""
+    _local.lease = lease
+    try:
+        yield
+    finally:
+        _local.lease = None
+
+
+def page_key(url: str) -> str:
+    """The page a request is for: the REST ?slug=, else the last path segment."""
+    parts = urlsplit(url)
+    slug = parse_qs(parts.query).get("slug")
+    return slug[0] if slug else parts.path.rstrip("/").rsplit("/", 1)[-1]
+
+
+def is_results_page(url: str) -> bool:
+    return page_key(url).endswith("-results")
+
+
+def retry_after(value: Optional[str]) -> float:
+    """Seconds to back off for a Retry-After header value."""
+    seconds = DEFAULT_RETRY_AFTER_S
+    if value:
+        value = value.strip()
+        try:
+            seconds = float(value) if value.isdigit() else parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            pass
+    return min(MAX_RETRY_AFTER_S, max(0.0, seconds))
+
+
+def awaiting_results(paths: Sequence[Optional[str]]) -> bool:
+    """True while a match in the first existing data file of ``paths`` is awaiting its result."""
+    for path in paths:
+        if path and os.path.isfile(path):
+            return bool(poll_schedule.awaiting_results(poll_schedule.load_windows([path]), int(time.time())))
+    return False
+
+
+def schedule(items: Sequence[T], url: Callable[[T], str], urgent: bool) -> List[T]:
+    """``items`` in fetch order, results pages first when ``urgent``; sets their request priorities."""
+    def rank(item: T) -> int:
+        return URGENT if urgent and is_results_page(url(item)) else NORMAL
+
+    ordered = sorted(items, key=rank)
+    for item in ordered:
+        _priorities[page_key(url(item))] = rank(item)
+    if urgent and ordered != list(items):
+        print("[rate-limit] match awaiting a result: fetching results pages first", flush=True)
+    return ordered
+
+
+class Adapter(HTTPAdapter):
+    """HTTPAdapter whose requests go through their host's limiter; a 429 backs the host off."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        # Retry-After is handled in send(); urllib3 honouring it too would retry a 429 while
+        # holding the in-flight slot, without pausing the host.
+        self.max_retries = self.max_retries.new(respect_retry_after_header=False)
+
+    def send(self, request: Any, *args: Any, **kwargs: Any) -> Any:
+        if not _enabled:
+            return super().send(request, *args, **kwargs)
+        host = urlsplit(request.url).netloc
+        limiter = _host(host)
+        priority = _priorities.get(page_key(request.url), NORMAL)
+        lease: Optional[Lease] = getattr(_local, "lease", None)
+        for attempt in range(MAX_429_RETRIES + 1):
+            waited = limiter.acquire(priority)
+            if waited >= 0.001:
+                run_profile.count("rate_limit_wait_seconds", round(waited, 3), host=host)
+            if lease is not None and not lease.hold(limiter):
+                limiter.release()
+                raise Abandoned(f"abandoned before sending {request.url}")
+            try:
+                response = super().send(request, *args, **kwargs)
+            finally:
+                if lease is None:
+                    limiter.release()
+                else:
+                    lease.release(limiter)
+            if response.status_code != 429 or attempt == MAX_429_RETRIES or (lease is not None and lease.abandoned):
+                break
+            delay = retry_after(response.headers.get("Retry-After"))
+            print(f"[rate-limit] {host}: 429 for {request.url}; pausing the host for {delay:g}s", flush=True)
+            run_profile.count("rate_limited", 1, host=host)
+            limiter.block(delay)
+            response.close()
+        return response
+
+
+def check_429() -> bool:
+    """Send one GET per scraper session setup to a local server that always answers 429.
+
+    Each must reach the server exactly MAX_429_RETRIES + 1 times: once per Adapter attempt,
+    with no urllib3 retries of its own in between.
+    """
+    import importlib
+    import tempfile
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    import requests
+
+    hits = [0]
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            hits[0] += 1
+            self.send_response(429)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+    global _state_dir
+    _state_dir = tempfile.mkdtemp(prefix="ratelimit-check-")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, name="check-429", daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/senior-hurling-results/"
+    ok = True
+    try:
+        for name in ("scrape_championship_fixtures", "scrape_league_fixtures",
+                     "scrape_divisional_hurling_championship", "scrape_limerickgaa", "scrape_daemon"):
+            module = importlib.import_module(name)
+            adapter_class = getattr(module, "CachingAdapter", Adapter)
+            session = requests.Session()
+            session.mount("http://", adapter_class(max_retries=getattr(module, "RETRY", 0)))
+            hits[0] = 0
+            try:
+                status = session.get(url, timeout=10).status_code
+            except requests.RequestException as exc:
+                status = type(exc).__name__
+            good = hits[0] == MAX_429_RETRIES + 1
+            ok = ok and good
+            print(f"[rate-limit] {name}: {hits[0]} requests for one GET (expected {MAX_429_RETRIES + 1}), "
+                  f"final {status}: {'ok' if good else 'FAIL'}", flush=True)
+    finally:
+        server.shutdown()
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Show the shared rate-limit state per host")
+    parser.add_argument("--check-429", action="store_true",
+                        help="Check that a 429 reaches the site once per Adapter attempt; exit 1 if not")
+    args = parser.parse_args()
+    if args.check_429:
+        raise SystemExit(0 if check_429() else 1)
+    directory = os.environ.get(STATE_ENV_VAR) or DEFAULT_STATE_DIR
+    names = sorted(os.listdir(directory)) if os.path.isdir(directory) else []
+    print(f"[rate-limit] {len(names)} host(s) in {directory}")
+    now = time.time()
+    for name in names:
+        try:
+            with open(os.path.join(directory, name), "r", encoding="utf-8") as handle:
+                state = json.load(handle)
+        except (OSError, ValueError):
+            continue
+        blocked = max(0.0, state.get("blocked_until", 0.0) - now)
+        print(f"  {name[:-5]}: {state.get('tokens', 0):.2f} tokens at {now - state.get('updated', now):.0f}s ago"
+              + (f", paused for {blocked:.0f}s more" if blocked else ""))
+
+
+if __name__ == "__main__":
+    main()
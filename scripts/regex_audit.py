@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+ReDoS audit for the scraper regexes.
+
+Collects every pattern the scrapers run on page text: module-level compiled
+patterns, and inline re.match/search/fullmatch/sub calls found in the source
+(f-string patterns are evaluated against the module's globals). Each pattern
+is then fuzzed for slow inputs in a child process with a hard time limit:
+
+- candidates are pumped strings, prefix + unit * n + suffix, built from the
+  pattern's own literals, digits, whitespace and separators, and from slices
+  of real corpus lines (a repeated slice of "Saturday 23^{rd} August, 2026");
+- the slowest candidates at SEARCH_CHARS are re-timed at the guard length
+  (line_guard.MAX_LINE_CHARS) and at 4x/16x that, giving the worst-case time
+  per line and a growth exponent (1 linear, 2 quadratic, ...).
+
+The run fails when a pattern exceeds line_guard.LINE_BUDGET_MS on a
+guard-length line, or does not finish within its time limit. Patterns that
+grow faster than linear are reported but pass while the guard keeps their
+input short enough.
+
+Usage:
+  python scripts/regex_audit.py
+  python scripts/regex_audit.py --pattern RESULT_TEAM_RE --budget 5 --verbose
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import contextlib
+import importlib
+import io
+import math
+import multiprocessing
+import random
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import line_guard
+import page_corpus
+
+SCRAPERS = (
+    "scrape_championship_fixtures",
+    "scrape_league_fixtures",
+    "scrape_divisional_hurling_championship",
+    "scrape_limerickgaa",
+)
+INLINE_METHODS = ("match", "search", "fullmatch", "sub")
+
+SEARCH_CHARS = 256
+GROWTH = (1, 4, 16)  # multiples of MAX_LINE_CHARS timed for the worst candidates
+GROWTH_REPEATS = 3
+TOP_CANDIDATES = 4
+MIN_TIMING_S = 0.002  # repeat a probe until it has run at least this long
+SEED_LINES = 300
+
+BASE_UNITS = (" ", "1", "a", "A", "-", ":", "^", "{", "}", "/", ",", ".", "\t", "1 ", "a ", "1-", " -", "- ", "a1")
+SUFFIXES = ("", "!", " x", " ")
+
+Pump = Tuple[str, str, str]
+
+
+@dataclass(frozen=True)
+class Target:
+    name: str
+    pattern: "re.Pattern[str]"
+    method: str
+
+
+def _method_for(source: str, name: str) -> str:
+    """How the module applies the constant; scanning calls (sub/search) are timed as such."""
+    for method, calls in (("sub", ("sub", "subn")), ("search", ("search", "findall", "finditer")), ("fullmatch", ("fullmatch",))):
+        if any(f"{name}.{call}(" in source for call in calls):
+            return method
+    return "match"
+
+
+def module_targets(module_name: str) -> List[Target]:
+    """Compiled module constants plus the inline patterns in the module's source."""
+    module = importlib.import_module(module_name)
+    with open(module.__file__, "r", encoding="utf-8") as handle:
+        source = handle.read()
+
+    targets: List[Target] = []
+    for name, value in vars(module).items():
+        if isinstance(value, re.Pattern):
+            targets.append(Target(f"{module_name}.{name}", value, _method_for(source, name)))
+
+    seen = {(target.pattern.pattern, target.pattern.flags, target.method) for target in targets}
+    for node in ast.walk(ast.parse(source)):
+        if not (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Attribute)
+            and isinstance(node.func.value, ast.Name)
+            and node.func.value.id == "re"
+            and node.func.attr in INLINE_METHODS
+            and node.args
+        ):
+            continue
+        try:
+            text = eval(compile(ast.Expression(node.args[0]), module.__file__, "eval"), vars(module))
+            flags = 0
+            for keyword in node.keywords:
+                if keyword.arg == "flags":
+                    flags = eval(compile(ast.Expression(keyword.value), module.__file__, "eval"), vars(module))
+            if node.func.attr != "sub" and len(node.args) >= 3:
+                flags = eval(compile(ast.Expression(node.args[2]), module.__file__, "eval"), vars(module))
+            pattern = re.compile(text, flags)
+        except Exception:
+            continue
+        key = (pattern.pattern, pattern.flags, node.func.attr)
+        if key not in seen:
+            seen.add(key)
+            targets.append(Target(f"{module_name}:{node.lineno}", pattern, node.func.attr))
+    return targets
+
+
+def all_targets(name_filter: Optional[str] = None) -> List[Target]:
+    targets: List[Target] = []
+    for module_name in SCRAPERS:
+        targets.extend(
+            target for target in module_targets(module_name)
+            if not name_filter or name_filter in target.name
+        )
+    return targets
+
+
+def corpus_lines(limit: int = SEED_LINES, seed: int = 0) -> List[str]:
+    import scrape_championship_fixtures as championship
+
+    lines = set()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for page in page_corpus.load_pages():
+            lines.update(championship.normalize_lines(page.html))
+    ordered = sorted(lines)
+    random.Random(seed).shuffle(ordered)
+    return ordered[:limit]
+
+
+def _runner(target: Target):
+    pattern = target.pattern
+    if target.method == "sub":
+        return lambda text: pattern.sub(" ", text)
+    return getattr(pattern, target.method)
+
+
+def probe_seconds(target: Target, text: str) -> float:
+    """Seconds per call, repeating short calls until MIN_TIMING_S has elapsed."""
+    run = _runner(target)
+    calls = 0
+    started = time.perf_counter()
+    while True:
+        run(text)
+        calls += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= MIN_TIMING_S:
+            return elapsed / calls
+
+
+def pumped(pump: Pump, length: int) -> str:
+    prefix, unit, suffix = pump
+    repeats = max(1, (length - len(prefix) - len(suffix)) // max(len(unit), 1))
+    return prefix + unit * repeats + suffix
+
+
+def _literal_words(pattern: str) -> List[str]:
+    return sorted({word for word in re.findall(r"[A-Za-z]{2,}", pattern) if word.lower() not in ("st", "nd", "rd", "th")})
+
+
+def candidate_pumps(target: Target, seeds: Sequence[str], rng: random.Random, count: int) -> List[Pump]:
+    words = _literal_words(target.pattern.pattern)
+    units = list(BASE_UNITS) + [word + " " for word in words[:20]]
+    prefixes = [""] + [word + " " for word in words[:20]]
+    for line in seeds:
+        # Real lines the pattern (nearly) accepts are the best launch points.
+        cut = rng.randint(0, len(line))
+        prefixes.append(line[:cut])
+        if len(line) > 2:
+            start = rng.randrange(len(line) - 1)
+            units.append(line[start:rng.randint(start + 1, min(len(line), start + 8))])
+    return [(rng.choice(prefixes), rng.choice(units), rng.choice(SUFFIXES)) for _ in range(count)]
+
+
+def fuzz(target: Target, seeds: Sequence[str], budget_s: float, seed: int, progress: Any) -> Dict[str, Any]:
+    """Search for the slowest pump within ``budget_s``, then time it at the guard length and beyond."""
+    rng = random.Random(seed)
+    scored: List[Tuple[float, Pump]] = []
+    deadline = time.perf_counter() + budget_s
+    tried = 0
+    while time.perf_counter() < deadline:
+        for pump in candidate_pumps(target, seeds, rng, 50):
+            text = pumped(pump, SEARCH_CHARS)
+            progress.send(("probe", len(text), text[:80]))
+            scored.append((probe_seconds(target, text), pump))
+            tried += 1
+        scored.sort(key=lambda item: item[0], reverse=True)
+        del scored[TOP_CANDIDATES:]
+
+    worst: Dict[str, Any] = {"tried": tried, "guard_ms": 0.0, "exponent": 0.0, "input": ""}
+    for _, pump in scored:
+        times = []
+        for multiple in GROWTH:
+            text = pumped(pump, line_guard.MAX_LINE_CHARS * multiple)
+            progress.send(("probe", len(text), text[:80]))
+            # Load only ever adds time: keep the quickest of a few repeats.
+            times.append((len(text), min(probe_seconds(target, text) for _ in range(GROWTH_REPEATS))))
+        (short_len, short_s), (long_len, long_s) = times[-2], times[-1]
+        exponent = math.log(long_s / short_s) / math.log(long_len / short_len)
+        guard_ms = times[0][1] * 1000
+        if guard_ms > worst["guard_ms"]:
+            worst.update(guard_ms=guard_ms, input=pumped(pump, line_guard.MAX_LINE_CHARS), largest_ms=long_s * 1000)
+        worst["exponent"] = max(worst["exponent"], exponent)
+    return worst
+
+
+def _child(target: Target, seeds: Sequence[str], budget_s: float, seed: int, connection: Any) -> None:
+    connection.send(("done", fuzz(target, seeds, budget_s, seed, connection)))
+    connection.close()
+
+
+def audit(target: Target, seeds: Sequence[str], budget_s: float, seed: int) -> Dict[str, Any]:
+    """fuzz() in a child process, killed if it runs well past its budget (a hang is a finding)."""
+    parent, child = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=_child, args=(target, seeds, budget_s, seed, child), daemon=True)
+    process.start()
+    child.close()
+    limit = time.perf_counter() + budget_s * 3 + 5.0
+    last_probe: Tuple[int, str] = (0, "")
+    result: Optional[Dict[str, Any]] = None
+    while result is None and time.perf_counter() < limit:
+        if parent.poll(0.05):
+            try:
+                message = parent.recv()
+            except EOFError:
+                break
+            if message[0] == "probe":
+                last_probe = (message[1], message[2])
+            else:
+                result = message[1]
+    if result is None:
+        process.terminate()
+        process.join()
+        return {"timeout": True, "length": last_probe[0], "input": last_probe[1]}
+    process.join()
+    return result
+
+
+def verdict(result: Dict[str, Any]) -> str:
+    if result.get("timeout"):
+        return "TIMEOUT"
+    exponent = result["exponent"]
+    if exponent < 1.4:
+        return "linear"
+    if exponent < 2.4:
+        return "quadratic"
+    return "super-quadratic"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pattern", help="Only audit patterns whose name contains this text")
+    parser.add_argument("--budget", type=float, default=1.0, help="Search seconds per pattern (default: 1.0)")
+    parser.add_argument("--seed", type=int, default=2026)
+    parser.add_argument("--list", action="store_true", help="List the collected patterns and exit")
+    parser.add_argument("--verbose", action="store_true", help="Show the worst input for every pattern")
+    args = parser.parse_args()
+
+    targets = all_targets(args.pattern)
+    if args.list:
+        for target in targets:
+            print(f"{target.name:50} {target.method:9} {target.pattern.pattern}")
+        return
+
+    seeds = corpus_lines(seed=args.seed)
+    failures: List[str] = []
+    print(f"[audit] {len(targets)} patterns, {args.budget:g}s search each, guard {line_guard.MAX_LINE_CHARS} chars, "
+          f"budget {line_guard.LINE_BUDGET_MS:g} ms/line", flush=True)
+    for target in targets:
+        result = audit(target, seeds, args.budget, args.seed)
+        kind = verdict(result)
+        if result.get("timeout"):
+            line = f"{target.name:50} TIMEOUT at {result['length']:,} chars"
+            failures.append(f"{target.name}: no result in time; last input {result['input']!r}")
+        else:
+            line = (f"{target.name:50} {target.method:9} worst {result['guard_ms']:7.3f} ms @{line_guard.MAX_LINE_CHARS}  "
+                    f"{result['largest_ms']:9.3f} ms @{line_guard.MAX_LINE_CHARS * GROWTH[-1]:,}  "
+                    f"x^{result['exponent']:.2f} {kind}")
+            if result["guard_ms"] > line_guard.LINE_BUDGET_MS:
+                failures.append(f"{target.name}: {result['guard_ms']:.2f} ms on a guard-length line")
+        print(line, flush=True)
+        if args.verbose or kind != "linear":
+            print(f"    worst input: {result['input'][:120]!r}", flush=True)
+
+    for failure in failures:
+        print(f"[audit] FAIL {failure}", flush=True)
+    if failures:
+        raise SystemExit(1)
+    print(f"[audit] every pattern stays within {line_guard.LINE_BUDGET_MS:g} ms on a "
+          f"{line_guard.MAX_LINE_CHARS}-char line", flush=True)
+
+
+if __name__ == "__main__":
+    main()
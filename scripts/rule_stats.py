@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Per-rule hit, miss and latency counters for the scraper parsers.
+
+The parsers are cascades of regex rules: module-level patterns (ROUND_RE,
+VENUE_RE, ...) and inline re.match/search/sub calls. instrument() swaps a
+scraper module's pattern constants and its ``re`` reference for counting
+proxies, so every rule call records, per scraper, page and calling function:
+
+  tries   calls made
+  hits    calls that matched (sub: replaced something, findall: found any)
+  time    nanoseconds spent inside the call
+
+Rules are named after their constant (VENUE_RE.match) or, for inline calls
+and patterns compiled inside a function, by source line (re.match@L612).
+The same rule called from two functions (VENUE_RE.match in parse_one_block
+and in is_plausible_team) is counted separately. Timing adds about half a
+microsecond per call, so absolute times run high; compare rules with each
+other, not with uninstrumented runs.
+
+Offline over the page corpus (the same pages and parse paths as
+parser_diff.py):
+  python scripts/rule_stats.py
+  python scripts/rule_stats.py --family divisional --sort tries --top 20
+  python scripts/rule_stats.py --family league --by-page --synthetic
+
+Live, during a scrape: pass --rule-stats to any scraper; the table is printed
+at the end and the rows are added to its timings file.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import dataclasses
+import importlib
+import io
+import re
+import sys
+import time
+from types import ModuleType
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import page_corpus
+
+RULE_METHODS = ("match", "search", "fullmatch", "sub", "subn", "findall", "finditer", "split")
+SORT_KEYS = ("time", "tries", "hits", "misses")
+
+RowKey = Tuple[str, str, str, str]  # scraper, page, caller, rule
+
+
+class RuleStats:
+    """Counters per (scraper, page, caller, rule); ``page`` names the page being parsed."""
+
+    def __init__(self, page: Callable[[], str] = lambda: "") -> None:
+        self.page = page
+        self.rows: Dict[RowKey, List[int]] = {}
+        self.patterns: Dict[str, str] = {}
+
+    def record(self, scraper: str, caller: Any, rule: str, pattern: str, hit: bool, elapsed_ns: int) -> None:
+        key = (scraper, self.page(), caller.f_code.co_name, rule)
+        row = self.rows.get(key)
+        if row is None:
+            row = self.rows[key] = [0, 0, 0]
+            self.patterns.setdefault(rule, pattern)
+        row[0] += 1
+        row[1] += hit
+        row[2] += elapsed_ns
+
+    def table(self, by_page: bool = False) -> List[Dict[str, Any]]:
+        """Rows as dicts, merged across pages unless ``by_page``; ``share`` is of the scraper's rule time."""
+        merged: Dict[RowKey, List[int]] = {}
+        for (scraper, page, caller, rule), (tries, hits, elapsed) in self.rows.items():
+            row = merged.setdefault((scraper, page if by_page else "", caller, rule), [0, 0, 0])
+            row[0] += tries
+            row[1] += hits
+            row[2] += elapsed
+        scraper_ns: Dict[str, int] = {}
+        for (scraper, _, _, _), (_, _, elapsed) in merged.items():
+            scraper_ns[scraper] = scraper_ns.get(scraper, 0) + elapsed
+        return [
+            {
+                "scraper": scraper, "page": page, "caller": caller, "rule": rule,
+                "tries": tries, "hits": hits, "misses": tries - hits, "time_ns": elapsed,
+                "share": elapsed / scraper_ns[scraper] if scraper_ns[scraper] else 0.0,
+                "pattern": self.patterns.get(rule, ""),
+            }
+            for (scraper, page, caller, rule), (tries, hits, elapsed) in merged.items()
+        ]
+
+
+def _timed(call: Callable[..., Any], method: str, args: Any, kwargs: Any) -> Tuple[Any, bool, int]:
+    """Run one rule call: (result, hit, nanoseconds). sub/finditer run as subn/a list to see the outcome."""
+    started = time.perf_counter_ns()
+    if method == "sub":
+        result, count = call("subn")(*args, **kwargs)
+        hit = count > 0
+    elif method == "finditer":
+        found = list(call("finditer")(*args, **kwargs))
+        result, hit = iter(found), bool(found)
+    else:
+        result = call(method)(*args, **kwargs)
+        if method == "subn":
+            hit = result[1] > 0
+        elif method == "split":
+            hit = len(result) > 1
+        elif method == "findall":
+            hit = bool(result)
+        else:
+            hit = result is not None
+    return result, hit, time.perf_counter_ns() - started
+
+
+class _CountingPattern:
+    """Stands in for a compiled pattern, counting every rule call on it."""
+
+    def __init__(self, rule: str, pattern: "re.Pattern[str]", stats: RuleStats, scraper: str) -> None:
+        self._rule = rule
+        self._pattern = pattern
+        self._stats = stats
+        self._scraper = scraper
+
+    def __getattr__(self, attribute: str) -> Any:
+        return getattr(self._pattern, attribute)
+
+    def _call(self, method: str, caller: Any, args: Any, kwargs: Any) -> Any:
+        result, hit, elapsed = _timed(lambda name: getattr(self._pattern, name), method, args, kwargs)
+        self._stats.record(self._scraper, caller, f"{self._rule}.{method}", self._pattern.pattern, hit, elapsed)
+        return result
+
+
+class _CountingRe:
+    """Stands in for a module's ``re``: inline calls become rules named by source line."""
+
+    def __init__(self, stats: RuleStats, scraper: str) -> None:
+        self._stats = stats
+        self._scraper = scraper
+
+    def __getattr__(self, attribute: str) -> Any:
+        return getattr(re, attribute)
+
+    def _call(self, method: str, caller: Any, pattern: Any, args: Any, kwargs: Any) -> Any:
+        result, hit, elapsed = _timed(lambda name: getattr(re, name), method, (pattern,) + args, kwargs)
+        text = pattern if isinstance(pattern, str) else pattern.pattern
+        self._stats.record(self._scraper, caller, f"re.{method}@L{caller.f_lineno}", text, hit, elapsed)
+        return result
+
+    def compile(self, pattern: Any, flags: int = 0) -> _CountingPattern:
+        rule = f"re.compile@L{sys._getframe(1).f_lineno}"
+        return _CountingPattern(rule, re.compile(pattern, flags), self._stats, self._scraper)
+
+
+def _pattern_method(method: str) -> Callable[..., Any]:
+    def call(self: _CountingPattern, *args: Any, **kwargs: Any) -> Any:
+        return self._call(method, sys._getframe(1), args, kwargs)
+    call.__name__ = method
+    return call
+
+
+def _re_method(method: str) -> Callable[..., Any]:
+    def call(self: _CountingRe, pattern: Any, *args: Any, **kwargs: Any) -> Any:
+        return self._call(method, sys._getframe(1), pattern, args, kwargs)
+    call.__name__ = method
+    return call
+
+
+for _method in RULE_METHODS:
+    setattr(_CountingPattern, _method, _pattern_method(_method))
+    setattr(_CountingRe, _method, _re_method(_method))
+
+
+def instrument(module: ModuleType, stats: RuleStats, scraper: Optional[str] = None) -> Callable[[], None]:
+    """Count ``module``'s rule calls into ``stats``; returns a function that undoes it."""
+    scraper = scraper or module.__name__
+    saved: Dict[str, Any] = {}
+    for name, value in list(vars(module).items()):
+        if isinstance(value, re.Pattern):
+            saved[name] = value
+            setattr(module, name, _CountingPattern(name, value, stats, scraper))
+    if getattr(module, "re", None) is re:
+        saved["re"] = re
+        module.re = _CountingRe(stats, scraper)  # type: ignore[attr-defined]
+
+    def restore() -> None:
+        for name, value in saved.items():
+            setattr(module, name, value)
+
+    return restore
+
+
+def sorted_rows(rows: List[Dict[str, Any]], sort: str = "time") -> List[Dict[str, Any]]:
+    key = "time_ns" if sort == "time" else sort
+    return sorted(rows, key=lambda row: (row["scraper"], row["page"], -row[key], row["caller"], row["rule"]))
+
+
+def print_table(rows: List[Dict[str, Any]], sort: str = "time", top: Optional[int] = None, tag: str = "rules") -> None:
+    """Rows grouped by scraper (and page), hottest first by ``sort``."""
+    group: Optional[Tuple[str, str]] = None
+    shown = 0
+    for row in sorted_rows(rows, sort):
+        if (row["scraper"], row["page"]) != group:
+            group, shown = (row["scraper"], row["page"]), 0
+            title = row["scraper"] + (f" {row['page']}" if row["page"] else "")
+            print(f"[{tag}] {title}", flush=True)
+            print(f"  {'caller':26} {'rule':28} {'tries':>9} {'hits':>8} {'hit%':>6} {'ms':>8} {'ns/try':>7} {'share':>6}  pattern")
+        if top is not None and shown >= top:
+            continue
+        shown += 1
+        hit_rate = 100.0 * row["hits"] / row["tries"] if row["tries"] else 0.0
+        print(
+            f"  {row['caller'][:26]:26} {row['rule'][:28]:28} {row['tries']:9,} {row['hits']:8,} {hit_rate:5.1f}% "
+            f"{row['time_ns'] / 1e6:8.2f} {row['time_ns'] / max(row['tries'], 1):7.0f} {100 * row['share']:5.1f}%  "
+            f"{row['pattern'][:48]}"
+        )
+
+
+def run_corpus(families: Sequence[str], synthetic: bool, repeat: int) -> RuleStats:
+    """Instrument each family's scraper and run its corpus pages through it."""
+    import parser_diff
+    import synthetic_season
+
+    pages = page_corpus.load_pages()
+    if synthetic:
+        pages = pages + [
+            dataclasses.replace(page, name=f"synthetic/{page.name}")
+            for page in synthetic_season.generate(synthetic_season.SeasonSpec())[0]
+        ]
+    current = {"page": ""}
+    stats = RuleStats(page=lambda: current["page"])
+    for name in families:
+        family = parser_diff.FAMILIES[name]
+        module = importlib.import_module(family.module)
+        normalize = getattr(module, family.normalize)
+        restore = instrument(module, stats, family.name)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                for _ in range(repeat):
+                    for page in parser_diff.family_pages(family, pages):
+                        current["page"] = page.name
+                        family.parse(page, module, normalize(page.html))
+        finally:
+            restore()
+    return stats
+
+
+def main() -> None:
+    import parser_diff
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--family", action="append", choices=sorted(parser_diff.FAMILIES),
+                        help="Scraper to instrument (repeatable; default: all)")
+    parser.add_argument("--synthetic", action="store_true", help="Add a generated season (synthetic_season.py) to the pages")
+    parser.add_argument("--by-page", action="store_true", help="One table per page instead of per scraper")
+    parser.add_argument("--sort", choices=SORT_KEYS, default="time", help="Order rules by (default: time)")
+    parser.add_argument("--top", type=int, default=None, help="Rules shown per table (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the pages, to steady the times (default: 3)")
+    args = parser.parse_args()
+
+    stats = run_corpus(args.family or sorted(parser_diff.FAMILIES), args.synthetic, args.repeat)
+    print_table(stats.table(by_page=args.by_page), args.sort, args.top)
+
+
+if __name__ == "__main__":
+    main()
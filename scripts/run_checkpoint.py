@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Per-page checkpoints, so a failed scrape can be resumed rather than rerun.
+
+Each page a scraper fetches and parses is saved to its run directory
+(--run-dir, default .cache/runs/<scraper>) as one JSON file: the page, a
+SHA-256 of its body, its normalised lines and its parsed records. A page that
+fails no longer stops the run at once: the remaining pages are still
+fetched and checkpointed, and the run then fails listing what is missing.
+
+``--resume`` reuses the checkpoints of the previous attempt (those under
+MAX_AGE_S old) and fetches only the pages that have none; merge, validation
+and write run once every page is present, exactly as in a fresh run. A run
+without --resume starts from an empty run directory, and a run that writes
+its output removes it, unless some pages were served stale by
+source_breaker: those are never checkpointed, so a --resume retry fetches
+just them again.
+
+  python scripts/run_checkpoint.py league          # what a --resume would reuse
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+from typing import Any, Callable, Dict, Generic, List, Optional, Sequence, Tuple, Type, TypeVar
+
+import page_fetch
+import partial_refresh
+import run_profile
+import source_breaker
+
+DEFAULT_DIR = os.path.join(".cache", "runs")
+MAX_AGE_S = 6 * 3600
+
+T = TypeVar("T")
+
+# What a scraper's page function returns: (raw body, lines, records).
+Scraped = Tuple[str, Sequence[str], List[T]]
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--resume", action="store_true",
+                        help="Reuse the page checkpoints of the previous failed attempt; fetch only missing pages")
+    parser.add_argument("--run-dir", default=None,
+                        help=f"Page checkpoint directory (default: {DEFAULT_DIR}/<scraper>)")
+
+
+def run_dir(script: str, value: Optional[str] = None) -> str:
+    return value or os.path.join(DEFAULT_DIR, script)
+
+
+def body_hash(body: str) -> str:
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+class Checkpoint(Generic[T]):
+    """The page checkpoints of one run of a scraper."""
+
+    def __init__(self, tag: str, directory: str, resume: bool = False,
+                 record_type: Optional[Type[T]] = None) -> None:
+        self.tag = tag
+        self.directory = directory
+        self.resume = resume
+        self.record_type = record_type
+        self.failures: List[Tuple[str, BaseException]] = []
+        self.stale: List[str] = []
+        self.resumed = 0
+        if not resume:
+            self.clear()
+
+    def path(self, page: str) -> str:
+        digest = hashlib.blake2b(page.encode("utf-8"), digest_size=10).hexdigest()
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def _encode(self, record: Any) -> Any:
+        return record.to_dict() if hasattr(record, "to_dict") else record
+
+    def _decode(self, record: Dict[str, Any]) -> Any:
+        return record if self.record_type is None else partial_refresh.from_dict(self.record_type, record)
+
+    def load(self, page: str) -> Optional[List[T]]:
+        """The page's checkpointed records when resuming, else None."""
+        if not self.resume:
+            return None
+        try:
+            with open(self.path(page), "r", encoding="utf-8") as handle:
+                saved = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        if saved.get("page") != page or time.time() - saved.get("saved_at", 0) > MAX_AGE_S:
+            return None
+        return [self._decode(record) for record in saved["records"]]
+
+    def save(self, page: str, body: str, lines: Sequence[str], records: Sequence[T]) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(page)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump({
+                "page": page,
+                "saved_at": time.time(),
+                "body_sha256": body_hash(body),
+                "lines": list(lines),
+                "records": [self._encode(record) for record in records],
+            }, handle, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def page(self, page: str, scrape: Callable[[], Scraped], required: bool = True) -> Optional[List[T]]:
+        """Records for ``page``: from its checkpoint when resuming, else scraped and checkpointed.
+
+        Returns None when the page failed; a required page's failure is raised by complete(),
+        as is a passed --deadline on any page.
+        """
+        records = self.load(page)
+        if records is not None:
+            self.resumed += 1
+            run_profile.count("resumed_pages", 1, page=page)
+            print(f"[{self.tag}] resumed {page} from checkpoint: {len(records)} records", flush=True)
+            return records
+        stale_before = source_breaker.stale_serves()
+        try:
+            body, lines, records = scrape()
+        except Exception as exc:
+            if required or isinstance(exc, page_fetch.DeadlineExceeded):
+                self.failures.append((page, exc))
+            print(f"[{self.tag}] page failed: {page} :: {exc}", flush=True)
+            return None
+        if source_breaker.stale_serves() > stale_before:
+            self.stale.append(page)
+            print(f"[{self.tag}] not checkpointed (served stale): {page}", flush=True)
+            return records
+        self.save(page, body, lines, records)
+        return records
+
+    def complete(self) -> None:
+        """Raise if a required page failed; its checkpointed siblings wait for a --resume."""
+        if not self.failures:
+            return
+        pages = ", ".join(page for page, _ in self.failures)
+        raise RuntimeError(
+            f"{len(self.failures)} page(s) failed: {pages}; rerun with --resume to fetch only those"
+        ) from self.failures[0][1]
+
+    def finish(self) -> None:
+        """After the output is written: drop the checkpoints, unless pages were served stale."""
+        if not self.stale:
+            self.clear()
+            return
+        print(f"[{self.tag}] {len(self.stale)} page(s) served stale; kept the other checkpoints "
+              f"so --resume fetches only those", flush=True)
+
+    def clear(self) -> None:
+        if os.path.isdir(self.directory):
+            shutil.rmtree(self.directory)
+
+
+def open_run(script: str, args: argparse.Namespace, record_type: Optional[Type[T]] = None) -> "Checkpoint[T]":
+    """This run's checkpoints, as set by --run-dir/--resume."""
+    return Checkpoint(script, run_dir(script, getattr(args, "run_dir", None)),
+                      resume=bool(getattr(args, "resume", False)), record_type=record_type)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("script", choices=("championship", "league", "divisional", "limerickgaa"))
+    parser.add_argument("--run-dir", default=None, help=f"Checkpoint directory (default: {DEFAULT_DIR}/<scraper>)")
+    args = parser.parse_args()
+
+    directory = run_dir(args.script, args.run_dir)
+    names = sorted(os.listdir(directory)) if os.path.isdir(directory) else []
+    print(f"[checkpoint] {len(names)} page checkpoint(s) in {directory}")
+    for name in names:
+        try:
+            with open(os.path.join(directory, name), "r", encoding="utf-8") as handle:
+                saved = json.load(handle)
+        except (OSError, ValueError):
+            continue
+        age_s = time.time() - saved.get("saved_at", 0)
+        usable = "" if age_s <= MAX_AGE_S else "  (too old to resume)"
+        print(f"  {age_s / 60:6.1f} min  {len(saved['lines']):>5} lines  {len(saved['records']):>4} records  "
+              f"{saved['body_sha256'][:12]}  {saved['page']}{usable}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+Per-stage timing and profiling hooks for the scrapers.
+
+Scrapers wrap each stage of a run in ``run_profile.stage(name, page)``:
+
+  fetch.rest / fetch.html   network, bytes received and retries
+  normalize                 BeautifulSoup to text lines (normalize.soup: the tree alone)
+  parse                     lines to blocks and records
+  merge / validate          fixtures and results combined and checked
+  write                     store, delta feed and JSON output
+
+and run main() inside ``run_profile.session(...)``. Within a session every
+stage records wall and CPU time plus its counters per page; code deeper in a
+stage (a parser counting blocks) adds to it with note(), and count() keeps
+run-level counters such as merge outcomes. At the end of the session:
+
+- scrape_metrics writes an OpenMetrics textfile, metrics/<scraper>.prom
+  (--metrics-dir or LGH_METRICS_DIR), on every run;
+- with --profile (or LGH_PROFILE=1) the stages are also written, with
+  per-stage totals, to timings/<output name>.json next to the output (kept
+  out of the published *.json set);
+- --cprofile PATH dumps cProfile stats for the whole run, e.g. for
+  ``python -m pstats PATH``;
+- --memprofile (or LGH_MEMPROFILE=1) runs tracemalloc and adds each stage's
+  peak and retained memory and its top allocation sites (a snapshot diff
+  over the stage) to the timings file. A nested stage's peak counts towards
+  the stage around it. Tracing slows the run severalfold; stage times from
+  a --memprofile run are not comparable with normal ones;
+- --rule-stats counts every parser regex rule (rule_stats.py) by page, prints
+  the hottest rules and adds all of them to the timings file.
+
+Outside a session (benchmarks, parser_diff) stage() returns one shared no-op
+context manager and note()/count() return at once, so a hook costs a
+function call.
+
+Usage:
+  LGH_PROFILE=1 python scripts/scrape_league_fixtures.py
+  python scripts/run_profile.py data/timings/league.json   # print a timings file
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import cProfile
+import json
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import scrape_metrics
+
+ENV_VAR = "LGH_PROFILE"
+MEM_ENV_VAR = "LGH_MEMPROFILE"
+MEM_TOP_SITES = 10
+RULES_SHOWN = 15
+TIMINGS_DIR = "timings"
+COUNTERS = ("bytes", "retries", "lines", "blocks", "records")
+
+CounterKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+class _NullStage:
+    """What stage() hands out when profiling is off."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullStage":
+        return self
+
+    def __exit__(self, *exc: Any) -> bool:
+        return False
+
+    def note(self, **counters: int) -> None:
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Memory:
+    """tracemalloc bookkeeping for --memprofile."""
+
+    # Sites that are bookkeeping, not scraper memory. Filtering the per-line
+    # statistics is far cheaper than Snapshot.filter_traces() on every trace.
+    IGNORED = (tracemalloc.__file__, __file__, "<frozen importlib._bootstrap>",
+               "<frozen importlib._bootstrap_external>", "<unknown>")
+
+    def __init__(self) -> None:
+        self.peak = 0  # highest traced bytes seen during the run
+
+    def start(self) -> None:
+        tracemalloc.start()
+
+    def stop(self) -> None:
+        tracemalloc.stop()
+
+    def snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot()
+
+    def top_sites(self, before: tracemalloc.Snapshot) -> List[Dict[str, Any]]:
+        """Lines that allocated the most memory still held since ``before``."""
+        stats = [
+            stat for stat in self.snapshot().compare_to(before, "lineno")
+            if stat.size_diff > 0 and stat.traceback[0].filename not in self.IGNORED
+        ]
+        return [
+            {"site": _site(stat.traceback[0]), "bytes": stat.size_diff, "count": stat.count_diff}
+            for stat in stats[:MEM_TOP_SITES]
+        ]
+
+
+def _site(frame: tracemalloc.Frame) -> str:
+    parts = frame.filename.replace(os.sep, "/").split("/")
+    return f"{'/'.join(parts[-2:])}:{frame.lineno}"
+
+
+class _Stage:
+    __slots__ = ("_profiler", "_event", "_wall", "_cpu", "_mem_start", "_mem_peak", "_snapshot")
+
+    def __init__(self, profiler: "Profiler", name: str, page: Optional[str]) -> None:
+        self._profiler = profiler
+        self._event: Dict[str, Any] = {"stage": name, "page": page}
+
+    def __enter__(self) -> "_Stage":
+        memory = self._profiler.memory
+        if memory:
+            _, peak = tracemalloc.get_traced_memory()
+            self._carry_peak(peak)
+            self._snapshot = memory.snapshot()
+            tracemalloc.reset_peak()
+            self._mem_start = self._mem_peak = tracemalloc.get_traced_memory()[0]
+        self._profiler.open_stages.append(self)
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> bool:
+        self._event["wall_s"] = round(time.perf_counter() - self._wall, 6)
+        self._event["cpu_s"] = round(time.process_time() - self._cpu, 6)
+        if exc_type is not None:
+            self._event["error"] = exc_type.__name__
+        self._profiler.open_stages.remove(self)
+        memory = self._profiler.memory
+        if memory:
+            current, peak = tracemalloc.get_traced_memory()
+            self._mem_peak = max(self._mem_peak, peak)
+            self._carry_peak(self._mem_peak)
+            self._event["mem_peak"] = self._mem_peak - self._mem_start
+            self._event["mem_retained"] = current - self._mem_start
+            self._event["mem_sites"] = memory.top_sites(self._snapshot)
+            self._snapshot = None
+            tracemalloc.reset_peak()  # the statistics above are not the enclosing stage's
+        self._profiler.events.append(self._event)
+        return False
+
+    def _carry_peak(self, peak: int) -> None:
+        """reset_peak() is global: hand the peak so far to the enclosing stage and the run first."""
+        profiler = self._profiler
+        profiler.memory.peak = max(profiler.memory.peak, peak)
+        if profiler.open_stages:
+            parent = profiler.open_stages[-1]
+            parent._mem_peak = max(parent._mem_peak, peak)
+
+    def note(self, **counters: int) -> None:
+        """Attach counters (bytes=, lines=, records=, ...) to this stage; repeated notes add up."""
+        for key, value in counters.items():
+            self._event[key] = self._event.get(key, 0) + int(value)
+
+
+class Profiler:
+    def __init__(self, script: str = "", enabled: bool = False, memory: Optional[_Memory] = None) -> None:
+        self.script = script
+        self.enabled = enabled
+        self.memory = memory
+        self.events: List[Dict[str, Any]] = []
+        self.open_stages: List[_Stage] = []
+        self.counters: Dict[CounterKey, float] = {}
+
+    def stage(self, name: str, page: Optional[str] = None) -> Any:
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name, page)
+
+    def count(self, name: str, value: float = 1, **labels: str) -> None:
+        if self.enabled:
+            key = (name, tuple(sorted((label, str(text)) for label, text in labels.items())))
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def totals(self) -> Dict[str, Dict[str, Any]]:
+        """Per-stage sums, in the order stages first ran."""
+        totals: Dict[str, Dict[str, Any]] = {}
+        for event in self.events:
+            row = totals.setdefault(event["stage"], {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0, "errors": 0})
+            row["calls"] += 1
+            row["wall_s"] = round(row["wall_s"] + event["wall_s"], 6)
+            row["cpu_s"] = round(row["cpu_s"] + event["cpu_s"], 6)
+            row["errors"] += 1 if "error" in event else 0
+            for counter in COUNTERS:
+                if counter in event:
+                    row[counter] = row.get(counter, 0) + event[counter]
+            if "mem_peak" in event:
+                row["mem_peak"] = max(row.get("mem_peak", 0), event["mem_peak"])
+                row["mem_retained"] = row.get("mem_retained", 0) + event["mem_retained"]
+                sites = row.setdefault("mem_sites", {})
+                for site in event["mem_sites"]:
+                    sites[site["site"]] = sites.get(site["site"], 0) + site["bytes"]
+        for row in totals.values():
+            if "mem_sites" in row:
+                ranked = sorted(row["mem_sites"].items(), key=lambda item: item[1], reverse=True)
+                row["mem_sites"] = [{"site": site, "bytes": size} for site, size in ranked[:MEM_TOP_SITES]]
+        return totals
+
+
+_active = Profiler()
+
+
+def stage(name: str, page: Optional[str] = None) -> Any:
+    """Time one stage of the current run (a no-op unless profiling is on)."""
+    return _active.stage(name, page)
+
+
+def note(**counters: int) -> None:
+    """Add counters to the innermost open stage (e.g. blocks= from inside a parser)."""
+    if _active.open_stages:
+        _active.open_stages[-1].note(**counters)
+
+
+def count(name: str, value: float = 1, **labels: str) -> None:
+    """Add to a run-level counter, e.g. count("merge_records", 3, outcome="inserted")."""
+    _active.count(name, value, **labels)
+
+
+def response_retries(response: Any) -> int:
+    """Retries urllib3 made before ``response`` (0 where the session has no Retry)."""
+    retries = getattr(getattr(response, "raw", None), "retries", None)
+    return len(getattr(retries, "history", None) or ())
+
+
+def env_enabled(name: str = ENV_VAR) -> bool:
+    return os.environ.get(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--profile", action="store_true",
+                        help=f"Record per-stage timings to timings/<output>.json (also {ENV_VAR}=1)")
+    parser.add_argument("--cprofile", default=None, metavar="PATH", help="Dump cProfile stats for the whole run to PATH")
+    parser.add_argument("--rule-stats", action="store_true",
+                        help="Count tries, hits and time per parser regex rule (rule_stats.py) into the timings file")
+    parser.add_argument("--memprofile", action="store_true",
+                        help=f"Trace memory per stage with tracemalloc into the timings file (also {MEM_ENV_VAR}=1)")
+    parser.add_argument("--metrics-dir", default=None,
+                        help=f"Directory for the OpenMetrics textfile (default: ${scrape_metrics.ENV_VAR} or "
+                             f"{scrape_metrics.DEFAULT_DIR})")
+
+
+def timings_path(out_path: str) -> str:
+    stem = os.path.splitext(os.path.basename(out_path))[0]
+    return os.path.join(os.path.dirname(out_path), TIMINGS_DIR, f"{stem}.json")
+
+
+def current_page() -> str:
+    """The page of the innermost open stage that has one."""
+    for open_stage in reversed(_active.open_stages):
+        page = open_stage._event["page"]
+        if page:
+            return page
+    return ""
+
+
+def write_timings(path: str, profiler: Profiler, started_at: str, wall_s: float, cpu_s: float,
+                  rules: Optional[List[Dict[str, Any]]] = None) -> None:
+    parent = os.path.dirname(path)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+    timings: Dict[str, Any] = {
+        "script": profiler.script,
+        "argv": sys.argv[1:],
+        "started_at": started_at,
+        "wall_s": round(wall_s, 6),
+        "cpu_s": round(cpu_s, 6),
+    }
+    if profiler.memory:
+        timings["mem_peak"] = profiler.memory.peak
+    timings["stages"] = profiler.totals()
+    timings["events"] = profiler.events
+    if rules is not None:
+        timings["rules"] = rules
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(timings, handle, indent=2)
+        handle.write("\n")
+
+
+def _mib(size: int) -> str:
+    return f"{size / (1024 * 1024):.1f} MiB"
+
+
+def print_totals(totals: Dict[str, Dict[str, Any]], wall_s: float, tag: str = "profile") -> None:
+    for name, row in totals.items():
+        parts = [f"{counter}={row[counter]:,}" for counter in COUNTERS if counter in row]
+        if row["errors"]:
+            parts.append(f"errors={row['errors']}")
+        if "mem_peak" in row:
+            parts.append(f"peak={_mib(row['mem_peak'])} retained={_mib(row['mem_retained'])}")
+        print(f"[{tag}] {name:14} x{row['calls']:<3} wall {row['wall_s']:8.3f}s cpu {row['cpu_s']:8.3f}s "
+              + " ".join(parts), flush=True)
+    print(f"[{tag}] total wall {wall_s:.3f}s", flush=True)
+
+
+def print_sites(totals: Dict[str, Dict[str, Any]], limit: int = 3, tag: str = "profile") -> None:
+    for name, row in totals.items():
+        for site in row.get("mem_sites", [])[:limit]:
+            print(f"[{tag}] {name:14} {_mib(site['bytes']):>10}  {site['site']}", flush=True)
+
+
+@contextlib.contextmanager
+def session(script: str, args: argparse.Namespace, out_path: str) -> Iterator[Profiler]:
+    """Record the enclosed run; writes its metrics (and timings/cProfile stats if asked) even if the run fails."""
+    global _active
+    memprofile = bool(getattr(args, "memprofile", False)) or env_enabled(MEM_ENV_VAR)
+    count_rules = bool(getattr(args, "rule_stats", False))
+    write_timings_file = bool(getattr(args, "profile", False)) or env_enabled() or memprofile or count_rules
+    cprofile_path = getattr(args, "cprofile", None)
+    profiler = Profiler(script, enabled=True, memory=_Memory() if memprofile else None)
+    previous = _active
+    _active = profiler
+
+    started = time.time()
+    started_at = datetime.fromtimestamp(started, timezone.utc).isoformat(timespec="seconds")
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    code_profile = cProfile.Profile() if cprofile_path else None
+    rules: Any = None
+    restore_rules = None
+    if count_rules:
+        import rule_stats
+
+        rules = rule_stats.RuleStats(page=current_page)
+        restore_rules = rule_stats.instrument(sys.modules["__main__"], rules, script)
+    if profiler.memory:
+        profiler.memory.start()
+    if code_profile:
+        code_profile.enable()
+    ok = False
+    try:
+        yield profiler
+        ok = True
+    except SystemExit as exc:
+        ok = not exc.code
+        raise
+    finally:
+        if code_profile:
+            code_profile.disable()
+        if profiler.memory:
+            profiler.memory.peak = max(profiler.memory.peak, tracemalloc.get_traced_memory()[1])
+            profiler.memory.stop()
+        if restore_rules:
+            restore_rules()
+        _active = previous
+        wall_s = time.perf_counter() - wall
+        cpu_s = time.process_time() - cpu
+        metrics_path = scrape_metrics.write_textfile(
+            scrape_metrics.textfile_path(script, getattr(args, "metrics_dir", None)),
+            profiler, ok=ok, started=started, wall_s=wall_s, cpu_s=cpu_s,
+        )
+        print(f"[profile] metrics -> {metrics_path}", flush=True)
+        if write_timings_file:
+            path = timings_path(out_path)
+            write_timings(path, profiler, started_at, wall_s, cpu_s, rules.table(by_page=True) if rules else None)
+            totals = profiler.totals()
+            print_totals(totals, wall_s)
+            if profiler.memory:
+                print_sites(totals)
+                print(f"[profile] traced memory peak {_mib(profiler.memory.peak)}", flush=True)
+            if rules:
+                rule_stats.print_table(rules.table(), top=RULES_SHOWN)
+            print(f"[profile] timings -> {path}", flush=True)
+        if code_profile and cprofile_path:
+            parent = os.path.dirname(cprofile_path)
+            if parent:
+                os.makedirs(parent, exist_ok=True)
+            code_profile.dump_stats(cprofile_path)
+            print(f"[profile] cProfile stats -> {cprofile_path}", flush=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("timings", help="A timings file written by --profile")
+    parser.add_argument("--events", action="store_true", help="Also list every stage/page event")
+    parser.add_argument("--sites", type=int, default=3, help="Top allocation sites to show per stage (default: 3)")
+    args = parser.parse_args()
+
+    with open(args.timings, "r", encoding="utf-8") as handle:
+        timings = json.load(handle)
+    print(f"[profile] {timings['script']} started {timings['started_at']}", flush=True)
+    print_totals(timings["stages"], timings["wall_s"])
+    print_sites(timings["stages"], args.sites)
+    if "mem_peak" in timings:
+        print(f"[profile] traced memory peak {_mib(timings['mem_peak'])}", flush=True)
+    if args.events:
+        for event in timings["events"]:
+            counters = " ".join(f"{counter}={event[counter]:,}" for counter in COUNTERS if counter in event)
+            print(f"  {event['stage']:14} {str(event.get('page') or '-'):40} {event['wall_s']:8.3f}s {counters}"
+                  + (f" error={event['error']}" if "error" in event else ""))
+
+
+if __name__ == "__main__":
+    main()
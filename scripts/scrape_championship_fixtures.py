@@ -15,6 +15,10 @@ Result pages:
 Output:
   <outdir>/hurling_2026.json   (default: data/hurling_2026.json)
 
+Partial refresh (partial_refresh.py): --only junior-results or
+--competition "Junior C Hurling Championship" fetches just those pages and
+patches the existing output; the guard below then covers those grades only.
+
 The output schema matches the championship JSON already used by the frontend:
   {"updated": "...", "matches": [...]}
 
@@ -29,19 +33,31 @@ Safety:
 from __future__ import annotations
 
 import argparse
-import json
 import os
 import re
 import sys
 from dataclasses import dataclass, replace
 from datetime import date, datetime, timezone
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
 import requests
 from bs4 import BeautifulSoup
-from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+import data_delta
+import data_reader
+import data_writer
+import line_guard
+import match_store
+import match_time
+import page_fetch
+import partial_refresh
+import rate_limit
+import run_checkpoint
+import run_profile
+import scrape_daemon
+import source_breaker
+
 
 SEASON = 2026
 BASE = "https://limerickgaa.ie"
@@ -69,6 +85,12 @@ EXPECTED_COMPETITIONS = {
 }
 
 
+def page_competitions(page_name: str) -> Set[str]:
+    """Grades listed on a fixtures/results page, by the tier it is named after ("senior fixtures")."""
+    tier = page_name.split()[0].capitalize()
+    return {competition for competition in EXPECTED_COMPETITIONS if tier in competition.split()}
+
+
 def norm(value: str) -> str:
     """Normalise heading text while retaining punctuation significant to team names."""
     return re.sub(r"\s+", " ", (value or "").replace("\xa0", " ")).strip().casefold()
@@ -152,7 +174,7 @@ V_RE = re.compile(r"^(?:V|VS)\.?$", re.IGNORECASE)
 VENUE_RE = re.compile(r"^Venue\s*:\s*(.*)$", re.IGNORECASE)
 REF_RE = re.compile(r"^Referee\s*:\s*(.*)$", re.IGNORECASE)
 SCORE_ONLY_RE = re.compile(r"^(\d+)\s*[-–]\s*(\d+)$")
-RESULT_TEAM_RE = re.compile(r"^(?P<team>.+?)\s+(?P<goals>\d+)\s*[-–]\s*(?P<points>\d+)$")
+RESULT_TEAM_RE = re.compile(r"^(?P<team>.*?\S)\s+(?P<goals>\d+)\s*[-–]\s*(?P<points>\d+)$")
 WO_RE = re.compile(r"^(?:W/O|Walkover)$", re.IGNORECASE)
 BYE_RE = re.compile(r"^BYE$", re.IGNORECASE)
 
@@ -180,16 +202,19 @@ MONTHS = {
 
 SESSION = requests.Session()
 SESSION.headers.update({"User-Agent": "Mozilla/5.0 (compatible; LimerickGAAHub-Championship/2.0)"})
+# 429 is left to rate_limit.Adapter, which pauses the whole host for its Retry-After;
+# urllib3 would otherwise retry any response carrying Retry-After itself.
 RETRY = Retry(
     total=4,
     connect=4,
     read=4,
     backoff_factor=1.5,
-    status_forcelist=(429, 500, 502, 503, 504),
+    status_forcelist=(500, 502, 503, 504),
     allowed_methods=frozenset({"GET"}),
+    respect_retry_after_header=False,
 )
-SESSION.mount("https://", HTTPAdapter(max_retries=RETRY))
-SESSION.mount("http://", HTTPAdapter(max_retries=RETRY))
+SESSION.mount("https://", rate_limit.Adapter(max_retries=RETRY))
+SESSION.mount("http://", rate_limit.Adapter(max_retries=RETRY))
 
 
 @dataclass(frozen=True)
@@ -215,6 +240,7 @@ class ChampionshipMatch:
             "round": self.round,
             "date": self.date,
             "time": self.time,
+            **match_time.kickoff_fields(self.date, self.time),
             "home": self.home,
             "away": self.away,
             "venue": self.venue,
@@ -246,38 +272,30 @@ def http_get(url: str, timeout: Tuple[int, int] = (15, 75)) -> requests.Response
 
 
 def get_page_html(page_url: str, slug: str) -> str:
-    """Prefer the WordPress REST content; fall back to the public HTML page."""
+    """Prefer the WordPress REST content; fall back to (or, with --hedge, race) the public HTML page."""
     rest_url = f"{BASE}/wp-json/wp/v2/pages"
-    try:
-        print(f"[championship] fetching REST page: {slug}", flush=True)
-        response = SESSION.get(
+
+    def rest() -> page_fetch.Body:
+        return page_fetch.rest_body(SESSION.get(
             rest_url,
             params={"slug": slug, "_fields": "content.rendered"},
             timeout=(15, 75),
-        )
-        response.raise_for_status()
-        payload = response.json()
-        if isinstance(payload, list) and payload:
-            rendered = payload[0].get("content", {}).get("rendered", "")
-            if isinstance(rendered, str) and rendered.strip():
-                return rendered
-        print(f"[championship] REST returned no rendered content for {slug}", flush=True)
-    except Exception as exc:
-        print(f"[championship] REST failed for {slug}: {exc}", flush=True)
+        ))
 
-    print(f"[championship] falling back to page HTML: {page_url}", flush=True)
-    return http_get(page_url).text
+    print(f"[championship] fetching REST page: {slug}", flush=True)
+    return page_fetch.get_page("championship", page_url, rest, lambda: page_fetch.html_body(http_get(page_url)))
 
 
 def normalize_lines(html: str) -> List[str]:
     """Convert WordPress content/page HTML to ordered text lines."""
-    soup = BeautifulSoup(html or "", "html.parser")
+    with run_profile.stage("normalize.soup"):
+        soup = BeautifulSoup(html or "", "html.parser")
     for tag in soup(["script", "style", "noscript", "svg"]):
         tag.decompose()
 
     main = soup.select_one("main") or soup.select_one("article") or soup
     raw = [clean_line(line) for line in main.get_text("\n").splitlines()]
-    raw = [line for line in raw if line]
+    raw = line_guard.clip_lines([line for line in raw if line], "championship")
 
     # WordPress often renders 30 + superscript "th" + July as three text lines.
     stitched: List[str] = []
@@ -541,6 +559,7 @@ def parse_match_block(
 def parse_page(lines: Sequence[str], mode: str, page_name: str) -> List[ChampionshipMatch]:
     """Parse one record from each explicitly recognised competition heading block."""
     heading_indexes = [index for index, line in enumerate(lines) if norm(line) in TARGET_HEADINGS]
+    run_profile.note(blocks=len(heading_indexes))
     matches: List[ChampionshipMatch] = []
 
     for position, start in enumerate(heading_indexes):
@@ -620,10 +639,8 @@ def load_baseline(path: Optional[str]) -> List[Dict[str, Any]]:
     if not path or not os.path.isfile(path):
         return []
     try:
-        with open(path, "r", encoding="utf-8") as handle:
-            payload = json.load(handle)
-        matches = payload.get("matches", [])
-        return matches if isinstance(matches, list) else []
+        # The guard only counts matches per competition; project just that field.
+        return list(data_reader.scan([path], fields=("competition",)))
     except (OSError, ValueError, TypeError) as exc:
         print(f"[championship] baseline ignored ({path}): {exc}", flush=True)
         return []
@@ -634,12 +651,19 @@ def validate_scrape(
     merged: Sequence[ChampionshipMatch],
     baseline_path: Optional[str],
     guard_enabled: bool,
+    expected: Set[str] = EXPECTED_COMPETITIONS,
+    guarded: Optional[Set[str]] = None,
 ) -> None:
-    if not fixtures:
+    """
+    Structural checks, then the drop guard against the baseline. A partial
+    refresh passes the grades whose fixtures it refetched as ``expected``
+    and the grades it touched as ``guarded``; other grades are not checked.
+    """
+    if expected and not fixtures:
         raise RuntimeError("No 2026 championship fixtures were parsed")
 
     fixture_counts = competition_counts(fixtures)
-    missing = sorted(EXPECTED_COMPETITIONS - set(fixture_counts))
+    missing = sorted(expected - set(fixture_counts))
     if missing:
         raise RuntimeError(
             "Expected championship grades were not found: " + ", ".join(missing)
@@ -673,6 +697,8 @@ def validate_scrape(
 
     new_counts = competition_counts(merged)
     for comp, old_count in old_counts.items():
+        if guarded is not None and comp not in guarded:
+            continue
         new_count = new_counts.get(comp, 0)
         if old_count >= 6 and new_count < int(old_count * 0.50):
             raise RuntimeError(
@@ -680,21 +706,38 @@ def validate_scrape(
             )
 
 
-def write_json(out_path: str, matches: Sequence[ChampionshipMatch]) -> None:
-    parent = os.path.dirname(out_path)
-    if parent:
-        os.makedirs(parent, exist_ok=True)
+# Stable record id for delta patches; the same fields as match_key.
+DELTA_KEY = ("competition", "group", "date", "home", "away")
+
 
-    payload = {
+def write_json(
+    out_path: str,
+    matches: Sequence[ChampionshipMatch],
+    delta_dir: Optional[str] = None,
+    previous_path: Optional[str] = None,
+    store_path: Optional[str] = None,
+) -> bool:
+    """Write the payload; returns False when only the timestamp would have changed."""
+    # Records are encoded one at a time by the writer (the delta feed diffs them
+    # as they pass) unless the store needs the whole list.
+    records: Iterable[Dict[str, Any]] = (match.to_dict() for match in matches)
+    if store_path:
+        records = list(records)
+
+    payload: Dict[str, Any] = {
         "updated": datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z"),
-        "matches": [match.to_dict() for match in matches],
+        "matches": records,
     }
+    if store_path:
+        payload = match_store.sync(store_path, f"hurling_{SEASON}", payload, "matches", DELTA_KEY)
+    source_breaker.mark_stale(payload)
+    trailer = None
+    if delta_dir:
+        payload, trailer = data_delta.publish_streamed(
+            delta_dir, f"hurling_{SEASON}", previous_path, payload, "matches", DELTA_KEY
+        )
 
-    temp_path = f"{out_path}.tmp"
-    with open(temp_path, "w", encoding="utf-8") as handle:
-        json.dump(payload, handle, ensure_ascii=False, indent=2)
-        handle.write("\n")
-    os.replace(temp_path, out_path)
+    return data_writer.write_payload(out_path, payload, previous_path=previous_path, trailer=trailer)
 
 
 def resolve_out_path(outdir: str, out: Optional[str]) -> str:
@@ -706,61 +749,136 @@ def resolve_out_path(outdir: str, out: Optional[str]) -> str:
     return os.path.join(outdir, f"hurling_{SEASON}.json")
 
 
-def main() -> None:
-    parser = argparse.ArgumentParser()
-    parser.add_argument("--outdir", default="data", help="Directory for hurling_2026.json")
-    parser.add_argument("--out", default=None, help="Full output path; overrides --outdir")
-    parser.add_argument(
-        "--baseline",
-        default=os.path.join("data", f"hurling_{SEASON}.json"),
-        help="Existing JSON used for drop protection (default: data/hurling_2026.json)",
-    )
-    parser.add_argument(
-        "--no-guard",
-        action="store_true",
-        help="Disable comparison with the existing JSON; structural validation still runs",
-    )
-    args = parser.parse_args()
+def scrape_page(page_name: str, url: str, slug: str, mode: str) -> Tuple[str, List[str], List[ChampionshipMatch]]:
+    html = get_page_html(url, slug)
+    with run_profile.stage("normalize", url) as timing:
+        lines = normalize_lines(html)
+        timing.note(lines=len(lines))
+    print(f"[championship] {page_name}: {len(lines)} text lines", flush=True)
+    with run_profile.stage("parse", url) as timing:
+        parsed = parse_page(lines, mode, page_name)
+        timing.note(lines=len(lines), records=len(parsed))
+    return html, lines, parsed
 
-    out_path = resolve_out_path(args.outdir, args.out)
+
+def run(args: argparse.Namespace, out_path: str) -> None:
+    page_fetch.configure("championship", args)
+    checkpoint = run_checkpoint.open_run("championship", args, ChampionshipMatch)
     all_fixtures: List[ChampionshipMatch] = []
     all_results: List[ChampionshipMatch] = []
+    selection = partial_refresh.select(
+        args, {partial_refresh.page_selector(url): page_competitions(name) for name, url, _ in PAGES}
+    )
 
-    for page_name, url, slug in PAGES:
+    # While a match awaits its result, its results page is fetched first (rate_limit.schedule()).
+    urgent = rate_limit.awaiting_results([out_path, args.baseline])
+    for page_name, url, slug in rate_limit.schedule(PAGES, lambda page: page[1], urgent):
+        if selection and not selection.wants(url):
+            continue
         mode = "results" if page_name.endswith("results") else "fixtures"
-        html = get_page_html(url, slug)
-        lines = normalize_lines(html)
-        print(f"[championship] {page_name}: {len(lines)} text lines", flush=True)
-        parsed = parse_page(lines, mode, page_name)
+        parsed = checkpoint.page(url, lambda: scrape_page(page_name, url, slug, mode))
+        if parsed is None:
+            continue
         if mode == "fixtures":
             all_fixtures.extend(parsed)
         else:
             all_results.extend(parsed)
+    try:
+        checkpoint.complete()
+    except RuntimeError as exc:
+        # Aborted like a failed validation, but the pages that did come in stay checkpointed for --resume.
+        print(f"[championship] ABORTED: {exc}", file=sys.stderr, flush=True)
+        raise SystemExit(2) from exc
 
     # De-duplicate inside each source class before merging results over fixtures.
-    fixtures = merge_matches(all_fixtures, [])
-    results = merge_matches([], all_results)
-    merged = merge_matches(fixtures, results)
+    with run_profile.stage("merge") as timing:
+        fixtures = merge_matches(all_fixtures, [])
+        results = merge_matches([], all_results)
+        base = fixtures
+        if selection:
+            fixtures = [match for match in fixtures if match.competition in selection.competitions]
+            results = [match for match in results if match.competition in selection.competitions]
+            existing = partial_refresh.load_existing(out_path, args.baseline, ChampionshipMatch)
+            kept, carried = partial_refresh.split_existing(existing, selection, lambda match: match.competition)
+            base = merge_matches(kept + fixtures, [])
+            results = merge_matches(carried, results)
+        merged = merge_matches(base, results)
+        timing.note(records=len(merged))
+    run_profile.count("merge_records", len(base) + len(results) - len(merged), outcome="matched_by_key")
+    run_profile.count("merge_records", len(merged) - len(base), outcome="inserted")
+    if selection:
+        print(f"[championship] partial refresh of {', '.join(sorted(selection.pages))}: "
+              f"{', '.join(sorted(selection.competitions))}", flush=True)
 
     print(f"[championship] fixture rows: {len(fixtures)}", flush=True)
     print(f"[championship] result rows: {len(results)}", flush=True)
     print(f"[championship] merged rows: {len(merged)}", flush=True)
     for competition, count in sorted(competition_counts(merged).items()):
         print(f"[championship]   {competition}: {count}", flush=True)
+        run_profile.count("competition_records", count, competition=competition)
 
     try:
-        validate_scrape(
-            fixtures=fixtures,
-            merged=merged,
-            baseline_path=args.baseline,
-            guard_enabled=not args.no_guard,
-        )
+        with run_profile.stage("validate"):
+            validate_scrape(
+                fixtures=fixtures,
+                merged=merged,
+                baseline_path=args.baseline,
+                guard_enabled=not args.no_guard,
+                expected=selection.fixture_competitions if selection else EXPECTED_COMPETITIONS,
+                guarded=selection.competitions if selection else None,
+            )
     except RuntimeError as exc:
         print(f"[championship] ABORTED: {exc}", file=sys.stderr, flush=True)
+        checkpoint.clear()
         raise SystemExit(2) from exc
 
-    write_json(out_path, merged)
-    print(f"[championship] wrote {len(merged)} matches -> {out_path}", flush=True)
+    with run_profile.stage("write", os.path.basename(out_path)) as timing:
+        written = write_json(out_path, merged, delta_dir=args.deltas, previous_path=args.baseline, store_path=args.store)
+        timing.note(records=len(merged))
+    checkpoint.finish()
+    if written:
+        print(f"[championship] wrote {len(merged)} matches -> {out_path}", flush=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--outdir", default="data", help="Directory for hurling_2026.json")
+    parser.add_argument("--out", default=None, help="Full output path; overrides --outdir")
+    parser.add_argument(
+        "--baseline",
+        default=os.path.join("data", f"hurling_{SEASON}.json"),
+        help="Existing JSON used for drop protection (default: data/hurling_2026.json)",
+    )
+    parser.add_argument(
+        "--no-guard",
+        action="store_true",
+        help="Disable comparison with the existing JSON; structural validation still runs",
+    )
+    parser.add_argument(
+        "--store",
+        default=None,
+        help="Experimental SQLite match store to upsert into; the JSON is then exported from it",
+    )
+    parser.add_argument(
+        "--deltas",
+        default=None,
+        help="Directory for delta patches against --baseline (e.g. data/deltas)",
+    )
+    partial_refresh.add_arguments(
+        parser, [partial_refresh.page_selector(url) for _, url, _ in PAGES], sorted(EXPECTED_COMPETITIONS)
+    )
+    page_fetch.add_arguments(parser)
+    run_checkpoint.add_arguments(parser)
+    run_profile.add_arguments(parser)
+    scrape_daemon.add_arguments(parser)
+    args = parser.parse_args()
+
+    out_path = resolve_out_path(args.outdir, args.out)
+    if args.daemon:
+        scrape_daemon.serve("championship", args, out_path, run)
+        return
+    with run_profile.session("championship", args, out_path):
+        run(args, out_path)
 
 
 if __name__ == "__main__":
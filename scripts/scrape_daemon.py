@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Long-running daemon mode for the scrapers.
+
+``--daemon`` keeps a scraper's process alive and re-runs it every --interval
+seconds, or at once when told to over its control socket. Between runs the
+process keeps:
+
+- the module's HTTP session (pooled TLS connections) with a caching adapter
+  that revalidates each page with its ETag/Last-Modified and serves a 304
+  from memory;
+- the normalised lines of every page, keyed by a digest of its HTML, so an
+  unchanged page skips BeautifulSoup and line normalisation;
+- a digest of the last merged records, so an unchanged scrape skips
+  write_json() (store sync, delta feed and JSON) entirely. The 2025 scraper
+  has no write_json(); data_writer already leaves its unchanged files alone.
+
+With --schedule the wait between runs follows poll_schedule.py instead:
+frequent polls after each throw-in plus match time, backing off once the
+result is in, one idle poll a day otherwise.
+
+Each cycle runs inside run_profile.session(), so the metrics textfile is
+refreshed every run. A failed cycle (network, validation abort) is logged
+and retried at the next interval.
+
+The control socket (a Unix socket, --control, default
+<tmp>/lgh-<scraper>.sock) takes one command per connection and answers
+with a JSON line:
+
+  python scripts/scrape_daemon.py status  --control /tmp/lgh-league.sock
+  python scripts/scrape_daemon.py refresh --control /tmp/lgh-league.sock
+  python scripts/scrape_daemon.py stop    --control /tmp/lgh-league.sock
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+import poll_schedule
+import rate_limit
+import run_profile
+
+DEFAULT_INTERVAL_S = 900.0
+COMMANDS = ("status", "refresh", "stop")
+SCRIPTS = ("championship", "league", "divisional", "limerickgaa")
+NORMALIZERS = ("normalize_lines", "flatten_to_lines")
+
+
+def default_control_path(script: str) -> str:
+    return os.path.join(tempfile.gettempdir(), f"lgh-{script}.sock")
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--daemon", action="store_true", help="Keep running: re-scrape every --interval seconds or on a trigger")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL_S,
+                        help=f"Seconds between daemon runs (default: {DEFAULT_INTERVAL_S:g})")
+    parser.add_argument("--schedule", action="store_true",
+                        help="Sleep until the next match-day poll (poll_schedule.py) instead of every --interval")
+    parser.add_argument("--control", default=None, help="Daemon control socket (default: <tmp>/lgh-<scraper>.sock)")
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+@dataclass
+class _Cached:
+    headers: Dict[str, str]
+    content: bytes
+    encoding: Optional[str]
+
+
+class CachingAdapter(rate_limit.Adapter):
+    """Revalidates cached GET responses with their validators; a 304 is answered from memory."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.entries: Dict[str, _Cached] = {}
+        self.revalidated = 0
+        self.fetched = 0
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        entry = self.entries.get(request.url or "") if request.method == "GET" else None
+        if entry:
+            if "ETag" in entry.headers:
+                request.headers["If-None-Match"] = entry.headers["ETag"]
+            if "Last-Modified" in entry.headers:
+                request.headers["If-Modified-Since"] = entry.headers["Last-Modified"]
+        response = super().send(request, **kwargs)
+
+        if entry and response.status_code == 304:
+            self.revalidated += 1
+            cached = requests.Response()
+            cached.status_code = 200
+            cached.reason = "OK (not modified)"
+            cached.headers = CaseInsensitiveDict(entry.headers)
+            cached._content = entry.content
+            cached.encoding = entry.encoding
+            cached.url = response.url
+            cached.request = request
+            cached.raw = response.raw  # keeps the retry history for run_profile
+            cached.connection = self
+            return cached
+
+        self.fetched += 1
+        if request.method == "GET" and response.status_code == 200 and (
+            "ETag" in response.headers or "Last-Modified" in response.headers
+        ):
+            self.entries[request.url or ""] = _Cached(dict(response.headers), response.content, response.encoding)
+        return response
+
+
+class LineCache:
+    """Memoises a normalise function by HTML digest; entries unused for a whole cycle are dropped."""
+
+    def __init__(self, normalize: Callable[[str], List[str]]) -> None:
+        self.normalize = normalize
+        self.entries: Dict[bytes, List[str]] = {}
+        self.used: set = set()
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, html: str) -> List[str]:
+        key = hashlib.blake2b((html or "").encode("utf-8"), digest_size=16).digest()
+        self.used.add(key)
+        lines = self.entries.get(key)
+        if lines is None:
+            self.misses += 1
+            lines = self.entries[key] = self.normalize(html)
+        else:
+            self.hits += 1
+        return list(lines)
+
+    def end_cycle(self) -> None:
+        self.entries = {key: lines for key, lines in self.entries.items() if key in self.used}
+        self.used = set()
+
+
+class ChangeGate:
+    """Wraps write_json(out_path, records, ...): records identical to the last write are not written again."""
+
+    def __init__(self, write: Callable[..., bool]) -> None:
+        self.write = write
+        self.digest: Optional[str] = None
+        self.skipped = 0
+
+    def __call__(self, out_path: str, records: List[Any], *args: Any, **kwargs: Any) -> bool:
+        encoded = json.dumps(
+            [record.to_dict() if hasattr(record, "to_dict") else record for record in records],
+            sort_keys=True, default=str,
+        )
+        digest = hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+        if digest == self.digest and os.path.isfile(out_path):
+            self.skipped += 1
+            print(f"[daemon] records unchanged since the last write; {out_path} left alone", flush=True)
+            return False
+        written = self.write(out_path, records, *args, **kwargs)
+        self.digest = digest
+        return written
+
+
+class Daemon:
+    def __init__(self, script: str, args: argparse.Namespace, out_path: str,
+                 run: Callable[[argparse.Namespace, str], None]) -> None:
+        self.script = script
+        self.args = args
+        self.out_path = out_path
+        self.run = run
+        self.module = sys.modules[run.__module__]
+        self.wake = threading.Event()
+        self.stopping = False
+        self.running = False
+        self.cycles = 0
+        self.failures = 0
+        self.started_at = _now()
+        self.last: Dict[str, Any] = {}
+        self.next_run = time.monotonic()
+        self.next_reason: Optional[str] = None
+        self.http: Optional[CachingAdapter] = None
+        self.lines: Optional[LineCache] = None
+        self.gate: Optional[ChangeGate] = None
+
+    def install_caches(self) -> None:
+        """Swap the scraper's session adapter, normaliser and writer for their caching versions."""
+        session = getattr(self.module, "SESSION", None)
+        if isinstance(session, requests.Session):
+            self.http = CachingAdapter(max_retries=getattr(self.module, "RETRY", 0))
+            session.mount("https://", self.http)
+            session.mount("http://", self.http)
+        for name in NORMALIZERS:
+            if callable(getattr(self.module, name, None)):
+                self.lines = LineCache(getattr(self.module, name))
+                setattr(self.module, name, self.lines)
+                break
+        if callable(getattr(self.module, "write_json", None)):
+            self.gate = ChangeGate(self.module.write_json)
+            self.module.write_json = self.gate
+
+    def cycle(self) -> None:
+        self.running = True
+        self.cycles += 1
+        started = time.perf_counter()
+        record: Dict[str, Any] = {"started_at": _now(), "ok": False}
+        skipped = self.gate.skipped if self.gate else 0
+        print(f"[daemon] {self.script}: run {self.cycles}", flush=True)
+        try:
+            with run_profile.session(self.script, self.args, self.out_path):
+                self.run(self.args, self.out_path)
+            record["ok"] = True
+        except SystemExit as exc:
+            record["ok"] = not exc.code
+            if exc.code:
+                record["error"] = f"exit {exc.code}"
+        except Exception as exc:  # keep serving; the next interval retries
+            record["error"] = f"{type(exc).__name__}: {exc}"
+        finally:
+            self.running = False
+            if self.lines:
+                self.lines.end_cycle()
+        if self.gate:
+            record["written"] = record["ok"] and self.gate.skipped == skipped
+        record["duration_s"] = round(time.perf_counter() - started, 3)
+        if not record["ok"]:
+            self.failures += 1
+            print(f"[daemon] {self.script}: run {self.cycles} failed: {record.get('error')}", flush=True)
+        self.last = record
+
+    def status(self) -> Dict[str, Any]:
+        status: Dict[str, Any] = {
+            "script": self.script,
+            "pid": os.getpid(),
+            "started_at": self.started_at,
+            "state": "running" if self.running else "idle",
+            "cycles": self.cycles,
+            "failures": self.failures,
+            "interval_s": self.args.interval,
+            "schedule": self.next_reason,
+            "next_run_in_s": max(0.0, round(self.next_run - time.monotonic(), 1)),
+            "last": self.last,
+        }
+        if self.http:
+            status["http_cache"] = {"entries": len(self.http.entries), "revalidated": self.http.revalidated,
+                                    "fetched": self.http.fetched}
+        if self.lines:
+            status["line_cache"] = {"entries": len(self.lines.entries), "hits": self.lines.hits,
+                                    "misses": self.lines.misses}
+        if self.gate:
+            status["unchanged_writes_skipped"] = self.gate.skipped
+        return status
+
+    def command(self, name: str) -> Dict[str, Any]:
+        if name == "status":
+            return self.status()
+        if name == "refresh":
+            self.next_run = time.monotonic()
+            self.wake.set()
+            return {"ok": True, "queued": "refresh", "running": self.running}
+        if name == "stop":
+            self.stop()
+            return {"ok": True, "stopping": True}
+        return {"ok": False, "error": f"unknown command {name!r}; expected one of {', '.join(COMMANDS)}"}
+
+    def stop(self, *_: Any) -> None:
+        self.stopping = True
+        self.wake.set()
+
+    def wait_s(self) -> float:
+        """Seconds to the next run: --interval, or the poll plan built from the file just written."""
+        if not getattr(self.args, "schedule", False):
+            return self.args.interval
+        now = int(time.time())
+        moment, reason = poll_schedule.next_poll(poll_schedule.load_windows([self.out_path]), now)
+        self.next_reason = reason
+        print(f"[daemon] {self.script}: next poll {poll_schedule.iso_minutes(moment)} ({reason})", flush=True)
+        return float(moment - now)
+
+    def serve_forever(self) -> None:
+        while not self.stopping:
+            self.cycle()
+            self.next_run = time.monotonic() + self.wait_s()
+            while not self.stopping and time.monotonic() < self.next_run:
+                self.wake.wait(timeout=max(0.0, self.next_run - time.monotonic()))
+                self.wake.clear()
+
+
+def _control_server(path: str, daemon: Daemon) -> socketserver.BaseServer:
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            name = self.rfile.readline(256).decode("utf-8", "replace").strip()
+            self.wfile.write((json.dumps(daemon.command(name)) + "\n").encode("utf-8"))
+
+    if os.path.exists(path):
+        os.unlink(path)  # a stale socket from a previous daemon
+    server = socketserver.ThreadingUnixStreamServer(path, Handler)
+    server.daemon_threads = True
+    os.chmod(path, 0o600)
+    return server
+
+
+def serve(script: str, args: argparse.Namespace, out_path: str, run: Callable[[argparse.Namespace, str], None]) -> None:
+    """Run ``run(args, out_path)`` as a daemon until stopped over the control socket or by a signal."""
+    daemon = Daemon(script, args, out_path, run)
+    daemon.install_caches()
+    control = args.control or default_control_path(script)
+    server = _control_server(control, daemon)
+    threading.Thread(target=server.serve_forever, name="control", daemon=True).start()
+    signal.signal(signal.SIGTERM, daemon.stop)
+    signal.signal(signal.SIGINT, daemon.stop)
+    cadence = "on the match-day poll plan" if getattr(args, "schedule", False) else f"every {args.interval:g}s"
+    print(f"[daemon] {script}: {cadence}, control socket {control}", flush=True)
+    try:
+        daemon.serve_forever()
+    finally:
+        server.shutdown()
+        server.server_close()
+        if os.path.exists(control):
+            os.unlink(control)
+        print(f"[daemon] {script}: stopped after {daemon.cycles} run(s)", flush=True)
+
+
+def send_command(path: str, name: str, timeout: float = 10.0) -> Tuple[bool, Dict[str, Any]]:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(path)
+        client.sendall(f"{name}\n".encode("utf-8"))
+        reply = client.makefile("r", encoding="utf-8").readline()
+    answer = json.loads(reply)
+    return bool(answer.get("ok", True)), answer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("command", choices=COMMANDS)
+    parser.add_argument("--control", default=None, help="Control socket path")
+    parser.add_argument("--script", choices=SCRIPTS, default="league",
+                        help="Scraper whose default socket to use (default: league)")
+    args = parser.parse_args()
+
+    path = args.control or default_control_path(args.script)
+    try:
+        ok, answer = send_command(path, args.command)
+    except OSError as exc:
+        print(f"[daemon] no daemon answering on {path}: {exc}", file=sys.stderr, flush=True)
+        raise SystemExit(1) from exc
+    print(json.dumps(answer, indent=2))
+    if not ok:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
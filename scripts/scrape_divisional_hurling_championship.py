@@ -7,23 +7,39 @@ but only keeps selected divisional championship competitions.
 
 Output:
   data/divisional_championship.json
+
+--only junior-results or --competition "City Junior A Hurling Championship"
+refetches just those pages and patches the existing output (partial_refresh.py).
 """
 
 from __future__ import annotations
 
 import argparse
-import json
 import os
 import re
+import sys
+from collections import Counter
 from dataclasses import dataclass
 from datetime import datetime, date, time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 import requests
-from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 
+import data_delta
+import data_writer
+import line_guard
+import match_store
+import match_time
+import page_fetch
+import partial_refresh
+import rate_limit
+import run_checkpoint
+import run_profile
+import scrape_daemon
+import source_breaker
+
 
 TZ = "Europe/Dublin"
 
@@ -156,16 +172,19 @@ COMP_BY_NAME = {c["name"].strip().lower(): c for c in TARGET_COMPETITIONS}
 
 
 SESSION = requests.Session()
+# 429 is left to rate_limit.Adapter, which pauses the whole host for its Retry-After;
+# urllib3 would otherwise retry any response carrying Retry-After itself.
 RETRY = Retry(
     total=4,
     connect=4,
     read=4,
     backoff_factor=2,
-    status_forcelist=[429, 500, 502, 503, 504],
+    status_forcelist=[500, 502, 503, 504],
     allowed_methods=["GET"],
+    respect_retry_after_header=False,
 )
-SESSION.mount("https://", HTTPAdapter(max_retries=RETRY))
-SESSION.mount("http://", HTTPAdapter(max_retries=RETRY))
+SESSION.mount("https://", rate_limit.Adapter(max_retries=RETRY))
+SESSION.mount("http://", rate_limit.Adapter(max_retries=RETRY))
 
 
 ROUND_RE = re.compile(r"^Round\s*(\d+)\s*$", re.IGNORECASE)
@@ -189,7 +208,7 @@ DATE_RE = re.compile(
 )
 
 SCORE_ONLY_RE = re.compile(r"^\s*(\d+)\s*-\s*(\d+)\s*$")
-RESULT_TEAM_RE = re.compile(r"^(?P<team>.+?)\s+(?P<g>\d+)\s*-\s*(?P<p>\d+)\s*$")
+RESULT_TEAM_RE = re.compile(r"^(?P<team>.*?\S)\s+(?P<g>\d+)\s*-\s*(?P<p>\d+)\s*$")
 WO_RE = re.compile(r"^(W\/O|Walkover)$", re.IGNORECASE)
 BYE_RE = re.compile(r"^BYE$", re.IGNORECASE)
 
@@ -236,6 +255,7 @@ class DivisionalFixture:
             "time_local": self.time_local,
             "tz": self.tz,
             "datetime_iso": self.datetime_iso,
+            **match_time.kickoff_fields(self.date, self.time_local),
             "home": self.home,
             "away": self.away,
             "venue": self.venue,
@@ -267,32 +287,26 @@ def wp_api_url_from_page_url(page_url: str) -> str:
 
 def get_page_html(page_url: str) -> str:
     """
-    Prefer WP REST content.rendered. Fall back to direct page HTML.
+    Prefer WP REST content.rendered. Fall back to direct page HTML (raced
+    against REST with --hedge; see page_fetch.py).
     """
     wp_api_url = wp_api_url_from_page_url(page_url)
-
-    try:
-        r = http_get(wp_api_url)
-        data = r.json()
-        if isinstance(data, list) and data:
-            rendered = data[0].get("content", {}).get("rendered")
-            if rendered and isinstance(rendered, str):
-                return rendered
-        print(f"[divisional] WP API returned no usable rendered content: {wp_api_url}")
-    except Exception as e:
-        print(f"[divisional] WP API fetch failed: {wp_api_url} :: {e}")
-
-    r = http_get(page_url)
-    return r.text
+    return page_fetch.get_page(
+        "divisional",
+        page_url,
+        lambda: page_fetch.rest_body(http_get(wp_api_url)),
+        lambda: page_fetch.html_body(http_get(page_url)),
+    )
 
 
 def normalize_lines(html: str) -> List[str]:
-    soup = BeautifulSoup(html, "html.parser")
+    with run_profile.stage("normalize.soup"):
+        soup = BeautifulSoup(html, "html.parser")
     main = soup.select_one("main") or soup.select_one("article") or soup
     text = main.get_text("\n")
 
     raw = [ln.strip() for ln in text.splitlines()]
-    raw = [ln for ln in raw if ln]
+    raw = line_guard.clip_lines([ln for ln in raw if ln], "divisional")
 
     stitched: List[str] = []
     i = 0
@@ -701,10 +715,12 @@ def parse_page(
     is_result_page: bool,
 ) -> List[DivisionalFixture]:
     fixtures: List[DivisionalFixture] = []
+    blocks = 0
     i = 0
 
     while i < len(lines):
         if parse_competition_heading(lines[i]):
+            blocks += 1
             fixture, next_i = parse_one_block(lines, i, source_url, is_result_page)
             if fixture:
                 fixtures.append(fixture)
@@ -712,6 +728,7 @@ def parse_page(
         else:
             i += 1
 
+    run_profile.note(blocks=blocks)
     return fixtures
 
 
@@ -773,6 +790,9 @@ def merge_fixtures_and_results(
     print(f"[divisional] results matched by key: {matched_key}")
     print(f"[divisional] results inserted directly: {inserted}")
     print(f"[divisional] unmatched/skipped: {skipped}")
+    for outcome, count in (("matched_by_id", matched_id), ("matched_by_key", matched_key),
+                           ("inserted", inserted), ("skipped", skipped)):
+        run_profile.count("merge_records", count, outcome=outcome)
 
     merged = list(by_id.values())
 
@@ -784,7 +804,7 @@ def merge_fixtures_and_results(
             deduped[k] = f
 
     merged = list(deduped.values())
-    merged.sort(key=lambda x: (x.date, x.grade, x.division, x.round, x.home, x.away))
+    merged.sort(key=lambda x: (x.date, x.grade, x.division, x.round, x.home, x.away, x.id))
     return merged
 
 
@@ -801,22 +821,54 @@ def unique_urls(key: str) -> List[str]:
     return urls
 
 
-def write_json(out_path: str, fixtures: List[DivisionalFixture]) -> None:
-    parent = os.path.dirname(out_path)
-    if parent:
-        os.makedirs(parent, exist_ok=True)
+def page_competitions() -> Dict[str, Set[str]]:
+    """Competitions listed on each fixtures/results page, by --only page name."""
+    pages: Dict[str, Set[str]] = {}
+    for cfg in TARGET_COMPETITIONS:
+        for key in ("fixtures_url", "results_url"):
+            pages.setdefault(partial_refresh.page_selector(cfg[key]), set()).add(cfg["name"])
+    return pages
 
-    payload = {
+
+def season_of(fixtures: List[DivisionalFixture]) -> int:
+    """Season year taken from the data itself, so reruns do not depend on the clock."""
+    years = [int(f.date[:4]) for f in fixtures if f.date]
+    return max(years) if years else datetime.now().year
+
+
+def write_json(
+    out_path: str,
+    fixtures: List[DivisionalFixture],
+    delta_dir: Optional[str] = None,
+    previous_path: Optional[str] = None,
+    store_path: Optional[str] = None,
+) -> bool:
+    """Write the payload; returns False when only updated_at would have changed."""
+    # Records are encoded one at a time by the writer (the delta feed diffs them
+    # as they pass) unless the store needs the whole list.
+    records: Iterable[Dict[str, Any]] = (f.to_dict() for f in fixtures)
+    if store_path:
+        records = list(records)
+
+    payload: Dict[str, Any] = {
         "competition": "Divisional Hurling Championships",
         "section": "Championship",
         "subsection": "Divisional",
-        "season": datetime.now().year,
+        "season": season_of(fixtures),
         "updated_at": datetime.now().isoformat(timespec="seconds"),
-        "fixtures": [f.to_dict() for f in fixtures],
+        "fixtures": records,
     }
 
-    with open(out_path, "w", encoding="utf-8") as fp:
-        json.dump(payload, fp, ensure_ascii=False, indent=2)
+    if store_path:
+        payload = match_store.sync(store_path, "divisional_championship", payload, "fixtures", ("id",))
+    source_breaker.mark_stale(payload)
+    trailer = None
+    if delta_dir:
+        payload, trailer = data_delta.publish_streamed(
+            delta_dir, "divisional_championship", previous_path, payload, "fixtures", ("id",)
+        )
+
+    return data_writer.write_payload(out_path, payload, previous_path=previous_path, trailer=trailer)
 
 
 def resolve_out_path(args_outdir: str, args_out: Optional[str]) -> str:
@@ -834,35 +886,80 @@ def main() -> None:
     ap = argparse.ArgumentParser()
     ap.add_argument("--outdir", default="data")
     ap.add_argument("--out", default=None)
+    ap.add_argument(
+        "--baseline",
+        default=os.path.join("data", "divisional_championship.json"),
+        help="Previous snapshot that delta patches are computed against",
+    )
+    ap.add_argument("--store", default=None, help="Experimental SQLite match store to upsert into; the JSON is exported from it")
+    ap.add_argument("--deltas", default=None, help="Directory for delta patches (e.g. data/deltas)")
     ap.add_argument(
         "--skip-results",
         action="store_true",
         help="Only scrape fixtures. Useful before results pages are populated.",
     )
+    partial_refresh.add_arguments(ap, list(page_competitions()), [cfg["name"] for cfg in TARGET_COMPETITIONS])
+    page_fetch.add_arguments(ap)
+    run_checkpoint.add_arguments(ap)
+    run_profile.add_arguments(ap)
+    scrape_daemon.add_arguments(ap)
     args = ap.parse_args()
 
     out_path = resolve_out_path(args.outdir, args.out)
+    if args.daemon:
+        scrape_daemon.serve("divisional", args, out_path, run)
+        return
+    with run_profile.session("divisional", args, out_path):
+        run(args, out_path)
 
-    fixtures: List[DivisionalFixture] = []
-    results: List[DivisionalFixture] = []
 
-    for url in unique_urls("fixtures_url"):
-        html = get_page_html(url)
+def scrape_page(url: str, is_result_page: bool) -> Tuple[str, List[str], List[DivisionalFixture]]:
+    html = get_page_html(url)
+    with run_profile.stage("normalize", url) as timing:
         lines = normalize_lines(html)
-        parsed = parse_page(lines, source_url=url, is_result_page=False)
-        print(f"[divisional] fixtures parsed from {url}: {len(parsed)}")
-        fixtures.extend(parsed)
+        timing.note(lines=len(lines))
+    with run_profile.stage("parse", url) as timing:
+        parsed = parse_page(lines, source_url=url, is_result_page=is_result_page)
+        timing.note(lines=len(lines), records=len(parsed))
+    return html, lines, parsed
+
+
+def run(args: argparse.Namespace, out_path: str) -> None:
+    page_fetch.configure("divisional", args)
+    checkpoint = run_checkpoint.open_run("divisional", args, DivisionalFixture)
+    fixtures: List[DivisionalFixture] = []
+    results: List[DivisionalFixture] = []
+    # --only/--competition: refetch some pages or competitions and patch the existing output.
+    selection = partial_refresh.select(args, page_competitions())
 
+    pages = [(url, False) for url in unique_urls("fixtures_url")]
     if not args.skip_results:
-        for url in unique_urls("results_url"):
-            try:
-                html = get_page_html(url)
-                lines = normalize_lines(html)
-                parsed = parse_page(lines, source_url=url, is_result_page=True)
-                print(f"[divisional] results parsed from {url}: {len(parsed)}")
-                results.extend(parsed)
-            except Exception as e:
-                print(f"[divisional] result page skipped: {url} :: {e}")
+        pages += [(url, True) for url in unique_urls("results_url")]
+    # Results first while a match awaits its result (rate_limit.schedule()).
+    urgent = rate_limit.awaiting_results([out_path, args.baseline])
+    for url, is_result_page in rate_limit.schedule(pages, lambda page: page[0], urgent):
+        if selection and not selection.wants(url):
+            continue
+        if not is_result_page:
+            parsed = checkpoint.page(url, lambda: scrape_page(url, is_result_page=False))
+            if parsed is None:
+                continue
+            print(f"[divisional] fixtures parsed from {url}: {len(parsed)}")
+            fixtures.extend(parsed)
+            continue
+        # A results page that fails is skipped, as before; it is fetched again on --resume.
+        parsed = checkpoint.page(url, lambda: scrape_page(url, is_result_page=True), required=False)
+        if parsed is None:
+            print(f"[divisional] result page skipped: {url}")
+            continue
+        print(f"[divisional] results parsed from {url}: {len(parsed)}")
+        results.extend(parsed)
+    try:
+        checkpoint.complete()
+    except RuntimeError as exc:
+        # Aborted like a failed validation, but the pages that did come in stay checkpointed for --resume.
+        print(f"[divisional] ABORTED: {exc}", file=sys.stderr, flush=True)
+        raise SystemExit(2) from exc
 
     today = date.today()
     results = [
@@ -870,10 +967,36 @@ def main() -> None:
         if date.fromisoformat(r.date) <= today or r.status == "Walkover"
     ]
 
-    merged = merge_fixtures_and_results(fixtures, results)
-    write_json(out_path, merged)
-
-    print(f"[divisional] wrote {len(merged)} fixtures/results -> {out_path}")
+    existing: List[DivisionalFixture] = []
+    if selection:
+        fixtures = [f for f in fixtures if f.competition in selection.competitions]
+        results = [r for r in results if r.competition in selection.competitions]
+        existing = partial_refresh.load_existing(out_path, args.baseline, DivisionalFixture)
+        kept, carried = partial_refresh.split_existing(existing, selection, lambda f: f.competition)
+        print(f"[divisional] partial refresh of {', '.join(sorted(selection.pages))}: "
+              f"{len(selection.competitions)} competitions, {len(kept)} rows kept, {len(carried)} results carried")
+        fixtures, results = kept + fixtures, carried + results
+
+    with run_profile.stage("merge") as timing:
+        merged = merge_fixtures_and_results(fixtures, results)
+        timing.note(records=len(merged))
+
+    if selection:
+        try:
+            partial_refresh.check_drops(existing, merged, selection.competitions, lambda f: f.competition)
+        except RuntimeError as exc:
+            print(f"[divisional] ABORTED: {exc}", file=sys.stderr, flush=True)
+            checkpoint.clear()
+            raise SystemExit(2) from exc
+    for competition, count in sorted(Counter(f.competition for f in merged).items()):
+        run_profile.count("competition_records", count, competition=competition)
+
+    with run_profile.stage("write", os.path.basename(out_path)) as timing:
+        written = write_json(out_path, merged, delta_dir=args.deltas, previous_path=args.baseline, store_path=args.store)
+        timing.note(records=len(merged))
+    checkpoint.finish()
+    if written:
+        print(f"[divisional] wrote {len(merged)} fixtures/results -> {out_path}")
 
 
 if __name__ == "__main__":
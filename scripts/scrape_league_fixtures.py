@@ -7,24 +7,40 @@ Scrape County Hurling League Division 1-12 fixtures and results from:
 Outputs:
   <outdir>/league.json   (default: data/league.json)
 
+--only senior-results or --competition "Division 4" refetches just that page
+or division and patches the existing league.json (partial_refresh.py).
+
 This script is intentionally separate from any existing fixture/results scrapers.
 """
 
 from __future__ import annotations
 
 import argparse
-import json
 import os
 import re
+import sys
+from collections import Counter
 from dataclasses import dataclass
 from datetime import datetime, date, time
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Callable, Iterable, Tuple
 
 import requests
-from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 
+import data_delta
+import data_writer
+import line_guard
+import match_store
+import match_time
+import page_fetch
+import partial_refresh
+import rate_limit
+import run_checkpoint
+import run_profile
+import scrape_daemon
+import source_breaker
+
 
 FIXTURES_URL = "https://limerickgaa.ie/senior-hurling-fixtures/"
 RESULTS_URL = "https://limerickgaa.ie/senior-hurling-results/"
@@ -35,16 +51,19 @@ WP_API_RESULTS = "https://limerickgaa.ie/wp-json/wp/v2/pages?slug=senior-hurling
 TZ = "Europe/Dublin"
 
 SESSION = requests.Session()
+# 429 is left to rate_limit.Adapter, which pauses the whole host for its Retry-After;
+# urllib3 would otherwise retry any response carrying Retry-After itself.
 RETRY = Retry(
     total=4,
     connect=4,
     read=4,
     backoff_factor=2,
-    status_forcelist=[429, 500, 502, 503, 504],
+    status_forcelist=[500, 502, 503, 504],
     allowed_methods=["GET"],
+    respect_retry_after_header=False,
 )
-SESSION.mount("https://", HTTPAdapter(max_retries=RETRY))
-SESSION.mount("http://", HTTPAdapter(max_retries=RETRY))
+SESSION.mount("https://", rate_limit.Adapter(max_retries=RETRY))
+SESSION.mount("http://", rate_limit.Adapter(max_retries=RETRY))
 
 # Hard limit: County Hurling League Division 1..12 only
 DIV_RE = re.compile(
@@ -52,6 +71,7 @@ DIV_RE = re.compile(
     re.IGNORECASE
 )
 ALLOWED_DIVISIONS = {str(i) for i in range(1, 13)}
+DIVISION_GROUPS = {f"Division {i}" for i in range(1, 13)}
 
 ROUND_RE = re.compile(r"^Round\s*(\d+)\s*$", re.IGNORECASE)
 V_RE = re.compile(r"^V\s*$", re.IGNORECASE)
@@ -72,7 +92,7 @@ DATE_RE = re.compile(
 )
 
 SCORE_ONLY_RE = re.compile(r"^\s*(\d+)\s*-\s*(\d+)\s*$")
-RESULT_TEAM_RE = re.compile(r"^(?P<team>.+?)\s+(?P<g>\d+)\s*-\s*(?P<p>\d+)\s*$")
+RESULT_TEAM_RE = re.compile(r"^(?P<team>.*?\S)\s+(?P<g>\d+)\s*-\s*(?P<p>\d+)\s*$")
 WO_RE = re.compile(r"^(W\/O|Walkover)$", re.IGNORECASE)
 BYE_RE = re.compile(r"^BYE$", re.IGNORECASE)
 
@@ -109,6 +129,7 @@ class LeagueFixture:
             "time_local": self.time_local,
             "tz": self.tz,
             "datetime_iso": self.datetime_iso,
+            **match_time.kickoff_fields(self.date, self.time_local),
             "home": self.home,
             "away": self.away,
             "venue": self.venue,
@@ -135,22 +156,16 @@ def http_get(url: str, timeout: tuple[int, int] = (20, 90)) -> requests.Response
 
 def get_page_html(page_url: str, wp_api_slug_url: str) -> str:
     """
-    Prefer WP REST (stable, clean HTML in content.rendered). Fall back to direct fetch.
+    Prefer WP REST (stable, clean HTML in content.rendered). Fall back to direct fetch
+    (raced against REST with --hedge; see page_fetch.py).
     """
     try:
-        r = http_get(wp_api_slug_url)
-        data = r.json()
-        if isinstance(data, list) and data:
-            rendered = data[0].get("content", {}).get("rendered")
-            if rendered and isinstance(rendered, str):
-                return rendered
-        print(f"[league] WP API returned no usable rendered content: {wp_api_slug_url}")
-    except Exception as e:
-        print(f"[league] WP API fetch failed: {wp_api_slug_url} :: {e}")
-
-    try:
-        r = http_get(page_url)
-        return r.text
+        return page_fetch.get_page(
+            "league",
+            page_url,
+            lambda: page_fetch.rest_body(http_get(wp_api_slug_url)),
+            lambda: page_fetch.html_body(http_get(page_url)),
+        )
     except Exception as e:
         print(f"[league] Direct page fetch failed: {page_url} :: {e}")
         raise
@@ -162,13 +177,14 @@ def normalize_lines(html: str) -> List[str]:
     Also stitches split ordinal dates:
       "Saturday 23" + "rd" + "August, 2025" -> "Saturday 23^{rd} August, 2025"
     """
-    soup = BeautifulSoup(html, "html.parser")
+    with run_profile.stage("normalize.soup"):
+        soup = BeautifulSoup(html, "html.parser")
 
     main = soup.select_one("main") or soup.select_one("article") or soup
     text = main.get_text("\n")
 
     raw = [ln.strip() for ln in text.splitlines()]
-    raw = [ln for ln in raw if ln]
+    raw = line_guard.clip_lines([ln for ln in raw if ln], "league")
 
     stitched: List[str] = []
     i = 0
@@ -361,6 +377,7 @@ def row_priority(f: LeagueFixture) -> int:
 
 def parse_league(lines: List[str]) -> List[LeagueFixture]:
     fixtures: List[LeagueFixture] = []
+    blocks = 0
     i = 0
 
     while i < len(lines):
@@ -369,6 +386,7 @@ def parse_league(lines: List[str]) -> List[LeagueFixture]:
             i += 1
             continue
 
+        blocks += 1
         div_no = int(div)
         group = f"Division {div_no}"
         competition = "County Hurling League"
@@ -487,11 +505,13 @@ def parse_league(lines: List[str]) -> List[LeagueFixture]:
 
         i = max(i + 1, j)
 
+    run_profile.note(blocks=blocks)
     return fixtures
 
 
 def parse_league_results(lines: List[str]) -> List[LeagueFixture]:
     fixtures: List[LeagueFixture] = []
+    blocks = 0
     i = 0
 
     while i < len(lines):
@@ -500,6 +520,7 @@ def parse_league_results(lines: List[str]) -> List[LeagueFixture]:
             i += 1
             continue
 
+        blocks += 1
         div_no = int(div)
         group = f"Division {div_no}"
         competition = "County Hurling League"
@@ -671,6 +692,7 @@ def parse_league_results(lines: List[str]) -> List[LeagueFixture]:
 
         i = max(i + 1, j)
 
+    run_profile.note(blocks=blocks)
     return fixtures
 
 
@@ -738,6 +760,9 @@ def merge_fixtures_and_results(
     print(f"[league] results matched by key: {matched_key}")
     print(f"[league] results inserted directly: {inserted}")
     print(f"[league] unmatched/skipped: {skipped}")
+    for outcome, count in (("matched_by_id", matched_id), ("matched_by_key", matched_key),
+                           ("inserted", inserted), ("skipped", skipped)):
+        run_profile.count("merge_records", count, outcome=outcome)
 
     merged = list(by_id.values())
 
@@ -749,24 +774,47 @@ def merge_fixtures_and_results(
             deduped[k] = f
 
     merged = list(deduped.values())
-    merged.sort(key=lambda x: (x.date, x.group, x.round, x.home, x.away))
+    merged.sort(key=lambda x: (x.date, x.group, x.round, x.home, x.away, x.id))
     return merged
 
 
-def write_json(out_path: str, fixtures: List[LeagueFixture]) -> None:
-    parent = os.path.dirname(out_path)
-    if parent:
-        os.makedirs(parent, exist_ok=True)
+def season_of(fixtures: List[LeagueFixture]) -> int:
+    """Season year taken from the data itself, so reruns do not depend on the clock."""
+    years = [int(f.date[:4]) for f in fixtures if f.date]
+    return max(years) if years else datetime.now().year
+
 
-    payload = {
+def write_json(
+    out_path: str,
+    fixtures: List[LeagueFixture],
+    delta_dir: Optional[str] = None,
+    previous_path: Optional[str] = None,
+    store_path: Optional[str] = None,
+) -> bool:
+    """Write the payload; returns False when only updated_at would have changed."""
+    # Records are encoded one at a time by the writer (the delta feed diffs them
+    # as they pass) unless the store needs the whole list.
+    records: Iterable[Dict[str, Any]] = (f.to_dict() for f in fixtures)
+    if store_path:
+        records = list(records)
+
+    payload: Dict[str, Any] = {
         "competition": "County Hurling League",
-        "season": datetime.now().year,
+        "season": season_of(fixtures),
         "updated_at": datetime.now().isoformat(timespec="seconds"),
-        "fixtures": [f.to_dict() for f in fixtures],
+        "fixtures": records,
     }
 
-    with open(out_path, "w", encoding="utf-8") as fp:
-        json.dump(payload, fp, ensure_ascii=False, indent=2)
+    if store_path:
+        payload = match_store.sync(store_path, "league", payload, "fixtures", ("id",))
+    source_breaker.mark_stale(payload)
+    trailer = None
+    if delta_dir:
+        payload, trailer = data_delta.publish_streamed(
+            delta_dir, "league", previous_path, payload, "fixtures", ("id",)
+        )
+
+    return data_writer.write_payload(out_path, payload, previous_path=previous_path, trailer=trailer)
 
 
 def resolve_out_path(args_outdir: str, args_out: Optional[str]) -> str:
@@ -784,18 +832,70 @@ def main() -> None:
     ap = argparse.ArgumentParser()
     ap.add_argument("--outdir", default="data", help="Directory to write league.json into (default: data)")
     ap.add_argument("--out", default=None, help="Full output path. Overrides --outdir and LGH_LEAGUE_OUT.")
+    ap.add_argument(
+        "--baseline",
+        default=os.path.join("data", "league.json"),
+        help="Previous snapshot that delta patches are computed against (default: data/league.json)",
+    )
+    ap.add_argument("--store", default=None, help="Experimental SQLite match store to upsert into; the JSON is exported from it")
+    ap.add_argument("--deltas", default=None, help="Directory for delta patches (e.g. data/deltas)")
+    partial_refresh.add_arguments(
+        ap, [partial_refresh.page_selector(FIXTURES_URL), partial_refresh.page_selector(RESULTS_URL)], DIVISION_GROUPS
+    )
+    page_fetch.add_arguments(ap)
+    run_checkpoint.add_arguments(ap)
+    run_profile.add_arguments(ap)
+    scrape_daemon.add_arguments(ap)
     args = ap.parse_args()
 
     out_path = resolve_out_path(args.outdir, args.out)
-
-    fixtures_html = get_page_html(FIXTURES_URL, WP_API_FIXTURES)
-    results_html = get_page_html(RESULTS_URL, WP_API_RESULTS)
-
-    fixture_lines = normalize_lines(fixtures_html)
-    result_lines = normalize_lines(results_html)
-
-    fixtures = parse_league(fixture_lines)
-    results = parse_league_results(result_lines)
+    if args.daemon:
+        scrape_daemon.serve("league", args, out_path, run)
+        return
+    with run_profile.session("league", args, out_path):
+        run(args, out_path)
+
+
+def scrape_page(
+    url: str, wp_api_url: str, parse: Callable[[List[str]], List[LeagueFixture]]
+) -> Tuple[str, List[str], List[LeagueFixture]]:
+    html = get_page_html(url, wp_api_url)
+    with run_profile.stage("normalize", url) as timing:
+        lines = normalize_lines(html)
+        timing.note(lines=len(lines))
+    with run_profile.stage("parse", url) as timing:
+        parsed = parse(lines)
+        timing.note(lines=len(lines), records=len(parsed))
+    return html, lines, parsed
+
+
+def run(args: argparse.Namespace, out_path: str) -> None:
+    page_fetch.configure("league", args)
+    checkpoint = run_checkpoint.open_run("league", args, LeagueFixture)
+    # --only/--competition: refetch some pages or divisions and patch the existing output.
+    selection = partial_refresh.select(args, {
+        partial_refresh.page_selector(FIXTURES_URL): DIVISION_GROUPS,
+        partial_refresh.page_selector(RESULTS_URL): DIVISION_GROUPS,
+    })
+
+    pages = [
+        (FIXTURES_URL, WP_API_FIXTURES, parse_league),
+        (RESULTS_URL, WP_API_RESULTS, parse_league_results),
+    ]
+    scraped: Dict[str, List[LeagueFixture]] = {}
+    # Results first while a match awaits its result (rate_limit.schedule()).
+    urgent = rate_limit.awaiting_results([out_path, args.baseline])
+    for url, wp_api_url, parse in rate_limit.schedule(pages, lambda page: page[0], urgent):
+        if not selection or selection.wants(url):
+            scraped[url] = checkpoint.page(url, lambda: scrape_page(url, wp_api_url, parse)) or []
+    try:
+        checkpoint.complete()
+    except RuntimeError as exc:
+        # Aborted like a failed validation, but the pages that did come in stay checkpointed for --resume.
+        print(f"[league] ABORTED: {exc}", file=sys.stderr, flush=True)
+        raise SystemExit(2) from exc
+    fixtures = scraped.get(FIXTURES_URL, [])
+    results = scraped.get(RESULTS_URL, [])
 
     print(f"[league] fixture rows parsed: {len(fixtures)}")
     print(f"[league] raw result rows parsed: {len(results)}")
@@ -808,11 +908,38 @@ def main() -> None:
 
     print(f"[league] result rows after date/walkover filter: {len(results)}")
 
-    merged = merge_fixtures_and_results(fixtures, results)
-    merged = [f for f in merged if 1 <= int(f.group.split()[-1]) <= 12]
-
-    write_json(out_path, merged)
-    print(f"[league] wrote {len(merged)} merged fixtures/results -> {out_path}")
+    existing: List[LeagueFixture] = []
+    if selection:
+        fixtures = [f for f in fixtures if f.group in selection.competitions]
+        results = [r for r in results if r.group in selection.competitions]
+        existing = partial_refresh.load_existing(out_path, args.baseline, LeagueFixture)
+        kept, carried = partial_refresh.split_existing(existing, selection, lambda f: f.group)
+        print(f"[league] partial refresh of {', '.join(sorted(selection.pages))}: "
+              f"{len(selection.competitions)} divisions, {len(kept)} rows kept, {len(carried)} results carried")
+        fixtures, results = kept + fixtures, carried + results
+
+    with run_profile.stage("merge") as timing:
+        merged = merge_fixtures_and_results(fixtures, results)
+        merged = [f for f in merged if 1 <= int(f.group.split()[-1]) <= 12]
+        timing.note(records=len(merged))
+
+    if selection:
+        try:
+            partial_refresh.check_drops(existing, merged, selection.competitions, lambda f: f.group)
+        except RuntimeError as exc:
+            print(f"[league] ABORTED: {exc}", file=sys.stderr, flush=True)
+            checkpoint.clear()
+            raise SystemExit(2) from exc
+
+    for competition, count in sorted(Counter(f.competition for f in merged).items()):
+        run_profile.count("competition_records", count, competition=competition)
+
+    with run_profile.stage("write", os.path.basename(out_path)) as timing:
+        written = write_json(out_path, merged, delta_dir=args.deltas, previous_path=args.baseline, store_path=args.store)
+        timing.note(records=len(merged))
+    checkpoint.finish()
+    if written:
+        print(f"[league] wrote {len(merged)} merged fixtures/results -> {out_path}")
 
 
 if __name__ == "__main__":
@@ -25,7 +25,6 @@ Outputs (to --outdir, default "data"):
 
 import re
 import os
-import json
 import argparse
 from datetime import datetime, timezone
 from typing import List, Dict, Optional, Tuple
@@ -33,10 +32,26 @@ from typing import List, Dict, Optional, Tuple
 import requests
 from bs4 import BeautifulSoup
 
+import data_writer
+import line_guard
+import match_time
+import page_fetch
+import rate_limit
+import run_checkpoint
+import run_profile
+import scrape_daemon
+import source_breaker
+
 # ---------- Config ----------
 BASE = "https://limerickgaa.ie"
 HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; LimerickGAAHub/1.0)"}
 
+# Every request is paced per host (rate_limit.py).
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+SESSION.mount("https://", rate_limit.Adapter())
+SESSION.mount("http://", rate_limit.Adapter())
+
 URLS = {
     "SHC_FIX": f"{BASE}/senior-hurling-fixtures/",
     "SHC_RES": f"{BASE}/senior-hurling-results/",
@@ -100,10 +115,10 @@ STRICT_ALLOWED = {k: {norm(x) for x in v} for k, v in GROUPS_STRICT.items()}
 STRICT_ALL = set().union(*STRICT_ALLOWED.values())
 
 # ---------- Helpers (dates/times/regex) ----------
-ORD_RE = re.compile(r'(\d+)(?:\^\{)?(st|nd|rd|th)(?:\})?', re.I)
+ORD_RE = re.compile(r'(?<!\d)(\d+)(?:\^\{)?(st|nd|rd|th)(?:\})?', re.I)
 ORD_TOKEN_RE = re.compile(r'^\s*(?:\^\{\s*)?(st|nd|rd|th)(?:\s*\})?\s*$', re.I)
 SCORE_ONLY_RE = re.compile(r'^\s*(\d+)\s*-\s*(\d+)\s*$')
-RESULT_TEAM_RE = re.compile(r'^(?P<team>.+?)\s+(?P<g>\d+)\s*-\s*(?P<p>\d+)\s*$')
+RESULT_TEAM_RE = re.compile(r'^(?P<team>.*?\S)\s+(?P<g>\d+)\s*-\s*(?P<p>\d+)\s*$')
 TIME_RE = re.compile(r'\b(\d{1,2})(?:[:\.](\d{2}))?\s*(am|pm)?\b', re.I)
 SLUG_RE = re.compile(r'[^a-z0-9]+')
 WEEKDAYS = r"(Mon|Tue|Wed|Thu|Fri|Sat|Sun|Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday)"
@@ -190,20 +205,21 @@ def make_id(comp: str, date_iso: str, round_name: str, group_heading: str, home:
 # ---------- WordPress REST helpers ----------
 def wp_page_id_by_slug(slug: str) -> Optional[int]:
     url = f"{BASE}/wp-json/wp/v2/pages"
-    r = requests.get(url, params={"slug": slug, "_fields": "id"}, headers=HEADERS, timeout=30)
+    r = SESSION.get(url, params={"slug": slug, "_fields": "id"}, timeout=30)
     r.raise_for_status()
     arr = r.json()
     return arr[0]["id"] if arr else None
 
 def wp_get_page_html_by_id(page_id: int) -> str:
     url = f"{BASE}/wp-json/wp/v2/pages/{page_id}"
-    r = requests.get(url, params={"_fields": "content.rendered"}, headers=HEADERS, timeout=30)
+    r = SESSION.get(url, params={"_fields": "content.rendered"}, timeout=30)
     r.raise_for_status()
     j = r.json()
     return j.get("content", {}).get("rendered", "") or ""
 
 def flatten_to_lines(html: str) -> List[str]:
-    soup = BeautifulSoup(html or "", "html.parser")
+    with run_profile.stage("normalize.soup"):
+        soup = BeautifulSoup(html or "", "html.parser")
     lines: List[str] = []
     for el in soup.find_all(True, recursive=True):
         if el.name in {"script", "style", "noscript"}:
@@ -212,22 +228,29 @@ def flatten_to_lines(html: str) -> List[str]:
         if not txt:
             continue
         lines.extend([ln.strip() for ln in txt.split("\n") if ln.strip()])
-    return lines
+    return line_guard.clip_lines(lines, "limerickgaa")
+
+def slug_for_url(url: str) -> str:
+    for key, s in SLUGS.items():
+        if URLS.get(key) == url:
+            return s
+    return ""
 
 def lines_from_rest_or_html(url: str, slug_hint: str) -> List[str]:
-    html = ""
-    try:
-        if slug_hint:
-            pid = wp_page_id_by_slug(slug_hint)
-            if pid:
-                html = wp_get_page_html_by_id(pid)
-    except Exception:
-        html = ""
-    if not html:
-        r = requests.get(url, headers=HEADERS, timeout=30)
-        r.raise_for_status()
-        html = r.text
-    return flatten_to_lines(html)
+    def rest() -> page_fetch.Body:
+        pid = wp_page_id_by_slug(slug_hint)
+        rendered = wp_get_page_html_by_id(pid) if pid else ""
+        return page_fetch.Body(rendered or None, len(rendered.encode("utf-8")))
+
+    def page() -> page_fetch.Body:
+        return page_fetch.html_body(SESSION.get(url, timeout=30))
+
+    # REST, else the page HTML; raced with --hedge (page_fetch.py).
+    html = page_fetch.get_page("limerickgaa", url, rest if slug_hint else None, page)
+    with run_profile.stage("normalize", url) as timing:
+        lines = flatten_to_lines(html)
+        timing.note(lines=len(lines))
+    return lines
 
 # ---------- Parsing ----------
 def tidy_group_for_output(comp: str, raw_heading: str) -> str:
@@ -243,10 +266,11 @@ def tidy_group_for_output(comp: str, raw_heading: str) -> str:
         return f"Group {m.group(1)}"
     return raw_heading.strip() if raw_heading else ""
 
-def parse_blocks_from_page(url: str, comp_key: str, mode: str) -> List[Dict]:
+def parse_blocks_from_page(url: str, comp_key: str, mode: str, lines: Optional[List[str]] = None) -> List[Dict]:
     """
-    Fetch lines (REST-first), detect ONLY the exact group headings for the given
-    competition, and parse each block. While inside a block, we hard-stop when we hit:
+    Fetch lines (REST-first, or use pre-flattened ``lines``), detect ONLY the exact
+    group headings for the given competition, and parse each block. While inside
+    a block, we hard-stop when we hit:
       - any other known competition heading,
       - football sections,
       - generic section headers (fixtures/results/final/etc),
@@ -255,18 +279,14 @@ def parse_blocks_from_page(url: str, comp_key: str, mode: str) -> List[Dict]:
       - ALL-CAPS+digits code banners (e.g. SJBHCG1) — unless that token is explicitly
         whitelisted in GROUPS_STRICT (future-proof).
     """
-    # pick slug for REST
-    slug = ""
-    for key, s in SLUGS.items():
-        if URLS.get(key) == url:
-            slug = s
-            break
-
-    all_lines = lines_from_rest_or_html(url, slug)
+    if lines is None:
+        lines = lines_from_rest_or_html(url, slug_for_url(url))
+    all_lines = lines
 
     out: List[Dict] = []
     current_group_heading: Optional[str] = None
     bucket: List[str] = []
+    blocks = 0
 
     def flush_bucket():
         nonlocal bucket, current_group_heading, out
@@ -312,6 +332,7 @@ def parse_blocks_from_page(url: str, comp_key: str, mode: str) -> List[Dict]:
         if n in allowed_here:
             flush_bucket()
             current_group_heading = ln  # keep original case for provenance
+            blocks += 1
             continue
 
         # Otherwise, if currently in a bucket, accumulate content lines
@@ -319,6 +340,7 @@ def parse_blocks_from_page(url: str, comp_key: str, mode: str) -> List[Dict]:
             bucket.append(ln)
 
     flush_bucket()
+    run_profile.note(blocks=blocks)
     return out
 
 
@@ -455,6 +477,7 @@ def parse_group_lines(lines: List[str], mode: str, comp_key: str, group_heading:
             "time_local": time_local,
             "tz": "Europe/Dublin",
             "datetime_iso": dt_iso,
+            **match_time.kickoff_fields(date_iso, time_local),
             "home": c["team_a"],
             "away": c["team_b"],
             "venue": c["venue"] or "TBC",
@@ -497,7 +520,7 @@ def parse_group_lines(lines: List[str], mode: str, comp_key: str, group_heading:
             continue
 
         # Date
-        if (re.match(rf'^{WEEKDAYS}\s+\d{{1,2}}(?:\^\{{\s*(?:st|nd|rd|th)\s*\}}|st|nd|rd|th)?\s+\w+.*\d{{4}}$', s, flags=re.I)
+        if (re.match(rf'^{WEEKDAYS}\s+\d{{1,2}}(?:\^\{{\s*(?:st|nd|rd|th)\s*\}}|st|nd|rd|th)?\s+\w.*\d{{4}}$', s, flags=re.I)
             or re.match(r'^\d{1,2}\s+\w+\s+\d{4}$', s)):
             if cur["team_a"] and cur["team_b"] and cur["date_line"]:
                 cur = flush(cur)
@@ -610,6 +633,8 @@ def _prefer(a, b):
         elif k in ("home_goals","home_points","away_goals","away_points"):
             if av is None and bv is not None:
                 out[k] = bv
+    # Keep the precomputed kick-off in step with whichever time was kept.
+    out.update(match_time.kickoff_fields(out.get("date"), out.get("time_local")))
     return out
 
 def dedupe_merge(records):
@@ -623,7 +648,7 @@ def dedupe_merge(records):
     return list(merged.values())
 
 # ---------- Combined file ----------
-def write_combined_hurling(payloads: Dict[str, Dict], outdir: str):
+def write_combined_hurling(payloads: Dict[str, Dict], outdir: str, baseline_dir: Optional[str] = None):
     """
     Build hurling_2025.json in the app's expected format.
     De-duplicate across fixtures/results: prefer results; pass through status.
@@ -644,6 +669,7 @@ def write_combined_hurling(payloads: Dict[str, Dict], outdir: str):
                 "round": r.get("round") or "",
                 "date": r.get("date") or "",
                 "time": r.get("time_local") or "",
+                **match_time.kickoff_fields(r.get("date"), r.get("time_local")),
                 "home": r.get("home") or "",
                 "away": r.get("away") or "",
                 "venue": r.get("venue") or "",
@@ -662,6 +688,7 @@ def write_combined_hurling(payloads: Dict[str, Dict], outdir: str):
                 "round": r.get("round") or "",
                 "date": r.get("date") or "",
                 "time": r.get("time_local") or "",
+                **match_time.kickoff_fields(r.get("date"), r.get("time_local")),
                 "home": r.get("home") or "",
                 "away": r.get("away") or "",
                 "venue": r.get("venue") or "",
@@ -685,33 +712,54 @@ def write_combined_hurling(payloads: Dict[str, Dict], outdir: str):
     }
 
     out_path = os.path.join(outdir, "hurling_2025.json")
-    ensure_parent(out_path)
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(combined, f, ensure_ascii=False, indent=2)
+    previous = os.path.join(baseline_dir, "hurling_2025.json") if baseline_dir else None
+    data_writer.write_payload(out_path, source_breaker.mark_stale(combined), previous_path=previous)
 
 # ---------- Orchestration ----------
-def scrape_to(outdir: str = "data"):
+def _scrape_section(url: str, comp_key: str, mode: str) -> Tuple[str, List[str], List[Dict]]:
+    # (body, lines, records) for run_checkpoint; the body checkpointed is the flattened text.
+    lines = lines_from_rest_or_html(url, slug_for_url(url))
+    section = f"{comp_key} {mode}"
+    with run_profile.stage("parse", section) as timing:
+        parsed = parse_blocks_from_page(url, comp_key, mode, lines=lines)
+        timing.note(lines=len(lines), records=len(parsed))
+    with run_profile.stage("merge", section) as timing:
+        records = dedupe_merge(parsed)
+        timing.note(records=len(records))
+    run_profile.count("merge_records", len(parsed) - len(records), outcome="matched_by_key")
+    return "\n".join(lines), lines, records
+
+def scrape_to(outdir: str = "data", baseline_dir: Optional[str] = "data",
+              checkpoint: Optional[run_checkpoint.Checkpoint] = None):
+    if checkpoint is None:
+        checkpoint = run_checkpoint.Checkpoint("limerickgaa", run_checkpoint.run_dir("limerickgaa"))
+
+    def scrape_section(url: str, comp_key: str, mode: str) -> List[Dict]:
+        # Checkpointed per section; a failed one is reported by checkpoint.complete() below.
+        return checkpoint.page(f"{comp_key} {mode}", lambda: _scrape_section(url, comp_key, mode)) or []
+
     # Senior
-    shc_fix = dedupe_merge(parse_blocks_from_page(URLS["SHC_FIX"], "SHC", "fixtures"))
-    shc_res = dedupe_merge(parse_blocks_from_page(URLS["SHC_RES"], "SHC", "results"))
+    shc_fix = scrape_section(URLS["SHC_FIX"], "SHC", "fixtures")
+    shc_res = scrape_section(URLS["SHC_RES"], "SHC", "results")
 
     # Premier Intermediate (shared PI/I pages)
-    pih_fix = dedupe_merge(parse_blocks_from_page(URLS["PI_I_FIX"], "PIHC", "fixtures"))
-    pih_res = dedupe_merge(parse_blocks_from_page(URLS["PI_I_RES"], "PIHC", "results"))
+    pih_fix = scrape_section(URLS["PI_I_FIX"], "PIHC", "fixtures")
+    pih_res = scrape_section(URLS["PI_I_RES"], "PIHC", "results")
 
     # Intermediate (shared PI/I pages)
-    ihc_fix = dedupe_merge(parse_blocks_from_page(URLS["PI_I_FIX"], "IHC", "fixtures"))
-    ihc_res = dedupe_merge(parse_blocks_from_page(URLS["PI_I_RES"], "IHC", "results"))
+    ihc_fix = scrape_section(URLS["PI_I_FIX"], "IHC", "fixtures")
+    ihc_res = scrape_section(URLS["PI_I_RES"], "IHC", "results")
 
     # Juniors (junior pages)
-    pjahc_fix = dedupe_merge(parse_blocks_from_page(URLS["JNR_FIX"], "PJAHC", "fixtures"))
-    pjahc_res = dedupe_merge(parse_blocks_from_page(URLS["JNR_RES"], "PJAHC", "results"))
+    pjahc_fix = scrape_section(URLS["JNR_FIX"], "PJAHC", "fixtures")
+    pjahc_res = scrape_section(URLS["JNR_RES"], "PJAHC", "results")
 
-    jahc_fix  = dedupe_merge(parse_blocks_from_page(URLS["JNR_FIX"], "JAHC",  "fixtures"))
-    jahc_res  = dedupe_merge(parse_blocks_from_page(URLS["JNR_RES"], "JAHC",  "results"))
+    jahc_fix  = scrape_section(URLS["JNR_FIX"], "JAHC",  "fixtures")
+    jahc_res  = scrape_section(URLS["JNR_RES"], "JAHC",  "results")
 
-    jchc_fix  = dedupe_merge(parse_blocks_from_page(URLS["JNR_FIX"], "JCHC",  "fixtures"))
-    jchc_res  = dedupe_merge(parse_blocks_from_page(URLS["JNR_RES"], "JCHC",  "results"))
+    jchc_fix  = scrape_section(URLS["JNR_FIX"], "JCHC",  "fixtures")
+    jchc_res  = scrape_section(URLS["JNR_RES"], "JCHC",  "results")
+    checkpoint.complete()
 
     now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
@@ -742,22 +790,43 @@ def scrape_to(outdir: str = "data"):
         },
     }
 
-    # Write per-grade files
+    # Write per-grade files; unchanged grades keep their previous bytes
     for path, obj in payloads.items():
-        ensure_parent(path)
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(obj, f, ensure_ascii=False, indent=2)
+        previous = os.path.join(baseline_dir, os.path.basename(path)) if baseline_dir else None
+        records = len(obj["fixtures"]) + len(obj["results"])
+        with run_profile.stage("write", os.path.basename(path)) as timing:
+            data_writer.write_payload(path, source_breaker.mark_stale(obj), previous_path=previous)
+            timing.note(records=records)
+        run_profile.count("competition_records", records, competition=obj["competition"])
 
     # Write combined file for the existing frontend
-    write_combined_hurling({k: v for k, v in payloads.items()}, outdir)
+    with run_profile.stage("write", "hurling_2025.json"):
+        write_combined_hurling({k: v for k, v in payloads.items()}, outdir, baseline_dir)
 
+    checkpoint.finish()
     print("Done: wrote data files to", outdir)
 
+def run(args, out_path):
+    # Daemon/profiling entry point; outputs go to args.outdir (out_path names the combined file).
+    page_fetch.configure("limerickgaa", args)
+    scrape_to(args.outdir, args.baseline_dir, run_checkpoint.open_run("limerickgaa", args))
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--outdir", default="data", help="Output directory for JSON files (default: data)")
+    ap.add_argument("--baseline-dir", default="data",
+                    help="Previous snapshots; files whose data is unchanged keep their old bytes (default: data)")
+    page_fetch.add_arguments(ap)
+    run_checkpoint.add_arguments(ap)
+    run_profile.add_arguments(ap)
+    scrape_daemon.add_arguments(ap)
     args = ap.parse_args()
-    scrape_to(args.outdir)
+    out_path = os.path.join(args.outdir, "hurling_2025.json")
+    if args.daemon:
+        scrape_daemon.serve("limerickgaa", args, out_path, run)
+        return
+    with run_profile.session("limerickgaa", args, out_path):
+        run(args, out_path)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+OpenMetrics textfile export of scrape health and latency.
+
+run_profile.session() calls write_textfile() at the end of every scraper run,
+success or not. The file, metrics/<scraper>.prom, holds the run's stages
+as gauges (one file per scraper, replaced atomically each run, so the
+node_exporter textfile collector or any dashboard can scrape the directory):
+
+  lgh_scrape_success / _last_run_timestamp_seconds / _duration_seconds / _cpu_seconds
+  lgh_scrape_stage_duration_seconds{stage}
+  lgh_scrape_fetch_duration_seconds / _fetch_bytes / _fetch_retries /
+      _fetch_errors{page, method="rest"|"html"|"hedged"|"stale"}
+  lgh_scrape_html_fallback{page}           1 when the page came from the HTML fallback
+  lgh_scrape_page_lines / _page_blocks / _page_records{page}
+  lgh_scrape_write_duration_seconds / _written_records{file}
+  lgh_scrape_<counter>{...}                run_profile.count() counters, e.g.
+      merge_records{outcome}, competition_records{competition} and
+      fetch_hedge{page, winner}, stale_pages / stale_page_age_seconds{page},
+      breaker_trips{host}, resumed_pages{page}, fetch_coalesced{page, scope},
+      rate_limit_wait_seconds{host} and rate_limited{host}
+  lgh_scrape_memory_peak_bytes, lgh_scrape_stage_memory_peak_bytes /
+      _stage_memory_retained_bytes{stage}  with --memprofile only
+
+Every sample also carries scraper="<name>".
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+ENV_VAR = "LGH_METRICS_DIR"
+DEFAULT_DIR = "metrics"
+PREFIX = "lgh_scrape"
+
+COUNTER_HELP = {
+    "merge_records": "Result rows by merge outcome (matched_by_id, matched_by_key, inserted, skipped).",
+    "competition_records": "Records written per competition.",
+    "fetch_hedge": "Hedged fetches (--hedge) by page and the path whose body was used (rest, html).",
+    "stale_pages": "Pages served from the last-good cache because the site was failing.",
+    "stale_page_age_seconds": "Age of each stale page's cached copy.",
+    "breaker_trips": "Times the source site's circuit breaker opened during the run.",
+    "resumed_pages": "Pages taken from the previous attempt's checkpoint by --resume.",
+    "fetch_coalesced": "Page requests served by a fetch already in flight (scope: process or machine).",
+    "rate_limit_wait_seconds": "Seconds requests waited for the host's rate limiter.",
+    "rate_limited": "429 responses from the host, each pausing it for its Retry-After.",
+}
+
+Labels = Sequence[Tuple[str, str]]
+
+
+def textfile_path(script: str, metrics_dir: Optional[str] = None) -> str:
+    return os.path.join(metrics_dir or os.environ.get(ENV_VAR) or DEFAULT_DIR, f"{script}.prom")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    if float(value).is_integer():
+        return str(int(value))
+    return f"{value:.6f}".rstrip("0")
+
+
+class _Families:
+    """Metric families in first-use order, each with its HELP text and samples."""
+
+    def __init__(self, script: str) -> None:
+        self.script = script
+        self.families: Dict[str, Tuple[str, List[str]]] = {}
+
+    def add(self, name: str, help_text: str, value: float, labels: Labels = ()) -> None:
+        family = self.families.setdefault(f"{PREFIX}_{name}", (help_text, []))
+        pairs = [("scraper", self.script), *labels]
+        rendered = ",".join(f'{label}="{_escape(str(text))}"' for label, text in pairs)
+        family[1].append(f"{PREFIX}_{name}{{{rendered}}} {_number(value)}")
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for name, (help_text, samples) in self.families.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            lines.extend(samples)
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+def _page_sums(events: Sequence[Dict[str, Any]], stages: Sequence[str]) -> Dict[str, Dict[str, float]]:
+    sums: Dict[str, Dict[str, float]] = {}
+    for event in events:
+        if event["stage"] in stages:
+            row = sums.setdefault(event.get("page") or "", {})
+            for key in ("wall_s", "lines", "blocks", "records"):
+                row[key] = row.get(key, 0) + event.get(key, 0)
+    return sums
+
+
+def render(profiler: Any, ok: bool, started: float, wall_s: float, cpu_s: float) -> str:
+    """The OpenMetrics text for one run_profile.Profiler run."""
+    out = _Families(profiler.script)
+    out.add("success", "1 if the last run finished without error, else 0.", 1 if ok else 0)
+    out.add("last_run_timestamp_seconds", "Unix time the last run started.", round(started, 3))
+    out.add("duration_seconds", "Wall time of the last run.", wall_s)
+    out.add("cpu_seconds", "CPU time of the last run.", cpu_s)
+    totals = profiler.totals()
+    for stage, row in totals.items():
+        out.add("stage_duration_seconds", "Wall time per stage, summed over pages.", row["wall_s"], [("stage", stage)])
+    if profiler.memory:
+        out.add("memory_peak_bytes", "Highest traced Python memory during the run.", profiler.memory.peak)
+        for stage, row in totals.items():
+            out.add("stage_memory_peak_bytes", "Highest traced memory above the stage's start, over its pages.",
+                    row["mem_peak"], [("stage", stage)])
+            out.add("stage_memory_retained_bytes", "Traced memory a stage left allocated, summed over pages.",
+                    row["mem_retained"], [("stage", stage)])
+
+    fetches: Dict[Tuple[str, str], Dict[str, float]] = {}
+    fallback: Dict[str, int] = {}
+    for event in profiler.events:
+        if not event["stage"].startswith("fetch."):
+            continue
+        page, method = event.get("page") or "", event["stage"].split(".", 1)[1]
+        row = fetches.setdefault((page, method), {"wall_s": 0.0, "bytes": 0, "retries": 0, "errors": 0})
+        row["wall_s"] += event["wall_s"]
+        row["bytes"] += event.get("bytes", 0)
+        row["retries"] += event.get("retries", 0)
+        row["errors"] += 1 if "error" in event else 0
+        fallback[page] = max(fallback.get(page, 0), 1 if method == "html" else 0)
+    for (page, method), row in fetches.items():
+        labels = [("page", page), ("method", method)]
+        out.add("fetch_duration_seconds", "Fetch wall time per page and method.", row["wall_s"], labels)
+        out.add("fetch_bytes", "Response bytes per page and method.", row["bytes"], labels)
+        out.add("fetch_retries", "HTTP retries per page and method.", row["retries"], labels)
+        out.add("fetch_errors", "Failed fetches per page and method.", row["errors"], labels)
+    for page, used in fallback.items():
+        out.add("html_fallback", "1 if the page was fetched as HTML after the REST API failed.", used, [("page", page)])
+
+    for page, row in _page_sums(profiler.events, ("normalize",)).items():
+        out.add("page_lines", "Text lines per page after normalising.", row["lines"], [("page", page)])
+    for page, row in _page_sums(profiler.events, ("parse",)).items():
+        out.add("page_blocks", "Blocks (headings) parsed per page.", row["blocks"], [("page", page)])
+        out.add("page_records", "Records parsed per page.", row["records"], [("page", page)])
+    for page, row in _page_sums(profiler.events, ("write",)).items():
+        out.add("write_duration_seconds", "Wall time writing each output file.", row["wall_s"], [("file", page)])
+        out.add("written_records", "Records written to each output file.", row["records"], [("file", page)])
+
+    for (name, labels), value in profiler.counters.items():
+        out.add(name, COUNTER_HELP.get(name, name.replace("_", " ").capitalize() + "."), value, labels)
+    return out.render()
+
+
+def write_textfile(path: str, profiler: Any, ok: bool, started: float, wall_s: float, cpu_s: float) -> str:
+    """Write the run's metrics to ``path``, replacing it atomically so a collector never reads half a file."""
+    parent = os.path.dirname(path)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        handle.write(render(profiler, ok, started, wall_s, cpu_s))
+    os.replace(tmp_path, path)
+    return path
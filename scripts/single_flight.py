@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Single-flight page fetching: one origin request per page, however many ask.
+
+The senior pages are read by four scrapers, and on a match evening the
+daemon, a partial refresh and a workflow can all be at them at once.
+page_fetch.get_page() routes every fetch through do(), keyed by the page
+and the kind of fetch ("rest" when the caller reads the REST content, "html"
+when it parses the page itself, since the two bodies differ):
+
+- in this process, a request for a page that is already being fetched waits
+  for that fetch and shares its result (or its exception);
+- across processes on the machine, the fetch holds a lock file per key in
+  --flight-dir (default .cache/flight); the body it fetched is left next to
+  the lock, and a process that was waiting on the lock reads it instead of
+  fetching again. Only a fetch that finished after the waiter asked is
+  shared, so every request sees the page as it was when it asked;
+  --flight-window SECONDS also reuses a fetch up to that old (default 0).
+
+A waiter gives up after its timeout (the run's --deadline, else
+DEFAULT_WAIT_S) and fetches the page itself. Shared fetches are counted in
+the metrics as fetch_coalesced{page, scope="process"|"machine"}. The lock
+file needs fcntl; without it (Windows) only the in-process part applies.
+--no-single-flight turns it off.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import IO, Any, Callable, Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # not on Windows: in-process coalescing only
+    fcntl = None  # type: ignore[assignment]
+
+import run_profile
+
+DIR_ENV_VAR = "LGH_FLIGHT_DIR"
+DEFAULT_DIR = os.path.join(".cache", "flight")
+DEFAULT_WINDOW_S = 0.0
+DEFAULT_WAIT_S = 600.0
+POLL_S = 0.1
+
+_enabled = True
+_dir: Optional[str] = DEFAULT_DIR
+_window_s = DEFAULT_WINDOW_S
+_lock = threading.Lock()
+_in_flight: Dict[str, "Future[str]"] = {}
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--flight-dir", default=None,
+                        help=f"Lock files and shared bodies for single-flight fetching (default: {DEFAULT_DIR}, "
+                             f"or {DIR_ENV_VAR})")
+    parser.add_argument("--flight-window", type=float, default=DEFAULT_WINDOW_S,
+                        help="Also reuse a page another process fetched up to this many seconds before it was asked "
+                             f"for (default: {DEFAULT_WINDOW_S:g}, only a fetch in flight is shared)")
+    parser.add_argument("--no-single-flight", action="store_true",
+                        help="Fetch every page request from the site, even if another is in flight")
+
+
+def configure(args: argparse.Namespace) -> None:
+    global _enabled, _dir, _window_s
+    _enabled = not getattr(args, "no_single_flight", False)
+    _dir = getattr(args, "flight_dir", None) or os.environ.get(DIR_ENV_VAR) or DEFAULT_DIR
+    _window_s = getattr(args, "flight_window", DEFAULT_WINDOW_S)
+
+
+def _key(page_url: str, kind: str) -> str:
+    return f"{kind} {page_url}"
+
+
+def _path(key: str) -> str:
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=12).hexdigest()
+    return os.path.join(_dir or DEFAULT_DIR, digest)
+
+
+def _lock_file(handle: IO[str], timeout: float) -> bool:
+    """Take the exclusive lock on ``handle``, polling; False if ``timeout`` passed first."""
+    give_up = time.monotonic() + timeout
+    while True:
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            if time.monotonic() >= give_up:
+                return False
+            time.sleep(POLL_S)
+
+
+def _shared(path: str, key: str, since: float) -> Optional[Dict[str, Any]]:
+    """The shared fetch for ``key`` that finished at or after ``since``, if any."""
+    try:
+        with open(path + ".json", "r", encoding="utf-8") as handle:
+            entry = json.load(handle)
+    except (OSError, ValueError):
+        return None
+    if entry.get("key") != key or entry.get("fetched_at", 0) < since or not isinstance(entry.get("text"), str):
+        return None
+    return entry
+
+
+def _share(path: str, key: str, text: str) -> None:
+    tmp_path = f"{path}.json.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        json.dump({"key": key, "fetched_at": time.time(), "text": text}, handle, ensure_ascii=False)
+    os.replace(tmp_path, path + ".json")
+
+
+def _across_processes(tag: str, page_url: str, key: str, fetch: Callable[[], str], timeout: float) -> str:
+    if fcntl is None:
+        return fetch()
+    started = time.time()
+    path = _path(key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + ".lock", "a", encoding="utf-8") as handle:
+        locked = _lock_file(handle, timeout)
+        if not locked:
+            print(f"[{tag}] gave up waiting for another process's fetch after {timeout:g}s: {page_url}", flush=True)
+        try:
+            shared = _shared(path, key, started - _window_s)
+            if shared is not None:
+                print(f"[{tag}] sharing the fetch made {time.time() - shared['fetched_at']:.1f}s ago: {page_url}",
+                      flush=True)
+                run_profile.count("fetch_coalesced", 1, page=page_url, scope="machine")
+                return shared["text"]
+            text = fetch()
+            _share(path, key, text)
+            return text
+        finally:
+            if locked:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def do(tag: str, page_url: str, kind: str, fetch: Callable[[], str], timeout: Optional[float] = None) -> str:
+    """``fetch()`` for ``page_url``, unless a ``kind`` fetch of it is in flight here or on the machine.
+
+    ``kind`` is "rest" or "html": what the caller will parse the result as.
+    """
+    if not _enabled:
+        return fetch()
+    wait_s = DEFAULT_WAIT_S if timeout is None else timeout
+    key = _key(page_url, kind)
+    with _lock:
+        future = _in_flight.get(key)
+        leader = future is None
+        if future is None:
+            future = _in_flight[key] = Future()
+
+    if not leader:
+        print(f"[{tag}] joining the in-flight fetch of {page_url}", flush=True)
+        run_profile.count("fetch_coalesced", 1, page=page_url, scope="process")
+        try:
+            return future.result(timeout=wait_s)
+        except FutureTimeout:
+            print(f"[{tag}] gave up waiting for the in-flight fetch after {wait_s:g}s: {page_url}", flush=True)
+            return fetch()
+
+    try:
+        text = _across_processes(tag, page_url, key, fetch, wait_s)
+    except BaseException as exc:
+        future.set_exception(exc)
+        raise
+    else:
+        future.set_result(text)
+        return text
+    finally:
+        with _lock:
+            _in_flight.pop(key, None)
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Circuit breaker around limerickgaa.ie with a stale-while-revalidate page cache.
+
+When the site is degraded every page costs minutes of retries, and the
+workflows' outer loops rerun the whole scrape on top. page_fetch.get_page()
+goes through guarded() instead:
+
+- every page fetched is stored as the last good copy in the page cache
+  (--page-cache, default .cache/pages; one JSON file per page URL);
+- a page that cannot be fetched (REST and HTML both failed) counts as a
+  failure of the site; after --breaker-threshold consecutive failures the
+  breaker opens;
+- while open, nothing is requested from the site: pages are served from the
+  cache, logged as STALE with their age and counted in the metrics
+  (stale_pages / stale_page_age_seconds{page}); a page that was never
+  cached fails at once with SourceUnavailable instead of retrying;
+- after --breaker-cooldown seconds the next page is a probe: success closes
+  the breaker, failure opens it for another cooldown.
+
+A failed page is also served stale while the breaker is still closed, so a
+run whose other pages came through publishes what it has. The pages a run
+served stale are listed in its output (mark_stale(): a top-level
+"stale_pages" list of url, cached_at and age_seconds), and --stale-report
+turns that into workflow warnings and exit status 1, so a retry loop tries
+again instead of accepting them. The breaker state lives next to the cache
+(breaker.json, updated under a lock file), so it carries over between
+attempts of a workflow's retry loop and between scrapers of the same site,
+including ones running at the same time. --no-stale turns the whole thing
+off.
+
+  python scripts/source_breaker.py                 # breaker state and cached pages
+  python scripts/source_breaker.py --reset         # close the breaker
+  python scripts/source_breaker.py --stale-report data/league.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Type
+from urllib.parse import urlsplit
+
+try:
+    import fcntl
+except ImportError:  # not on Windows: concurrent scrapers may lose a failure count
+    fcntl = None  # type: ignore[assignment]
+
+import run_profile
+
+CACHE_ENV_VAR = "LGH_PAGE_CACHE"
+DEFAULT_CACHE_DIR = os.path.join(".cache", "pages")
+STATE_FILE = "breaker.json"
+DEFAULT_THRESHOLD = 3
+DEFAULT_COOLDOWN_S = 600.0
+
+CLOSED = "closed"
+OPEN = "open"
+
+
+class SourceUnavailable(RuntimeError):
+    """The breaker is open (or the fetch failed) and there is no cached copy of the page."""
+
+
+def _iso(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).isoformat(timespec="seconds")
+
+
+def _write_json(path: str, data: Dict[str, Any]) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        json.dump(data, handle, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+class PageCache:
+    """Last good body per page URL."""
+
+    def __init__(self, cache_dir: str) -> None:
+        self.cache_dir = cache_dir
+
+    def path(self, page_url: str) -> str:
+        digest = hashlib.blake2b(page_url.encode("utf-8"), digest_size=12).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json")
+
+    def get(self, page_url: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.path(page_url), "r", encoding="utf-8") as handle:
+                entry = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get("url") == page_url and isinstance(entry.get("text"), str) else None
+
+    def put(self, page_url: str, text: str) -> None:
+        _write_json(self.path(page_url), {"url": page_url, "fetched_at": time.time(), "text": text})
+
+
+class Breaker:
+    """Consecutive-failure breaker per site, persisted in ``state_path``."""
+
+    def __init__(self, state_path: str, threshold: int = DEFAULT_THRESHOLD, cooldown_s: float = DEFAULT_COOLDOWN_S) -> None:
+        self.state_path = state_path
+        self.threshold = threshold
+        self.cooldown_s = cooldown_s
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as handle:
+                state = json.load(handle)
+        except (OSError, ValueError):
+            return {}
+        return state if isinstance(state, dict) else {}
+
+    def site(self, host: str) -> Dict[str, Any]:
+        return self._load().get(host) or {"state": CLOSED, "failures": 0, "opened_at": None}
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the state file's lock, so concurrent scrapers' updates are not lost."""
+        if fcntl is None:
+            yield
+            return
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        with open(self.state_path + ".lock", "a", encoding="utf-8") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _save(self, host: str, site: Dict[str, Any]) -> None:
+        state = self._load()
+        state[host] = site
+        _write_json(self.state_path, state)
+
+    def allows(self, host: str) -> bool:
+        """False while open and cooling down; True when closed or due a probe."""
+        site = self.site(host)
+        return site["state"] != OPEN or time.time() - (site["opened_at"] or 0) >= self.cooldown_s
+
+    def succeeded(self, host: str) -> None:
+        with self._locked():
+            site = self.site(host)
+            if site["state"] == OPEN:
+                print(f"[breaker] {host}: probe succeeded; closed", flush=True)
+            if site["failures"] or site["state"] != CLOSED:
+                self._save(host, {"state": CLOSED, "failures": 0, "opened_at": None})
+
+    def failed(self, host: str) -> None:
+        with self._locked():
+            site = self.site(host)
+            site["failures"] += 1
+            if site["state"] == OPEN or site["failures"] >= self.threshold:
+                if site["state"] != OPEN:
+                    run_profile.count("breaker_trips", 1, host=host)
+                site["state"] = OPEN
+                site["opened_at"] = time.time()
+                print(f"[breaker] {host}: open after {site['failures']} consecutive failures; "
+                      f"next probe in {self.cooldown_s:g}s", flush=True)
+            self._save(host, site)
+
+
+_cache: Optional[PageCache] = None
+_breaker: Optional[Breaker] = None
+_served_stale: Dict[str, float] = {}  # page URL -> fetched_at of the copy served this run
+_stale_serves = 0  # every stale serve this run, including repeats of the same URL
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--page-cache", default=None,
+                        help=f"Last-good page cache and breaker state (default: {DEFAULT_CACHE_DIR}, or {CACHE_ENV_VAR})")
+    parser.add_argument("--breaker-threshold", type=int, default=DEFAULT_THRESHOLD,
+                        help=f"Consecutive page failures that open the breaker (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--breaker-cooldown", type=float, default=DEFAULT_COOLDOWN_S,
+                        help=f"Seconds the breaker stays open before a probe (default: {DEFAULT_COOLDOWN_S:g})")
+    parser.add_argument("--no-stale", action="store_true",
+                        help="No breaker and no stale pages: a failed page fails the run")
+
+
+def cache_dir(value: Optional[str] = None) -> str:
+    return value or os.environ.get(CACHE_ENV_VAR) or DEFAULT_CACHE_DIR
+
+
+def configure(args: argparse.Namespace) -> None:
+    global _cache, _breaker, _stale_serves
+    _served_stale.clear()
+    _stale_serves = 0
+    if getattr(args, "no_stale", False):
+        _cache = _breaker = None
+        return
+    directory = cache_dir(getattr(args, "page_cache", None))
+    _cache = PageCache(directory)
+    _breaker = Breaker(
+        os.path.join(directory, STATE_FILE),
+        threshold=getattr(args, "breaker_threshold", DEFAULT_THRESHOLD),
+        cooldown_s=getattr(args, "breaker_cooldown", DEFAULT_COOLDOWN_S),
+    )
+
+
+def _stale(tag: str, page_url: str, why: str) -> str:
+    global _stale_serves
+    entry = _cache.get(page_url) if _cache is not None else None
+    if entry is None:
+        raise SourceUnavailable(f"{why}; no cached copy of {page_url}")
+    age_s = max(0.0, time.time() - entry["fetched_at"])
+    print(f"[{tag}] STALE ({why}): serving {page_url} as cached at {_iso(entry['fetched_at'])} "
+          f"({age_s / 3600:.1f}h old)", flush=True)
+    with run_profile.stage("fetch.stale", page_url) as timing:
+        timing.note(bytes=len(entry["text"].encode("utf-8")))
+    run_profile.count("stale_pages", 1, page=page_url)
+    run_profile.count("stale_page_age_seconds", round(age_s), page=page_url)
+    _served_stale[page_url] = entry["fetched_at"]
+    _stale_serves += 1
+    return entry["text"]
+
+
+def stale_serves() -> int:
+    """How many times this run served a page from the cache so far.
+
+    Compare it before and after a fetch to tell whether that fetch was stale:
+    stale_pages() is per URL, so it does not grow when a page that several
+    sections share is served stale a second time.
+    """
+    return _stale_serves
+
+
+def stale_pages() -> List[Dict[str, Any]]:
+    """The pages this run served from the cache, with when they were cached."""
+    now = time.time()
+    return [
+        {"url": page_url, "cached_at": _iso(fetched_at), "age_seconds": round(max(0.0, now - fetched_at))}
+        for page_url, fetched_at in sorted(_served_stale.items())
+    ]
+
+
+def mark_stale(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Add this run's stale pages to an output payload (nothing when every page was fresh)."""
+    pages = stale_pages()
+    if pages:
+        payload["stale_pages"] = pages
+    return payload
+
+
+def stale_report(paths: Sequence[str]) -> int:
+    """Print the stale pages recorded in output files as workflow warnings; how many there were."""
+    found = 0
+    for path in paths:
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                pages = json.load(handle).get("stale_pages") or []
+        except (OSError, ValueError) as exc:
+            print(f"[breaker] cannot read {path}: {exc}", flush=True)
+            continue
+        for page in pages:
+            found += 1
+            print(f"::warning title=Stale page in {os.path.basename(path)}::{page['url']} is the copy cached at "
+                  f"{page['cached_at']} ({page['age_seconds'] / 3600:.1f}h old); limerickgaa.ie was failing", flush=True)
+    if not found:
+        print(f"[breaker] no stale pages in {', '.join(paths)}", flush=True)
+    return found
+
+
+def guarded(tag: str, page_url: str, fetch: Callable[[], str], passthrough: Tuple[Type[BaseException], ...] = ()) -> str:
+    """``fetch()`` behind the breaker, falling back to the cached copy; ``passthrough`` exceptions are re-raised untouched."""
+    if _breaker is None or _cache is None:
+        return fetch()
+    host = urlsplit(page_url).netloc
+    if not _breaker.allows(host):
+        return _stale(tag, page_url, "breaker open")
+    try:
+        text = fetch()
+    except passthrough:
+        raise
+    except Exception as exc:
+        print(f"[{tag}] fetch failed for {page_url}: {exc}", flush=True)
+        _breaker.failed(host)
+        return _stale(tag, page_url, f"fetch failed: {type(exc).__name__}")
+    _breaker.succeeded(host)
+    if text:
+        _cache.put(page_url, text)
+    return text
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--page-cache", default=None, help=f"Cache directory (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--reset", action="store_true", help="Close the breaker for every site")
+    parser.add_argument("--stale-report", nargs="+", metavar="JSON", default=None,
+                        help="Warn about stale pages recorded in these output files; exit 1 if there are any")
+    args = parser.parse_args()
+
+    if args.stale_report:
+        raise SystemExit(1 if stale_report(args.stale_report) else 0)
+
+    directory = cache_dir(args.page_cache)
+    breaker = Breaker(os.path.join(directory, STATE_FILE))
+    if args.reset and os.path.exists(breaker.state_path):
+        os.unlink(breaker.state_path)
+        print(f"[breaker] reset {breaker.state_path}", flush=True)
+    for host, site in sorted(breaker._load().items()):
+        opened = _iso(site["opened_at"]) if site.get("opened_at") else "-"
+        print(f"[breaker] {host}: {site['state']}, {site['failures']} consecutive failures, opened {opened}")
+    entries = []
+    if os.path.isdir(directory):
+        for name in sorted(os.listdir(directory)):
+            if name.endswith(".json") and name != STATE_FILE:
+                try:
+                    with open(os.path.join(directory, name), "r", encoding="utf-8") as handle:
+                        entries.append(json.load(handle))
+                except (OSError, ValueError):
+                    continue
+    print(f"[breaker] {len(entries)} cached pages in {directory}")
+    for entry in sorted(entries, key=lambda item: item.get("url", "")):
+        print(f"  {_iso(entry['fetched_at'])}  {len(entry['text']):>8} chars  {entry['url']}")
+
+
+if __name__ == "__main__":
+    main()
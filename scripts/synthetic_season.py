@@ -0,0 +1,526 @@
+#!/usr/bin/env python3
+"""
+Synthetic season generator for scale testing the parsers.
+
+The real pages only carry about nine championship grades and twelve league
+divisions, too few to see how the parse paths scale. generate() builds a
+season of any size (grades x groups x rounds, teams per group) and renders
+it the way limerickgaa.ie does:
+
+- one page per grade tier (senior/intermediate/junior) and mode, fixtures as a
+  WordPress pages API response, results as the public page (as in the 2026
+  page corpus);
+- championship, divisional and County Hurling League sections, every match
+  block headed by its competition;
+- split ordinals ("Saturday 23" / "rd" / "August, 2026") and plain dates, 24h
+  and am/pm times, inline and next-line Venue:/Referee:, inline and split
+  scores, W/O on the winning side and BYE rows (fixtures only) for odd-sized
+  groups.
+
+Headings come from the scrapers' own tables and are reused with fresh teams
+once a size outgrows the real set, so every generated block is one the
+parsers recognise. The expected records are emitted alongside; --check runs
+the parsers over the pages and compares. Referees are not compared: the
+parsers only read an inline "Referee:" value.
+
+Usage:
+  python scripts/synthetic_season.py --grades 12 --groups 4 --rounds 10 --check
+  python scripts/synthetic_season.py --rounds 40 --out /tmp/season   # page_corpus layout
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import html
+import io
+import json
+import os
+import random
+from collections import Counter
+from dataclasses import asdict, dataclass
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import page_corpus
+import scrape_championship_fixtures as championship
+import scrape_divisional_hurling_championship as divisional
+import scrape_league_fixtures as league
+
+FAMILIES = ("championship", "divisional", "league")
+TIERS = ("senior", "intermediate", "junior")
+MODES = ("fixtures", "results")
+
+CLUBS = (
+    "Adare", "Ahane", "Askeaton Ballysteen Kilcornan", "Athea", "Ballybricken Bohermore",
+    "Ballybrown", "Blackrock", "Bruff", "Bruree", "Caherline", "Cappamore",
+    "Castletown Ballyagran", "Claughaun", "Crecora Manister", "Croagh Kilfinny", "Croom",
+    "Doon", "Dromcollogher Broadford", "Dromin Athlacca", "Effin", "Fedamore",
+    "Feenagh Kilmeedy", "Feohanagh", "Garryspillane", "Glenroe", "Granagh Ballingarry",
+    "Hospital Herbertstown", "Kildimo Pallaskenry", "Killeedy", "Kilmallock",
+    "Kilteely Dromkeen", "Knockaderry", "Knockainey", "Monagea", "Monaleen",
+    "Mungret St Pauls", "Murroe Boher", "Na Piarsaigh", "Newcastle West", "Old Christians",
+    "Pallasgreen", "Patrickswell", "Rathkeale", "South Liberties", "St Kieran's",
+    "St Patrick's", "Staker Wallace", "Templeglantine", "Tournafulla",
+)
+VENUES = (
+    "TUS Gaelic Grounds", "Mick Neville Park", "Kilmallock", "Caherline", "Bruff",
+    "Fr. Hayes Memorial Park", "Knockaderry", "Cappamore", "Croom", "Feenagh", "TBC",
+)
+REFEREES = ("Johnny Murphy", "Alan Kelly", "Niall Burke", "David Copse", "Shane Hynes", "TBC")
+TIMES = ("19:00", "19:30", "20:00", "14:00", "15:30", "11:30")
+WEEKDAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+MONTH_NAMES = (
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+)
+
+# Rounds are spread over this many days from SEASON_START; the first half of
+# the rounds are played (results page), the rest are still to come.
+SEASON_START = (3, 7)
+SEASON_DAYS = 200
+WALKOVER_RATE = 0.05
+# Published championship and league fixtures always carry a throw-in time;
+# divisional ones are sometimes still to be confirmed.
+DIVISIONAL_NO_TIME_RATE = 0.2
+
+# Fields compared by --check, per family. The league and divisional parsers
+# also report which side was awarded a walkover.
+CHECK_FIELDS = {
+    "championship": ("time", "venue", "status", "home_goals", "home_points", "away_goals", "away_points"),
+    "divisional": ("time", "venue", "status", "home_goals", "home_points", "away_goals", "away_points",
+                   "walkover_winner"),
+    "league": ("time", "venue", "status", "home_goals", "home_points", "away_goals", "away_points",
+               "walkover_winner"),
+}
+
+
+@dataclass(frozen=True)
+class SeasonSpec:
+    grades: int = 3
+    groups: int = 2
+    rounds: int = 5
+    teams: int = 6
+    season: int = championship.SEASON
+    seed: int = 2026
+    families: Tuple[str, ...] = FAMILIES
+
+
+@dataclass(frozen=True)
+class Section:
+    family: str
+    tier: str
+    heading: str
+    competition: str
+    group: str
+
+
+def _tier(grade_name: str) -> str:
+    low = grade_name.casefold()
+    if "senior" in low:
+        return "senior"
+    if "intermediate" in low:
+        return "intermediate"
+    return "junior"
+
+
+def _championship_headings() -> List[List[Tuple[str, str, str]]]:
+    """(heading, competition, group) per competition, in table order, one heading per group."""
+    by_competition: Dict[str, Dict[str, str]] = {}
+    for heading, (competition, group) in championship._RAW_HEADING_ALIASES.items():
+        by_competition.setdefault(competition, {}).setdefault(group, heading)
+    return [
+        [(heading, competition, group) for group, heading in sorted(groups.items())]
+        for competition, groups in by_competition.items()
+    ]
+
+
+def sections_for(spec: SeasonSpec) -> List[Section]:
+    """grades x groups sections per family; headings repeat once the real set runs out."""
+    sections: List[Section] = []
+    if "championship" in spec.families:
+        pool = _championship_headings()
+        for grade in range(spec.grades):
+            headings = pool[grade % len(pool)]
+            for group in range(spec.groups):
+                heading, competition, group_name = headings[group % len(headings)]
+                sections.append(Section("championship", _tier(competition), heading, competition, group_name))
+    if "divisional" in spec.families:
+        configs = divisional.TARGET_COMPETITIONS
+        for index in range(spec.grades * spec.groups):
+            cfg = configs[index % len(configs)]
+            sections.append(Section("divisional", _tier(cfg["grade"]), cfg["name"], cfg["name"], cfg["division"]))
+    if "league" in spec.families:
+        divisions = sorted(league.ALLOWED_DIVISIONS, key=int)
+        for index in range(spec.grades * spec.groups):
+            division = divisions[index % len(divisions)]
+            # The league scraper only reads the senior pages.
+            sections.append(Section(
+                "league", "senior", f"County Hurling League Division {division}",
+                "County Hurling League", f"Division {division}",
+            ))
+    return sections
+
+
+def team_name(index: int) -> str:
+    """Distinct club-style names: the club list, then the same clubs' B, C, ... teams."""
+    club = CLUBS[index % len(CLUBS)]
+    wrap = index // len(CLUBS)
+    if not wrap:
+        return club
+    suffix = ""
+    while wrap:
+        wrap, letter = divmod(wrap - 1, 25)
+        suffix = chr(ord("B") + letter) + suffix
+    return f"{club} {suffix}"
+
+
+def pairings(teams: int, round_index: int) -> List[Tuple[Optional[int], Optional[int]]]:
+    """Circle-method round robin; None is the bye slot of an odd-sized group."""
+    slots: List[Optional[int]] = list(range(teams)) + ([None] if teams % 2 else [])
+    size = len(slots)
+    if size < 2:
+        return []
+    turn = round_index % (size - 1)
+    rest = slots[1:]
+    rotated = [slots[0]] + (rest[-turn:] + rest[:-turn] if turn else rest)
+    pairs = [(rotated[k], rotated[size - 1 - k]) for k in range(size // 2)]
+    if round_index % 2:
+        pairs = [(away, home) for home, away in pairs]
+    return pairs
+
+
+def round_date(spec: SeasonSpec, round_index: int) -> date:
+    start = date(spec.season, *SEASON_START)
+    return start + timedelta(days=(round_index * SEASON_DAYS) // max(spec.rounds - 1, 1))
+
+
+def _ordinal(day: int) -> str:
+    return "th" if 11 <= day % 100 <= 13 else {1: "st", 2: "nd", 3: "rd"}.get(day % 10, "th")
+
+
+class Renderer:
+    """Site markup for one match block, with the variations seen on the live pages.
+
+    Shared with build_page_corpus.py, which renders the published data the same way.
+    """
+
+    def __init__(self, rng: random.Random) -> None:
+        self.rng = rng
+
+    def p(self, text: str) -> str:
+        return f"<p>{html.escape(text)}</p>"
+
+    def date(self, value: date, allow_plain: bool) -> str:
+        weekday = WEEKDAY_NAMES[value.weekday()]
+        month = MONTH_NAMES[value.month - 1]
+        if allow_plain and self.rng.random() < 0.25:
+            return self.p(f"{weekday} {value.day} {month}, {value.year}")
+        return f"<p>{weekday} {value.day}<sup>{_ordinal(value.day)}</sup> {month}, {value.year}</p>"
+
+    def time(self, value: Optional[str]) -> str:
+        if not value:
+            return ""
+        hour, minute = (int(part) for part in value.split(":"))
+        if self.rng.random() < 0.3:
+            return self.p(f"{hour % 12 or 12}:{minute:02d}{'pm' if hour >= 12 else 'am'}")
+        return self.p(value)
+
+    def meta(self, label: str, value: str) -> str:
+        if self.rng.random() < 0.35:
+            return f"<p><strong>{label}:</strong></p>" + self.p(value)
+        return self.p(f"{label}: {value}")
+
+    def side(self, team: str, score: Optional[Tuple[int, int]], walkover: bool) -> str:
+        if score is None:
+            out = self.p(team)
+        else:
+            separator = self.rng.choice(("-", "-", " - "))
+            text = f"{score[0]}{separator}{score[1]}"
+            out = self.p(f"{team} {text}") if self.rng.random() < 0.6 else self.p(team) + self.p(text)
+        return out + (self.p("W/O") if walkover else "")
+
+
+def render_block(
+    renderer: Renderer,
+    heading: str,
+    round_label: str,
+    when: date,
+    home: str,
+    away: str,
+    kickoff: Optional[str],
+    venue: Optional[str],
+    referee: Optional[str],
+    scores: Optional[Tuple[Optional[Tuple[int, int]], Optional[Tuple[int, int]]]],
+    walkover: Optional[str],
+    allow_plain: bool,
+) -> str:
+    """One match block; ``scores`` is (home, away), either side None when it has no score."""
+    parts = [
+        f"<h4>{html.escape(heading)}</h4>",
+        renderer.p(round_label),
+        renderer.date(when, allow_plain),
+        renderer.side(home, scores[0] if scores else None, walkover == "home"),
+        renderer.p(renderer.rng.choice(("V", "V", "v"))),
+        renderer.side(away, scores[1] if scores else None, walkover == "away"),
+        renderer.time(kickoff),
+        renderer.meta("Venue", venue),
+        renderer.meta("Referee", referee),
+    ]
+    return '<div class="fixture">' + "".join(parts) + "</div>\n"
+
+
+def page_document(title: str, body: str) -> str:
+    return (
+        '<!DOCTYPE html>\n<html lang="en-GB"><head><meta charset="utf-8"><title>'
+        + html.escape(title) + " - Limerick GAA</title>\n"
+        "<script>window.dataLayer=window.dataLayer||[];</script>\n"
+        "<style>.fixture{margin:0}</style></head>\n"
+        '<body><header><nav><a href="/fixtures/">Fixtures</a> <a href="/results/">Results</a> '
+        '<a href="/tables/">Table</a></nav></header>\n'
+        "<main><article><h1>" + html.escape(title) + "</h1>\n" + body + "</article></main>\n"
+        "<footer><p>Limerick GAA</p><noscript>enable javascript</noscript></footer></body></html>\n"
+    )
+
+
+def rest_document(body: str) -> str:
+    return json.dumps([{"content": {"rendered": body, "protected": False}}], ensure_ascii=False, indent=1) + "\n"
+
+
+def page_format(mode: str) -> str:
+    return "rest" if mode == "fixtures" else "html"
+
+
+def generate(spec: SeasonSpec) -> Tuple[List[page_corpus.Page], List[Dict[str, Any]], Dict[str, str]]:
+    """
+    (pages, expected records, raw captures by page name). Pages carry the
+    rendered content the scrapers parse; captures are the files as fetched.
+    """
+    rng = random.Random(spec.seed)
+    renderer = Renderer(rng)
+    played = (spec.rounds + 1) // 2
+
+    bodies: Dict[Tuple[str, str], List[str]] = {(tier, mode): [] for tier in TIERS for mode in MODES}
+    expected: List[Dict[str, Any]] = []
+    next_team: Dict[str, int] = Counter()
+
+    # Sections of a family sit together, league last: the league results
+    # parser reads on to the next division heading, so it must not run into
+    # another competition's Venue: lines.
+    sections = sorted(sections_for(spec), key=lambda section: FAMILIES.index(section.family))
+    for section in sections:
+        first = next_team[section.family]
+        next_team[section.family] += spec.teams
+        names = [team_name(first + k) for k in range(spec.teams)]
+        blocks: Dict[str, List[str]] = {mode: [] for mode in MODES}
+
+        for round_index in range(spec.rounds):
+            mode = "results" if round_index < played else "fixtures"
+            when = round_date(spec, round_index)
+            round_label = f"Round {round_index + 1}"
+            for home_slot, away_slot in pairings(spec.teams, round_index):
+                bye = None in (home_slot, away_slot)
+                if bye and mode == "results":
+                    continue
+                home = names[home_slot] if home_slot is not None else "BYE"
+                away = names[away_slot] if away_slot is not None else "BYE"
+                kickoff: Optional[str] = rng.choice(TIMES)
+                if section.family == "divisional" and rng.random() < DIVISIONAL_NO_TIME_RATE:
+                    kickoff = None
+                venue = rng.choice(VENUES)
+                referee = rng.choice(REFEREES)
+                scores = None
+                walkover = None
+                if mode == "results":
+                    if rng.random() < WALKOVER_RATE:
+                        walkover = rng.choice(("home", "away"))
+                    else:
+                        scores = ((rng.randint(0, 4), rng.randint(8, 25)), (rng.randint(0, 4), rng.randint(8, 25)))
+                # Only the championship scraper reads plain (non-superscript) dates.
+                blocks[mode].append(render_block(
+                    renderer, section.heading, round_label, when, home, away, kickoff, venue, referee, scores,
+                    walkover, allow_plain=section.family == "championship",
+                ))
+                if bye:
+                    continue
+                expected.append({
+                    "family": section.family,
+                    "page": f"{section.tier}-hurling-{mode}",
+                    "competition": section.competition,
+                    "group": section.group,
+                    "round": round_label,
+                    "date": when.isoformat(),
+                    "time": kickoff,
+                    "home": home,
+                    "away": away,
+                    "venue": venue,
+                    "referee": referee,
+                    "status": "Walkover" if walkover else ("Result" if scores else "Fixture"),
+                    "home_goals": scores[0][0] if scores else None,
+                    "home_points": scores[0][1] if scores else None,
+                    "away_goals": scores[1][0] if scores else None,
+                    "away_points": scores[1][1] if scores else None,
+                    "walkover_winner": walkover,
+                })
+
+        for mode in MODES:
+            if blocks[mode]:
+                title = "County Hurling League" if section.family == "league" else section.competition
+                bodies[(section.tier, mode)].append(f"<h2>{html.escape(title)} {mode.title()}</h2>\n")
+                bodies[(section.tier, mode)].extend(blocks[mode])
+
+    pages: List[page_corpus.Page] = []
+    captures: Dict[str, str] = {}
+    for (tier, mode), parts in bodies.items():
+        if not parts:
+            continue
+        slug = f"{tier}-hurling-{mode}"
+        body = "".join(parts) + "<h2>Football</h2>\n<p>See football fixtures page</p>\n"
+        if page_format(mode) == "rest":
+            raw = rest_document(body)
+        else:
+            raw = page_document(f"{tier.title()} Hurling {mode.title()}", body)
+        name = f"{spec.season}/{slug}"
+        captures[name] = raw
+        pages.append(page_corpus.Page(
+            name=name,
+            season=spec.season,
+            mode=mode,
+            url=f"https://limerickgaa.ie/{slug}/",
+            html=page_corpus.rendered_html(raw, page_format(mode)),
+        ))
+    return pages, expected, captures
+
+
+def write_season(out_dir: str, spec: SeasonSpec) -> Tuple[List[page_corpus.Page], List[Dict[str, Any]]]:
+    """Write the pages in the page_corpus layout plus expected.json; returns what generate() built."""
+    pages, expected, captures = generate(spec)
+    manifest = []
+    for page in pages:
+        fmt = page_format(page.mode)
+        file_name = f"{page.name}.rest.json" if fmt == "rest" else f"{page.name}.html"
+        path = os.path.join(out_dir, file_name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.write(captures[page.name])
+        manifest.append({"file": file_name, "format": fmt, "season": page.season, "mode": page.mode, "url": page.url})
+
+    with open(os.path.join(out_dir, page_corpus.MANIFEST_NAME), "w", encoding="utf-8") as handle:
+        json.dump({"pages": manifest}, handle, indent=2)
+        handle.write("\n")
+    spec_dict = asdict(spec)
+    spec_dict["families"] = list(spec.families)
+    with open(os.path.join(out_dir, "expected.json"), "w", encoding="utf-8") as handle:
+        json.dump({"spec": spec_dict, "records": expected}, handle, ensure_ascii=False, indent=2)
+        handle.write("\n")
+    return pages, expected
+
+
+def _round_label(value: str) -> str:
+    # League and divisional records carry "R3"; the pages (and championship) say "Round 3".
+    if value.startswith("R") and value[1:].isdigit():
+        return f"Round {value[1:]}"
+    return value
+
+
+def _status(value: str) -> str:
+    return "Fixture" if value == "SCHEDULED" else value
+
+
+def parsed_records(pages: Sequence[page_corpus.Page], families: Sequence[str] = FAMILIES) -> List[Dict[str, Any]]:
+    """Every family's parser over ``pages``, projected onto the expected-record fields."""
+    records: List[Dict[str, Any]] = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for page in pages:
+            if "championship" in families:
+                for match in championship.parse_page(championship.normalize_lines(page.html), page.mode, page.name):
+                    records.append({**match.to_dict(), "family": "championship", "page": page.slug,
+                                    "time": match.time or None, "walkover_winner": None})
+            if "divisional" in families:
+                lines = divisional.normalize_lines(page.html)
+                for fixture in divisional.parse_page(lines, page.url, page.mode == "results"):
+                    records.append({**fixture.to_dict(), "family": "divisional", "page": page.slug,
+                                    "group": fixture.division, "time": fixture.time_local})
+            if "league" in families and page.slug.startswith("senior"):
+                lines = league.normalize_lines(page.html)
+                parse = league.parse_league_results if page.mode == "results" else league.parse_league
+                for fixture in parse(lines):
+                    records.append({**fixture.to_dict(), "family": "league", "page": page.slug,
+                                    "time": fixture.time_local})
+    for record in records:
+        record["round"] = _round_label(record["round"])
+        record["status"] = _status(record["status"])
+    return records
+
+
+def _key(record: Dict[str, Any]) -> Tuple[str, ...]:
+    return tuple(str(record.get(field)) for field in ("family", "page", "competition", "group", "round", "date", "home", "away"))
+
+
+def check(pages: Sequence[page_corpus.Page], expected: Sequence[Dict[str, Any]], families: Sequence[str] = FAMILIES) -> Dict[str, Counter]:
+    """Per-family counts of expected/parsed/missing/unexpected/mismatched records."""
+    parsed = {_key(record): record for record in parsed_records(pages, families)}
+    wanted = {_key(record): record for record in expected if record["family"] in families}
+    summary: Dict[str, Counter] = {family: Counter() for family in families}
+
+    for key, record in wanted.items():
+        counts = summary[record["family"]]
+        counts["expected"] += 1
+        got = parsed.get(key)
+        if got is None:
+            counts["missing"] += 1
+            continue
+        diffs = [field for field in CHECK_FIELDS[record["family"]] if got.get(field) != record.get(field)]
+        if diffs:
+            counts["mismatched"] += 1
+            if counts["mismatched"] <= 3:
+                print(f"[synthetic] {record['family']} mismatch {key[4:]}: "
+                      + ", ".join(f"{field} {record.get(field)!r} != {got.get(field)!r}" for field in diffs))
+    for key, record in parsed.items():
+        summary[record["family"]]["parsed"] += 1
+        if key not in wanted:
+            summary[record["family"]]["unexpected"] += 1
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--grades", type=int, default=SeasonSpec.grades)
+    parser.add_argument("--groups", type=int, default=SeasonSpec.groups, help="Groups per grade")
+    parser.add_argument("--rounds", type=int, default=SeasonSpec.rounds)
+    parser.add_argument("--teams", type=int, default=SeasonSpec.teams, help="Teams per group (odd sizes get BYE rows)")
+    parser.add_argument("--seed", type=int, default=SeasonSpec.seed)
+    parser.add_argument("--family", action="append", choices=FAMILIES,
+                        help="Generate only these competition families (repeatable; default: all)")
+    parser.add_argument("--out", help="Write the pages (page_corpus layout) and expected.json here")
+    parser.add_argument("--check", action="store_true", help="Parse the pages and compare with the expected records")
+    args = parser.parse_args()
+
+    spec = SeasonSpec(
+        grades=args.grades,
+        groups=args.groups,
+        rounds=args.rounds,
+        teams=args.teams,
+        seed=args.seed,
+        families=tuple(args.family or FAMILIES),
+    )
+    if args.out:
+        pages, expected = write_season(args.out, spec)
+    else:
+        pages, expected, _ = generate(spec)
+    size = sum(len(page.html) for page in pages)
+    print(f"[synthetic] {len(pages)} pages, {len(expected):,} expected records, {size:,} chars"
+          + (f" -> {args.out}" if args.out else ""))
+
+    if args.check:
+        failed = False
+        for family, counts in check(pages, expected, spec.families).items():
+            print(f"[synthetic] {family}: expected {counts['expected']:,}, parsed {counts['parsed']:,}, "
+                  f"missing {counts['missing']}, unexpected {counts['unexpected']}, mismatched {counts['mismatched']}")
+            failed = failed or bool(counts["missing"] or counts["unexpected"] or counts["mismatched"])
+        if failed:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
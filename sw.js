@@ -1,5 +1,44 @@
+// Content-hashed data files (data/hashed/*, written by scripts/publish_data.py)
+// never change, so they are precached on install and served cache-first.
+// data-manifest.json is revalidated on every request; everything else still
+// goes straight to the network.
+const DATA_CACHE = 'lgh-data-v1';
+const PRECACHE_URL = '/data/precache-manifest.json';
+const HASHED_PREFIX = '/data/hashed/';
+
+async function precacheData() {
+  try {
+    const res = await fetch(PRECACHE_URL, { cache: 'no-cache' });
+    if (!res.ok) return;
+    const { urls = [] } = await res.json();
+    const cache = await caches.open(DATA_CACHE);
+    const missing = [];
+    for (const u of urls) {
+      if (!(await cache.match(u))) missing.push(u);
+    }
+    await cache.addAll(missing);
+    // Drop hashed files that are no longer listed.
+    const keep = new Set(urls.map(u => new URL(u, self.location.origin).href));
+    for (const req of await cache.keys()) {
+      if (!keep.has(req.url)) await cache.delete(req);
+    }
+  } catch (e) {
+    // Precaching is an optimisation only; the app falls back to the network.
+  }
+}
+
+async function cacheFirst(request) {
+  const cache = await caches.open(DATA_CACHE);
+  const hit = await cache.match(request);
+  if (hit) return hit;
+  const res = await fetch(request);
+  if (res.ok) cache.put(request, res.clone());
+  return res;
+}
+
 self.addEventListener('install', (event) => {
   self.skipWaiting();
+  event.waitUntil(precacheData());
 });
 
 self.addEventListener('activate', (event) => {
@@ -8,5 +47,21 @@ self.addEventListener('activate', (event) => {
 
 self.addEventListener('fetch', (event) => {
   if (event.request.method !== 'GET') return;
+  const url = new URL(event.request.url);
+
+  if (url.origin === self.location.origin && url.pathname.startsWith(HASHED_PREFIX)) {
+    event.respondWith(cacheFirst(event.request));
+    return;
+  }
+
+  if (url.origin === self.location.origin && url.pathname === '/data/data-manifest.json') {
+    // A new manifest means new hashed files; refresh the precache in the background.
+    event.respondWith(fetch(event.request, { cache: 'no-cache' }).then(res => {
+      if (res.ok) event.waitUntil(precacheData());
+      return res;
+    }));
+    return;
+  }
+
   event.respondWith(fetch(event.request));
 });